@@ -0,0 +1,74 @@
+"""
+Speed of building a ``Dataset`` from rows of values, e.g. in the ``tomato.json``
+extractor.
+
+Compares :func:`yadg.dgutils.append_dicts` followed by
+:func:`yadg.dgutils.dicts_to_dataset`, which grow a :class:`list` per column and
+back-fill the missing values in each row, with the columnar
+:class:`yadg.dgutils.DatasetBuilder`. Run as:
+
+.. code-block:: bash
+
+    python benchmarks/dataset_builder.py [nrows ...]
+
+"""
+
+import sys
+import time
+import numpy as np
+from yadg.dgutils import append_dicts, dicts_to_dataset, DatasetBuilder
+
+
+def make_rows(nrows: int, sparse: bool = False) -> list[tuple[dict, dict]]:
+    """
+    Creates rows of 20 values with uncertainties, as in a log of a single technique,
+    or if ``sparse``, rows of 5 values out of 100, as in a log of many techniques.
+    """
+    rng = np.random.default_rng(nrows)
+    nkeys, nvals = (100, 5) if sparse else (20, 20)
+    rows = []
+    for i in range(nrows):
+        keys = rng.choice(nkeys, nvals, replace=False) if sparse else range(nkeys)
+        vals = {"uts": float(i), "status": "ok"}
+        vals.update((f"value {k}", float(rng.random())) for k in keys)
+        devs = {f"value {k}": 1e-3 for k in keys}
+        rows.append((vals, devs))
+    return rows
+
+
+def run_dicts(rows: list[tuple[dict, dict]]) -> None:
+    data, meta = {}, {}
+    for i, (vals, devs) in enumerate(rows):
+        append_dicts(vals, devs, data, meta, i)
+    dicts_to_dataset(data, meta)
+
+
+def run_builder(rows: list[tuple[dict, dict]]) -> None:
+    builder = DatasetBuilder()
+    for vals, devs in rows:
+        builder.append(vals, devs)
+    builder.to_dataset()
+
+
+def main(sizes: list[int]) -> None:
+    print(
+        f"{'case':>8s} {'nrows':>8s} {'dicts [s]':>14s} {'builder [s]':>14s} "
+        f"{'speedup':>8s}"
+    )
+    for sparse in (False, True):
+        for n in sizes:
+            rows = make_rows(n, sparse)
+            times = []
+            for func in (run_dicts, run_builder):
+                t0 = time.perf_counter()
+                func(rows)
+                times.append(time.perf_counter() - t0)
+            print(
+                f"{'sparse' if sparse else 'dense':>8s} {n:8d} {times[0]:14.3f} "
+                f"{times[1]:14.3f} {times[0] / times[1]:8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    sizes = [int(i) for i in sys.argv[1:]] or [1000, 10000, 100000]
+    main(sizes)
@@ -0,0 +1,188 @@
+"""
+Generators of large synthetic input files for the benchmarks in ``suite.py``.
+
+Each generator writes files of a given ``size`` into a ``folder``, and returns the
+list of the created paths along with the number of records they contain, i.e. the
+number of rows of tables, datapoints of ``.mpr`` files, timesteps of ``.sac`` files,
+points of chromatograms and diffractograms, or files in archives. Where possible,
+the files are created by tiling the data section of a file from ``tests/``, so that
+the headers remain valid for the respective extractor.
+
+"""
+
+import io
+import re
+import json
+import zipfile
+import numpy as np
+from pathlib import Path
+from datetime import datetime, timedelta
+from yadg.extractors.eclab.mpr_columns import module_header_dtypes
+from yadg.extractors.quadstar.sac import general_header_dtype, trace_header_dtype
+
+TESTS = Path(__file__).parents[1] / "tests"
+
+
+def make_csv(folder: Path, size: int, nfiles: int = 1) -> tuple[list[Path], int]:
+    """Tables of ``size`` rows with a ``uts`` column and five columns of floats."""
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(nfiles):
+        uts = 1.6e9 + (np.arange(size) + i * size) * 5.0
+        values = rng.random((size, 5)) * 100
+        path = folder / f"table.{i:05d}.csv"
+        with path.open("w") as out:
+            out.write("uts,flow,T,p,x1,x2\n")
+            out.write(",ml/min,degC,bar,,\n")
+            np.savetxt(out, np.column_stack((uts, values)), fmt="%.6f", delimiter=",")
+        paths.append(path)
+    return paths, size * nfiles
+
+
+def make_mpt(folder: Path, size: int) -> tuple[list[Path], int]:
+    """An ``eclab.mpt`` file of ``size`` rows, tiling the rows of ``cp.mpt``."""
+    lines = (TESTS / "test_extract" / "cp.mpt").read_bytes().splitlines(True)
+    nheader = int(re.search(rb"Nb header lines : (\d+)", lines[1]).group(1))
+    header, rows = (
+        lines[:nheader],
+        [r.rstrip(b"\r\n") + b"\r\n" for r in lines[nheader:]],
+    )
+    path = folder / "synthetic.mpt"
+    with path.open("wb") as out:
+        out.writelines(header)
+        for i in range(size):
+            out.write(rows[i % len(rows)])
+    return [path], size
+
+
+def _mpr_modules(contents: bytes):
+    """Yields the name, header dtype, header offset, and end of each module."""
+    start = contents.find(b"MODULE")
+    while start != -1 and start < len(contents):
+        start += len(b"MODULE")
+        for mhd in module_header_dtypes:
+            header = np.frombuffer(contents, dtype=mhd, count=1, offset=start)[0]
+            end = start + mhd.itemsize + int(header["length"])
+            if end == len(contents) or contents[end : end + 6] == b"MODULE":
+                break
+        yield header["short_name"].strip(), mhd, start, end
+        start = end
+
+
+def make_mpr(folder: Path, size: int) -> tuple[list[Path], int]:
+    """An ``eclab.mpr`` file of ``size`` datapoints, tiling the records of ``cp.mpr``."""
+    contents = (TESTS / "test_extract" / "cp.mpr").read_bytes()
+    for name, mhd, start, end in _mpr_modules(contents):
+        if name == b"VMP data":
+            break
+    data = start + mhd.itemsize
+    npoints = int(np.frombuffer(contents, dtype="<u4", count=1, offset=data)[0])
+    # The records fill the end of the data module.
+    recsize = None
+    for offset in (0x3EF, 0x196, 0x195):
+        if (end - data - offset) % npoints == 0:
+            recsize = (end - data - offset) // npoints
+            break
+    records = np.frombuffer(
+        contents, dtype=f"V{recsize}", count=npoints, offset=end - npoints * recsize
+    )
+    records = np.resize(records, size).tobytes()
+
+    header = np.frombuffer(contents, dtype=mhd, count=1, offset=start).copy()
+    header["length"] = end - data - npoints * recsize + len(records)
+    if "max_length" in mhd.names:
+        header["max_length"] = max(int(header["max_length"][0]), header["length"][0])
+    path = folder / "synthetic.mpr"
+    with path.open("wb") as out:
+        out.write(contents[:start])
+        out.write(header.tobytes())
+        out.write(np.array(size, dtype="<u4").tobytes())
+        out.write(contents[data + 4 : end - npoints * recsize])
+        out.write(records)
+        out.write(contents[end:])
+    return [path], size
+
+
+def make_sac(folder: Path, size: int) -> tuple[list[Path], int]:
+    """A ``quadstar.sac`` file of ``size`` timesteps, tiling those of ``airdemo.sac``."""
+    contents = (TESTS / "test_x_quadstar_sac" / "airdemo.sac").read_bytes()
+    header = np.frombuffer(contents, dtype=general_header_dtype, count=1)[0]
+    nsteps, length = int(header["n_timesteps"]), int(header["timestep_length"])
+    traces = np.frombuffer(
+        contents, dtype=trace_header_dtype, count=header["n_traces"], offset=0xC8
+    )
+    # Each timestep starts with its timestamp, preceding the data of the first trace.
+    start = int(traces[traces["type"] == 0x11]["data_position"][0]) - 0x0006
+    end = start + nsteps * length
+    steps = np.frombuffer(contents, dtype=f"V{length}", count=nsteps, offset=start)
+    steps = np.resize(steps, size)
+    uts = np.ndarray((size,), dtype="<u4", buffer=steps, strides=(length,))
+    uts += np.repeat(np.arange(-(-size // nsteps), dtype="<u4"), nsteps)[:size] * (
+        uts[nsteps - 1] - uts[0] + uts[1] - uts[0]
+    )
+    path = folder / "synthetic.sac"
+    with path.open("wb") as out:
+        out.write(contents[:0x64])
+        out.write(np.array(size, dtype="<u4").tobytes())
+        out.write(contents[0x68:start])
+        out.write(steps.tobytes())
+        out.write(contents[end:])
+    return [path], size
+
+
+def make_ch(folder: Path, size: int) -> tuple[list[Path], int]:
+    """An ``agilent.ch`` chromatogram of ``size`` points, based on ``hplc.CH``."""
+    contents = (TESTS / "test_extract" / "hplc.CH").read_bytes()
+    start = (
+        int(np.frombuffer(contents, dtype=">i4", count=1, offset=0x108)[0]) - 1
+    ) * 512
+    signal = np.frombuffer(contents, dtype="<f8", offset=start)
+    path = folder / "synthetic.CH"
+    path.write_bytes(contents[:start] + np.resize(signal, size).tobytes())
+    return [path], size
+
+
+def make_dat(folder: Path, size: int) -> tuple[list[Path], int]:
+    """
+    ``size`` copies of the ``ezchrom.dat`` file ``230324.dat``. The OLE container of
+    these files cannot be created, so the throughput is measured per file.
+
+    """
+    contents = (TESTS / "test_extract" / "230324.dat").read_bytes()
+    paths = []
+    for i in range(size):
+        path = folder / f"synthetic.{i:05d}.dat"
+        path.write_bytes(contents)
+        paths.append(path)
+    return paths, size
+
+
+def make_fusion_zip(folder: Path, size: int) -> tuple[list[Path], int]:
+    """A zip archive of ``size`` ``fusion.json`` files, with consecutive timestamps."""
+    fn = "15p-Cu-10mA-01 - Jun 08 2022, 16;10.fusion-data"
+    template = json.loads((TESTS / "test_x_fusion_json" / fn).read_text())
+    start = datetime.fromisoformat(template["runTimeStamp"].replace("Z", "+00:00"))
+    path = folder / "synthetic.zip"
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for i in range(size):
+            ts = start + timedelta(minutes=2 * i)
+            template["runTimeStamp"] = ts.isoformat().replace("+00:00", "Z")
+            zf.writestr(f"run.{i:05d}.fusion-data", json.dumps(template))
+    return [path], size
+
+
+def make_xrdml(folder: Path, size: int) -> tuple[list[Path], int]:
+    """A ``panalytical.xrdml`` diffractogram of ``size`` points."""
+    fn = TESTS / "test_x_panalytical_xrdml" / "210520step1_30min.xrdml"
+    contents = fn.read_text(encoding="utf-8")
+    counts = np.random.default_rng(0).integers(100, 5000, size)
+    buf = io.StringIO()
+    np.savetxt(buf, counts[np.newaxis], fmt="%d", delimiter=" ", newline="")
+    contents = re.sub(
+        r'(<intensities unit="counts">)[^<]*(</intensities>)',
+        lambda m: m.group(1) + buf.getvalue() + m.group(2),
+        contents,
+    )
+    path = folder / "synthetic.xrdml"
+    path.write_text(contents, encoding="utf-8")
+    return [path], size
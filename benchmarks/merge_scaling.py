@@ -0,0 +1,62 @@
+"""
+Scaling of merging many per-file ``DataTree.to_dict()`` objects within a `step`.
+
+Compares the pairwise :func:`yadg.dgutils.merge_dicttrees`, which copies all
+previously merged data for every new file, with :func:`yadg.dgutils.concat_dicttrees`,
+which performs a single :func:`xarray.concat` per node. Run as:
+
+.. code-block:: bash
+
+    python benchmarks/merge_scaling.py [nfiles ...]
+
+"""
+
+import sys
+import time
+import numpy as np
+import xarray as xr
+from yadg.dgutils import merge_dicttrees, concat_dicttrees
+
+
+def make_dicttree(i: int, npoints: int = 100) -> dict:
+    rng = np.random.default_rng(i)
+    ds = xr.Dataset(
+        data_vars={
+            "Ewe": ("uts", rng.random(npoints), {"units": "V"}),
+            "I": ("uts", rng.random(npoints), {"units": "mA"}),
+            "cycle number": ("uts", np.full(npoints, i)),
+            "Ewe_uncertainty": ((), 1e-4),
+            "I_uncertainty": ((), 1e-3),
+        },
+        coords={"uts": np.arange(npoints, dtype=float) + i * npoints},
+        attrs={"original_metadata": "{}"},
+    )
+    return {"/": ds}
+
+
+def run_pairwise(dicttrees: list[dict]) -> dict:
+    vals = None
+    for fvals in dicttrees:
+        vals = merge_dicttrees(vals, fvals, strict_merge=True)
+    return vals
+
+
+def run_concat(dicttrees: list[dict]) -> dict:
+    return concat_dicttrees(dicttrees, strict_merge=True)
+
+
+def main(sizes: list[int]) -> None:
+    print(f"{'nfiles':>8s} {'pairwise / s':>14s} {'concat / s':>14s} {'speedup':>8s}")
+    for n in sizes:
+        times = []
+        for func in (run_pairwise, run_concat):
+            dicttrees = [make_dicttree(i) for i in range(n)]
+            t0 = time.perf_counter()
+            func(dicttrees)
+            times.append(time.perf_counter() - t0)
+        print(f"{n:8d} {times[0]:14.3f} {times[1]:14.3f} {times[0] / times[1]:8.1f}")
+
+
+if __name__ == "__main__":
+    sizes = [int(i) for i in sys.argv[1:]] or [10, 100, 1000, 2000, 4000]
+    main(sizes)
@@ -0,0 +1,281 @@
+"""
+Throughput and peak memory benchmarks of the extractors and of :func:`process_schema`.
+
+The synthetic input files for each benchmark are created by the generators in
+``generators.py``. Each benchmark is timed as the best of ``--repeat`` runs, and
+the peak memory allocated by Python is recorded in a separate run, using the
+:class:`~yadg.dgutils.profutils.Profiler` with :mod:`tracemalloc` enabled; with
+``jobs > 1``, only the memory allocated in the main process is included. The
+throughput is reported as records per second, i.e. rows, datapoints, timesteps,
+or files depending on the extractor, and as MB of input files per second.
+
+The results can be stored as baselines using ``--save``, and compared against
+the stored baselines using ``--compare``, flagging any benchmark in which the
+throughput drops or the peak memory grows by more than the ``--threshold``. The
+baselines are absolute timings, which are only meaningful on the machine they were
+recorded on. They are therefore not part of the repository, and have to be created
+locally using ``--save``, e.g. on the main branch, before comparing a change using
+``--compare``. Run as:
+
+.. code-block:: bash
+
+    python benchmarks/suite.py [--filter NAME] [--scale 1.0] [--repeat 3]
+    python benchmarks/suite.py --save
+    python benchmarks/suite.py --compare
+
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+from pathlib import Path
+from datetime import datetime
+from importlib import metadata
+from typing import Callable
+from dgbowl_schemas.yadg.dataschema import DataSchema, ExtractorFactory
+from yadg import core
+from yadg.extractors import extract_from_path, extract_from_zip
+from yadg.dgutils.profutils import Profiler
+import generators
+
+BASELINES = Path(__file__).parent / "baselines.json"
+HOST_KEYS = {"platform", "machine", "processor", "python"}
+
+CSV_PARAMETERS = {"sep": ",", "timestamp": {"uts": {"index": 0}}}
+
+
+def get_extractor(filetype: str, **kwargs: dict):
+    return ExtractorFactory(
+        extractor={
+            "filetype": filetype,
+            "timezone": "UTC",
+            "locale": "en_GB",
+            "encoding": "UTF-8",
+            **kwargs,
+        }
+    ).extractor
+
+
+def extract_files(filetype: str, **kwargs: dict) -> Callable:
+    extractor = get_extractor(filetype, **kwargs)
+
+    def run(paths: list[Path]) -> None:
+        for path in paths:
+            extract_from_path(path, extractor)
+
+    return run
+
+
+def extract_zip(filetype: str) -> Callable:
+    extractor = get_extractor(filetype)
+
+    def run(paths: list[Path]) -> None:
+        for path in paths:
+            extract_from_zip(path, extractor)
+
+    return run
+
+
+def process_files(jobs: int) -> Callable:
+    def run(paths: list[Path]) -> None:
+        schema = DataSchema(
+            **{
+                "version": "7.0",
+                "metadata": {"provenance": {"type": "benchmark"}},
+                "step_defaults": {"timezone": "UTC", "locale": "en_GB"},
+                "steps": [
+                    {
+                        "tag": "csv",
+                        "input": {"files": [str(p) for p in paths]},
+                        "extractor": {
+                            "filetype": "basic.csv",
+                            "parameters": CSV_PARAMETERS,
+                        },
+                    }
+                ],
+            }
+        )
+        core.process_schema(schema, jobs=jobs)
+
+    return run
+
+
+# Each benchmark consists of a generator, its size, and a function creating the
+# callable which processes the generated paths.
+BENCHMARKS = {
+    "basic.csv": (
+        generators.make_csv,
+        200_000,
+        lambda: extract_files("basic.csv", parameters=CSV_PARAMETERS),
+    ),
+    "eclab.mpt": (generators.make_mpt, 100_000, lambda: extract_files("eclab.mpt")),
+    "eclab.mpr": (generators.make_mpr, 200_000, lambda: extract_files("eclab.mpr")),
+    "quadstar.sac": (
+        generators.make_sac,
+        1_000,
+        lambda: extract_files("quadstar.sac"),
+    ),
+    "agilent.ch": (generators.make_ch, 2_000_000, lambda: extract_files("agilent.ch")),
+    "ezchrom.dat": (generators.make_dat, 50, lambda: extract_files("ezchrom.dat")),
+    "fusion.json.zip": (
+        generators.make_fusion_zip,
+        200,
+        lambda: extract_zip("fusion.json"),
+    ),
+    "panalytical.xrdml": (
+        generators.make_xrdml,
+        500_000,
+        lambda: extract_files("panalytical.xrdml"),
+    ),
+    "process_schema.10": (
+        lambda f, s: generators.make_csv(f, 1_000, nfiles=s),
+        10,
+        lambda: process_files(jobs=1),
+    ),
+    "process_schema.100": (
+        lambda f, s: generators.make_csv(f, 1_000, nfiles=s),
+        100,
+        lambda: process_files(jobs=1),
+    ),
+    "process_schema.1000": (
+        lambda f, s: generators.make_csv(f, 1_000, nfiles=s),
+        1_000,
+        lambda: process_files(jobs=1),
+    ),
+    "process_schema.1000.jobs4": (
+        lambda f, s: generators.make_csv(f, 1_000, nfiles=s),
+        1_000,
+        lambda: process_files(jobs=4),
+    ),
+}
+
+
+def run_benchmark(name: str, scale: float, repeat: int) -> dict:
+    generator, size, setup = BENCHMARKS[name]
+    with tempfile.TemporaryDirectory() as folder:
+        paths, records = generator(Path(folder), max(1, int(size * scale)))
+        nbytes = sum(path.stat().st_size for path in paths)
+        run = setup()
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            run(paths)
+            best = min(best, time.perf_counter() - t0)
+        profiler = Profiler(tracemalloc=True)
+        with profiler.stage(name):
+            run(paths)
+    return {
+        "records": records,
+        "MB": nbytes / 1e6,
+        "time": best,
+        "records/s": records / best,
+        "MB/s": nbytes / 1e6 / best,
+        "peak MB": profiler.events[-1]["peak_traced"] / 1e6,
+    }
+
+
+def machine_info() -> dict:
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "python": platform.python_version(),
+        "yadg": metadata.version("yadg"),
+        "date": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def compare(results: dict, baselines: dict, threshold: float) -> list[str]:
+    """Returns the names of benchmarks which regressed beyond the ``threshold``."""
+    regressed = []
+    print(f"{'benchmark':<28s} {'records/s':>10s} {'MB/s':>8s} {'peak MB':>8s}")
+    for name, res in results.items():
+        ref = baselines.get(name)
+        if ref is None or ref["records"] != res["records"]:
+            print(f"{name:<28s} {'no baseline with the same size':>28s}")
+            continue
+        speed = res["records/s"] / ref["records/s"]
+        memory = res["peak MB"] / ref["peak MB"] if ref["peak MB"] > 0 else 1.0
+        flag = ""
+        if speed < 1 - threshold or memory > 1 + threshold:
+            flag = " <-- regression"
+            regressed.append(name)
+        print(f"{name:<28s} {speed:>10.2f} {'':>8s} {memory:>8.2f}{flag}")
+    return regressed
+
+
+def main(args: argparse.Namespace) -> int:
+    names = [n for n in BENCHMARKS if any(f in n for f in args.filter or [""])]
+    print(
+        f"{'benchmark':<28s} {'records':>10s} {'MB':>8s} {'time / s':>9s} "
+        f"{'records/s':>10s} {'MB/s':>8s} {'peak MB':>8s}"
+    )
+    results = {}
+    for name in names:
+        res = run_benchmark(name, args.scale, args.repeat)
+        results[name] = res
+        print(
+            f"{name:<28s} {res['records']:>10d} {res['MB']:>8.1f} {res['time']:>9.3f} "
+            f"{res['records/s']:>10.3g} {res['MB/s']:>8.2f} {res['peak MB']:>8.1f}"
+        )
+
+    regressed = []
+    if args.compare and BASELINES.exists():
+        print(f"\nRelative to the baselines in '{BASELINES.name}':")
+        baselines = json.loads(BASELINES.read_text())
+        machine = {k: v for k, v in machine_info().items() if k in HOST_KEYS}
+        if any(baselines["machine"].get(k) != v for k, v in machine.items()):
+            print("Warning: the baselines were recorded on another machine.")
+        regressed = compare(results, baselines["results"], args.threshold)
+    elif args.compare:
+        print(f"\nNo baselines found in '{BASELINES}', create them using '--save'.")
+    if args.save:
+        baselines = {"machine": {}, "results": {}}
+        if BASELINES.exists():
+            baselines = json.loads(BASELINES.read_text())
+        baselines["machine"] = machine_info()
+        baselines["results"].update(results)
+        BASELINES.write_text(json.dumps(baselines, indent=2) + "\n")
+        print(f"\nSaved baselines into '{BASELINES}'.")
+    return 1 if len(regressed) > 0 else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument(
+        "--filter",
+        action="append",
+        help="Run only the benchmarks containing this string. Can be repeated.",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Scale the sizes of the generated files by this factor.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of timed runs of each benchmark; the best run is reported.",
+    )
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help=f"Store the results as baselines in '{BASELINES.name}'.",
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help=f"Compare the results against the baselines in '{BASELINES.name}'.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative change in throughput or peak memory flagged as a regression.",
+    )
+    sys.exit(main(parser.parse_args()))
@@ -1,15 +1,237 @@
+import os
+import json
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
+from typing import Iterator
 from xarray import DataTree
 
 from dgbowl_schemas.yadg.dataschema import DataSchema
 from yadg import dgutils
+from yadg.dgutils.ncutils import DataTreeWriter
+from yadg.dgutils.cacheutils import ExtractionCache
+from yadg.dgutils.profutils import Profiler, profile_stage
 from pathlib import Path
 from yadg.extractors import extract_from_path
 
 logger = logging.getLogger(__name__)
 
 
-def process_schema(dataschema: DataSchema, strict_merge: bool = False) -> DataTree:
+def _process_file(
+    path: str, step, cache: ExtractionCache = None, profiler: Profiler = None
+) -> dict:
+    """
+    Extracts a single file of a `step` and completes its timestamps.
+
+    Returns a ``DataTree.to_dict()`` object ready for merging.
+
+    Parameters
+    ----------
+
+    path:
+        Path to the file to be processed.
+
+    step:
+        The `step` of the :class:`DataSchema` which contains the ``path``.
+
+    cache:
+        An optional :class:`~yadg.dgutils.cacheutils.ExtractionCache`.
+
+    profiler:
+        An optional :class:`~yadg.dgutils.profutils.Profiler`, recording the
+        ``extract`` and ``complete_uts`` stages.
+
+    """
+    logger.info(f"Processing file '{path}'.")
+    args = {"path": str(path), "step": step.tag, "filetype": step.extractor.filetype}
+    with profile_stage(profiler, "extract", **args):
+        dt = extract_from_path(source=Path(path), extractor=step.extractor, cache=cache)
+        tasks = dt.to_dict()
+    with profile_stage(profiler, "complete_uts", **args):
+        fvals = {}
+        for name, dset in tasks.items():
+            # The root datatree node may sometimes carry metadata, even if
+            # there are no variables - we don't add 'uts' to those.
+            if name == "/" and len(dset.variables) == 0:
+                fvals[name] = dset
+            # Otherwise, we want to process any 'step.externaldate' commands
+            else:
+                fvals[name] = dgutils.complete_uts(
+                    dset, path, step.externaldate, step.extractor.timezone
+                )
+            # Remove metadata entries we know will differ between different files.
+            for k in {"yadg_extract_date", "yadg_extract_filename"}:
+                if k in fvals[name].attrs:
+                    del fvals[name].attrs[k]
+    return fvals
+
+
+def _profile_file(
+    path: str, step, cache: ExtractionCache = None, tracemalloc: bool = False
+) -> tuple[dict, list[dict]]:
+    """
+    Processes a single file using :func:`_process_file` in a worker process, returning
+    the processed file along with the events recorded by a new
+    :class:`~yadg.dgutils.profutils.Profiler`.
+
+    """
+    profiler = Profiler(tracemalloc=tracemalloc)
+    fvals = _process_file(path, step, cache, profiler)
+    return fvals, profiler.events
+
+
+def _add_events(results: Iterator[tuple], profiler: Profiler) -> Iterator[dict]:
+    for fvals, events in results:
+        profiler.add_events(events)
+        yield fvals
+
+
+def _root_attrs(dataschema: DataSchema) -> dict:
+    attrs = {
+        "yadg_provenance": "yadg process",
+        "yadg_process_date": dgutils.now(asstr=True),
+        "yadg_process_DataSchema": dataschema.model_dump_json(),
+    }
+    attrs.update(dgutils.get_yadg_metadata())
+    return attrs
+
+
+def _file_manifest(paths: list[str]) -> list[list]:
+    ret = []
+    for path in paths:
+        stat = os.stat(path)
+        ret.append([path, stat.st_size, stat.st_mtime_ns])
+    return ret
+
+
+def _previous_manifest(previous: DataTree, dataschema: DataSchema) -> dict:
+    """
+    Returns the per-`step` file manifest of a ``previous`` datagram, if it has been
+    created from the same ``dataschema``.
+
+    """
+    if previous is None:
+        return {}
+    elif "yadg_process_manifest" not in previous.attrs:
+        logger.warning("Previous datagram contains no file manifest, not updating.")
+        return {}
+    elif previous.attrs.get("yadg_process_DataSchema") != dataschema.model_dump_json():
+        logger.warning("Previous datagram used a different dataschema, not updating.")
+        return {}
+    return json.loads(previous.attrs["yadg_process_manifest"])
+
+
+def _process_steps(
+    dataschema: DataSchema,
+    jobs: int = 1,
+    cache: ExtractionCache = None,
+    previous: DataTree = None,
+    profiler: Profiler = None,
+) -> Iterator[tuple]:
+    """
+    Yields each `step` of the ``dataschema`` along with an iterator over the
+    ``DataTree.to_dict()`` objects of its files, in the original order of files,
+    and the manifest of those files.
+
+    If a ``previous`` datagram is supplied, the files of each `step` which have
+    been processed into it and have not changed since are not extracted again.
+    Instead, the data of the `step` in the ``previous`` datagram are yielded first,
+    followed by the data of the new files.
+
+    If a ``profiler`` is supplied, the stages of processing each file are recorded,
+    including those processed in the worker processes.
+
+    """
+    done = _previous_manifest(previous, dataschema)
+    pool = None
+    if jobs is not None and jobs > 1:
+        logger.info(f"Using a pool of {jobs} worker processes.")
+        pool = ProcessPoolExecutor(max_workers=jobs)
+
+    try:
+        for si, step in enumerate(dataschema.steps):
+            logger.info(f"Processing step {si}.")
+
+            # Backfill default timezone, locale, encoding.
+            if step.extractor.timezone is None:
+                step.extractor.timezone = dataschema.step_defaults.timezone
+
+            if step.extractor.locale is None:
+                step.extractor.locale = dataschema.step_defaults.locale
+            if step.extractor.encoding is None:
+                step.extractor.encoding = dataschema.step_defaults.encoding
+
+            if step.tag is None:
+                step.tag = f"{si}"
+
+            todofiles = step.input.paths()
+            if len(todofiles) == 0:
+                logger.warning(f"No files processed by step '{step.tag}'.")
+
+            manifest = {"files": _file_manifest(todofiles)}
+            head = []
+            prev = done.get(step.tag, {"files": []})
+            ndone = len(prev["files"])
+            if ndone == 0:
+                pass
+            elif manifest["files"][:ndone] == prev["files"] and step.tag in previous:
+                logger.info(f"Reusing {ndone} files processed in step '{step.tag}'.")
+                # The on-disk encoding must not be applied to the merged data.
+                node = previous[step.tag].copy()
+                vals = {}
+                for n in node.subtree:
+                    vals[n.path] = n.to_dataset(inherit=False).drop_encoding()
+                for k, v in dgutils.get_yadg_metadata().items():
+                    if k in vals["/"].attrs:
+                        vals["/"].attrs[k] = v
+                head = [vals]
+                todofiles = todofiles[ndone:]
+            else:
+                logger.warning(f"Files in step '{step.tag}' changed, reprocessing.")
+
+            if pool is None or len(todofiles) < 2:
+                results = map(
+                    _process_file,
+                    todofiles,
+                    repeat(step),
+                    repeat(cache),
+                    repeat(profiler),
+                )
+            elif profiler is None:
+                chunksize = max(1, len(todofiles) // (4 * jobs))
+                results = pool.map(
+                    _process_file,
+                    todofiles,
+                    repeat(step),
+                    repeat(cache),
+                    chunksize=chunksize,
+                )
+            else:
+                chunksize = max(1, len(todofiles) // (4 * jobs))
+                results = pool.map(
+                    _profile_file,
+                    todofiles,
+                    repeat(step),
+                    repeat(cache),
+                    repeat(profiler.tracemalloc),
+                    chunksize=chunksize,
+                )
+                results = _add_events(results, profiler)
+            results = chain(head, results)
+            yield step, results, manifest
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def process_schema(
+    dataschema: DataSchema,
+    strict_merge: bool = False,
+    jobs: int = 1,
+    cache: ExtractionCache = None,
+    previous: DataTree = None,
+    profiler: Profiler = None,
+) -> DataTree:
     """
     The main :class:`DataSchema` processing function of yadg.
 
@@ -27,63 +249,113 @@ def process_schema(dataschema: DataSchema, strict_merge: bool = False) -> DataTr
         A :class:`bool` indicating whether metadata of the files processed in a single `step`
         has to be identical. Defaults to ``False`` which means conflicts will be dropped.
 
+    jobs:
+        An :class:`int` specifying the number of worker processes used to extract the
+        files within each `step`. Defaults to ``1``, i.e. serial processing. The
+        results are always merged in the original order of files.
+
+    cache:
+        An optional :class:`~yadg.dgutils.cacheutils.ExtractionCache`. When provided,
+        only files which are not present in the cache are extracted.
+
+    previous:
+        An optional :class:`DataTree` created previously from the same ``dataschema``.
+        The files listed in its ``yadg_process_manifest`` are not extracted again,
+        as long as they have not been modified; only the new files are extracted and
+        appended to the data of each `step`.
+
+    profiler:
+        An optional :class:`~yadg.dgutils.profutils.Profiler`. When provided, the wall
+        time, CPU time, and peak memory use of the ``extract`` and ``complete_uts``
+        stages of each file, and of the ``merge`` and ``from_dict`` stages of each
+        `step` are recorded. In serial processing, the extraction of the files takes
+        place within the ``merge`` stage.
+
     """
 
     while hasattr(dataschema, "update"):
         dataschema = dataschema.update()
 
     root = DataTree()
-    root.attrs = {
-        "yadg_provenance": "yadg process",
-        "yadg_process_date": dgutils.now(asstr=True),
-        "yadg_process_DataSchema": dataschema.model_dump_json(),
-    }
-    root.attrs.update(dgutils.get_yadg_metadata())
-
-    for si, step in enumerate(dataschema.steps):
-        logger.info(f"Processing step {si}.")
-
-        # Backfill default timezone, locale, encoding.
-        if step.extractor.timezone is None:
-            step.extractor.timezone = dataschema.step_defaults.timezone
-
-        if step.extractor.locale is None:
-            step.extractor.locale = dataschema.step_defaults.locale
-        if step.extractor.encoding is None:
-            step.extractor.encoding = dataschema.step_defaults.encoding
-
-        if step.tag is None:
-            step.tag = f"{si}"
-
-        todofiles = step.input.paths()
-        vals = None
-        if len(todofiles) == 0:
-            logger.warning(f"No files processed by step '{step.tag}'.")
-            vals = {}
-        for tf in todofiles:
-            logger.info(f"Processing file '{tf}'.")
-            tasks = extract_from_path(
-                source=Path(tf), extractor=step.extractor
-            ).to_dict()
-            fvals = {}
-            for name, dset in tasks.items():
-                # The root datatree node may sometimes carry metadata, even if
-                # there are no variables - we don't add 'uts' to those.
-                if name == "/" and len(dset.variables) == 0:
-                    fvals[name] = dset
-                # Otherwise, we want to process any 'step.externaldate' commands
-                else:
-                    fvals[name] = dgutils.complete_uts(
-                        dset, tf, step.externaldate, step.extractor.timezone
-                    )
-                # Remove metadata entries we know will differ between different files.
-                for k in {"yadg_extract_date", "yadg_extract_filename"}:
-                    if k in fvals[name].attrs:
-                        del fvals[name].attrs[k]
-
-            vals = dgutils.merge_dicttrees(vals, fvals, strict_merge)
-
-        stepdt = DataTree.from_dict({} if vals is None else vals)
+    root.attrs = _root_attrs(dataschema)
+
+    manifest = {}
+    steps = _process_steps(dataschema, jobs, cache, previous, profiler)
+    for step, results, files in steps:
+        args = {"step": step.tag, "filetype": step.extractor.filetype}
+        with profile_stage(profiler, "merge", **args):
+            vals = dgutils.concat_dicttrees(results, strict_merge)
+
+        with profile_stage(profiler, "from_dict", **args):
+            stepdt = DataTree.from_dict({} if vals is None else vals)
         stepdt.name = step.tag
         root[step.tag] = stepdt
+        manifest[step.tag] = files
+    root.attrs["yadg_process_manifest"] = json.dumps(manifest)
     return root
+
+
+def stream_schema(
+    dataschema: DataSchema,
+    outfile: str,
+    strict_merge: bool = False,
+    jobs: int = 1,
+    cache: ExtractionCache = None,
+    previous: DataTree = None,
+    profiler: Profiler = None,
+) -> None:
+    """
+    Processes a :class:`DataSchema` directly into a NetCDF file.
+
+    Works like :func:`process_schema`, but instead of building the whole
+    :class:`DataTree` in memory, the data extracted from each file are appended into
+    the ``outfile`` as soon as they are available, using a
+    :class:`~yadg.dgutils.ncutils.DataTreeWriter`. The peak memory use is therefore
+    determined by the largest processed file rather than by the whole dataset.
+
+    Parameters
+    ----------
+
+    dataschema:
+        A :class:`DataSchema` object describing the extraction process.
+
+    outfile:
+        Path to the NetCDF file to be created.
+
+    strict_merge:
+        A :class:`bool` indicating whether metadata of the files processed in a single `step`
+        has to be identical. Defaults to ``False`` which means conflicts will be dropped.
+
+    jobs:
+        An :class:`int` specifying the number of worker processes used to extract the
+        files within each `step`. Defaults to ``1``, i.e. serial processing.
+
+    cache:
+        An optional :class:`~yadg.dgutils.cacheutils.ExtractionCache`.
+
+    previous:
+        An optional :class:`DataTree` created previously from the same ``dataschema``,
+        see :func:`process_schema`. It has to be fully loaded into memory if it was
+        read from ``outfile``.
+
+    profiler:
+        An optional :class:`~yadg.dgutils.profutils.Profiler`, see
+        :func:`process_schema`. The ``append`` stage of each file is recorded instead
+        of the ``merge`` and ``from_dict`` stages.
+
+    """
+
+    while hasattr(dataschema, "update"):
+        dataschema = dataschema.update()
+
+    manifest = {}
+    with DataTreeWriter(outfile, _root_attrs(dataschema), strict_merge) as writer:
+        steps = _process_steps(dataschema, jobs, cache, previous, profiler)
+        for step, results, files in steps:
+            writer.create_group(step.tag)
+            args = {"step": step.tag, "filetype": step.extractor.filetype}
+            for fvals in results:
+                with profile_stage(profiler, "append", **args):
+                    writer.append(step.tag, fvals)
+            manifest[step.tag] = files
+        writer.attrs["yadg_process_manifest"] = json.dumps(manifest)
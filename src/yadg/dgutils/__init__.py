@@ -1,31 +1,71 @@
-from .helpers import get_yadg_metadata
-from .dateutils import (
-    now,
-    infer_timestamp_from,
-    str_to_uts,
-    ole_to_uts,
-    complete_timestamps,
-    complete_uts,
-)
-from .schemautils import update_schema, schema_from_preset
-from .btools import read_value
-from .pintutils import sanitize_units
-from .dsutils import dicts_to_dataset, append_dicts, merge_dicttrees, merge_meta
+import importlib
+
+# The submodules are imported on first access to any of their members (PEP 562),
+# so that importing yadg does not pull in all of their dependencies.
+_members = {
+    "get_yadg_metadata": "helpers",
+    "open_source": "helpers",
+    "source_name": "helpers",
+    "now": "dateutils",
+    "infer_timestamp_from": "dateutils",
+    "str_to_uts": "dateutils",
+    "strs_to_uts": "dateutils",
+    "ole_to_uts": "dateutils",
+    "complete_timestamps": "dateutils",
+    "complete_uts": "dateutils",
+    "fix_day_rollover": "dateutils",
+    "update_schema": "schemautils",
+    "schema_from_preset": "schemautils",
+    "read_value": "btools",
+    "read_blocks": "btools",
+    "map_file": "btools",
+    "profile_stage": "profutils",
+    "sanitize_units": "pintutils",
+    "dicts_to_dataset": "dsutils",
+    "append_dicts": "dsutils",
+    "DatasetBuilder": "dsutils",
+    "merge_dicttrees": "dsutils",
+    "concat_dicttrees": "dsutils",
+    "merge_meta": "dsutils",
+}
+
+
+def __getattr__(name: str):
+    if name not in _members:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_members[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_members))
+
 
 __all__ = [
     "get_yadg_metadata",
+    "open_source",
+    "source_name",
     "now",
     "infer_timestamp_from",
     "str_to_uts",
+    "strs_to_uts",
     "ole_to_uts",
     "complete_timestamps",
     "complete_uts",
+    "fix_day_rollover",
     "update_schema",
     "schema_from_preset",
     "read_value",
+    "read_blocks",
+    "map_file",
+    "profile_stage",
     "sanitize_units",
     "dicts_to_dataset",
     "append_dicts",
+    "DatasetBuilder",
     "merge_dicttrees",
+    "concat_dicttrees",
     "merge_meta",
 ]
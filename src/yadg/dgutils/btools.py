@@ -1,14 +1,23 @@
+import os
+import mmap
 import numpy as np
-from typing import Any
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+from xarray.backends import BackendArray
+from xarray.core import indexing
 
 
-def read_pascal_string(pascal_bytes: bytes, encoding: str = "windows-1252") -> str:
+def read_pascal_string(
+    pascal_bytes: bytes | memoryview, encoding: str = "windows-1252"
+) -> str:
     """Parses a length-prefixed string given some encoding.
 
     Parameters
     ----------
     bytes
-        The bytes of the string starting at the length-prefix byte.
+        The bytes of the string starting at the length-prefix byte, or a
+        :class:`memoryview` of them.
 
     encoding
         The encoding of the string to be converted.
@@ -24,7 +33,7 @@ def read_pascal_string(pascal_bytes: bytes, encoding: str = "windows-1252") -> s
     if len(pascal_bytes) < lstr + 1:
         raise ValueError("Insufficient number of bytes.")
     string_bytes = pascal_bytes[1 : lstr + 1]
-    return string_bytes.decode(encoding)
+    return str(string_bytes, encoding)
 
 
 def read_value(
@@ -45,7 +54,7 @@ def read_value(
     Parameters
     ----------
     data
-        An object that exposes the buffer interface. Here always bytes.
+        An object that exposes the buffer interface, i.e. bytes or a memoryview.
 
     offset
         Start reading the buffer from this offset (in bytes).
@@ -73,3 +82,177 @@ def read_value(
         item = [i.decode(encoding) if isinstance(i, bytes) else i for i in item]
         return dict(zip(value.dtype.names, item))
     return item.decode(encoding) if isinstance(item, bytes) else item
+
+
+def read_blocks(
+    data: bytes,
+    offset: int,
+    stride: int,
+    n_blocks: int,
+    dtype: np.dtype | str,
+    count: int = 1,
+) -> np.ndarray:
+    """Gathers blocks of values stored at regular intervals in a buffer.
+
+    The ``n_blocks`` blocks of ``count`` values are spaced ``stride`` bytes apart,
+    starting at ``offset``. They are copied from a strided view of the buffer into
+    a preallocated array of shape ``(n_blocks, count)``.
+
+    Parameters
+    ----------
+    data
+        An object that exposes the buffer interface.
+
+    offset
+        The offset of the first block (in bytes).
+
+    stride
+        The distance between the starts of consecutive blocks (in bytes).
+
+    n_blocks
+        The number of blocks to read.
+
+    dtype
+        Data-type of the values in each block.
+
+    count
+        The number of values in each block.
+
+    Returns
+    -------
+    np.ndarray
+        The gathered blocks.
+
+    """
+    dtype = np.dtype(dtype)
+    out = np.empty((n_blocks, count), dtype=dtype)
+    if n_blocks == 0:
+        return out
+    size = dtype.itemsize * count
+    raw = np.frombuffer(
+        data, dtype="|u1", offset=offset, count=(n_blocks - 1) * stride + size
+    )
+    blocks = np.lib.stride_tricks.as_strided(
+        raw, shape=(n_blocks, size), strides=(stride, 1), writeable=False
+    )
+    out.view("|u1")[...] = blocks
+    return out
+
+
+@contextmanager
+def map_file(path: Path) -> Iterator[mmap.mmap | bytes]:
+    """
+    Maps the file at ``path`` into memory for reading, closing the mapping on exit.
+
+    Empty files cannot be memory-mapped, their (empty) contents are provided as bytes
+    instead. Arrays read from the mapping have to be copied before the context exits.
+
+    """
+    with open(path, "rb") as inf:
+        if os.fstat(inf.fileno()).st_size == 0:
+            yield inf.read()
+            return
+        contents = mmap.mmap(inf.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield contents
+    finally:
+        try:
+            contents.close()
+        except BufferError:
+            # Views into the mapping are still referenced, e.g. by a traceback; the
+            # mapping is then closed once they are garbage-collected.
+            pass
+
+
+class BlockArray(BackendArray):
+    """
+    A lazily indexed array of blocks of values stored at regular intervals in a file.
+
+    The array has a shape of ``(n_blocks,)`` or ``(n_blocks, count)``. The block
+    ``i`` starts ``offset + i * stride`` bytes from the start of the ``source``.
+    When the array is indexed, only the bytes of the requested values are read from
+    a memory map of the file. Wrap the array using :func:`lazy_array` to use it as
+    data of an :class:`xarray.Variable`.
+
+    Parameters
+    ----------
+    source
+        The :class:`Path` to the file.
+
+    offset
+        The offset of the first block (in bytes).
+
+    stride
+        The distance between the starts of consecutive blocks (in bytes).
+
+    n_blocks
+        The number of blocks.
+
+    dtype
+        Data-type of the stored values.
+
+    count
+        The number of values in each block. If ``None``, each block contains a
+        single value and the array is 1D.
+
+    func
+        An optional :class:`Callable` applied to the values read from the file,
+        called with the values and the indices of the corresponding blocks. The
+        ``dtype`` of the array is determined from its output.
+
+    """
+
+    def __init__(
+        self,
+        source: Path,
+        offset: int,
+        stride: int,
+        n_blocks: int,
+        dtype: np.dtype | str,
+        count: int = None,
+        func: Callable[[np.ndarray, np.ndarray], np.ndarray] = None,
+    ):
+        self.source = source
+        self.offset = int(offset)
+        self.stride = int(stride)
+        self.raw_dtype = np.dtype(dtype)
+        self.func = func
+        self.shape = (n_blocks,) if count is None else (n_blocks, count)
+        empty = np.empty((0,) * len(self.shape), dtype=self.raw_dtype)
+        self.dtype = empty.dtype if func is None else func(empty, np.arange(0)).dtype
+
+    def __getitem__(self, key: indexing.ExplicitIndexer) -> np.ndarray:
+        return indexing.explicit_indexing_adapter(
+            key, self.shape, indexing.IndexingSupport.BASIC, self._getitem
+        )
+
+    def _getitem(self, key: tuple) -> np.ndarray:
+        ranges = [range(n)[k] for n, k in zip(self.shape, key)]
+        squeeze = tuple(0 if isinstance(r, int) else slice(None) for r in ranges)
+        ranges = [range(r, r + 1) if isinstance(r, int) else r for r in ranges]
+        shape = tuple(len(r) for r in ranges)
+        if 0 in shape:
+            values = np.empty(shape, dtype=self.raw_dtype)
+        else:
+            offset = self.offset + ranges[0].start * self.stride
+            strides = [self.stride * ranges[0].step]
+            if len(ranges) > 1:
+                offset += ranges[1].start * self.raw_dtype.itemsize
+                strides.append(self.raw_dtype.itemsize * ranges[1].step)
+            view = np.ndarray(
+                shape,
+                dtype=self.raw_dtype,
+                buffer=np.memmap(self.source, dtype="|u1", mode="r"),
+                offset=offset,
+                strides=strides,
+            )
+            values = np.array(view)
+            del view
+        if self.func is not None:
+            values = self.func(values, np.asarray(ranges[0]))
+        return values[squeeze]
+
+
+def lazy_array(array: BackendArray) -> indexing.LazilyIndexedArray:
+    """Wraps the ``array`` so that it can be used as lazily loaded variable data."""
+    return indexing.LazilyIndexedArray(array)
@@ -0,0 +1,201 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import tempfile
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator
+from pathlib import Path
+from importlib import metadata
+from xarray import DataTree, load_datatree
+
+logger = logging.getLogger(__name__)
+
+# Default cap on the total size of the cached files, in bytes.
+DEFAULT_CACHE_SIZE = 2**30
+
+
+def default_cache_dir() -> Path:
+    """
+    Returns the default location of the extraction cache.
+
+    This is ``$YADG_CACHE_DIR`` if set, otherwise ``$XDG_CACHE_HOME/yadg`` with the
+    usual fallback to ``~/.cache/yadg``.
+    """
+    if "YADG_CACHE_DIR" in os.environ:
+        return Path(os.environ["YADG_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(base) / "yadg"
+
+
+@lru_cache
+def source_fingerprint(filetype: str) -> str:
+    """
+    Returns a fingerprint of the source files of yadg used to extract ``filetype``.
+
+    The fingerprint is computed from the size and ``mtime`` of the modules in the
+    family folder of the extractor, in :mod:`yadg.extractors` and in
+    :mod:`yadg.dgutils`, so that the cached entries are invalidated when an
+    extractor is modified, e.g. in a development install where the version of
+    yadg does not change.
+    """
+    root = Path(__file__).parents[1]
+    family = root / "extractors" / filetype.split(".")[0]
+    paths = [*family.rglob("*.py")]
+    paths += [*(root / "extractors").glob("*.py"), *(root / "dgutils").glob("*.py")]
+    m = hashlib.sha1()
+    for path in sorted(paths):
+        stat = path.stat()
+        m.update(
+            f"{path.relative_to(root)}:{stat.st_size}:{stat.st_mtime_ns};".encode()
+        )
+    return m.hexdigest()
+
+
+def file_digest(path: Path) -> str:
+    """Returns the SHA-1 digest of the contents of the file at ``path``."""
+    m = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(2**20), b""):
+            m.update(chunk)
+    return m.hexdigest()
+
+
+class ExtractionCache:
+    """
+    An on-disk cache of the :class:`DataTree` objects created by the extractors.
+
+    The cached objects are stored as NetCDF files in the ``path`` folder, along with
+    an ``index.sqlite`` database. Each entry is keyed by the digest of the contents
+    of the extracted file, the JSON serialisation of the extractor, the version of
+    yadg, and the fingerprint of its sources, see :func:`source_fingerprint`. The
+    digests are stored along with the size and ``mtime`` of the files,
+    so that unchanged files are not hashed again.
+
+    Once the total size of the cached files exceeds ``max_size``, the least
+    recently used entries are removed. The cache can be shared between processes.
+
+    Parameters
+    ----------
+
+    path:
+        The folder where the cache is stored. Defaults to the result of
+        :func:`default_cache_dir`.
+
+    max_size:
+        The maximum total size of the cached files in bytes.
+
+    """
+
+    def __init__(self, path: str | Path = None, max_size: int = DEFAULT_CACHE_SIZE):
+        self.path = default_cache_dir() if path is None else Path(path)
+        self.max_size = max_size
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(key TEXT PRIMARY KEY, size INTEGER, atime REAL)"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS digests "
+                "(path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, digest TEXT)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path / "index.sqlite", timeout=60)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _fragment(self, key: str) -> Path:
+        return self.path / f"{key}.nc"
+
+    def _digest(self, source: Path) -> str:
+        stat = source.stat()
+        path = str(source.resolve())
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT size, mtime, digest FROM digests WHERE path = ?", (path,)
+            ).fetchone()
+            if row is not None and row[:2] == (stat.st_size, stat.st_mtime_ns):
+                return row[2]
+            digest = file_digest(source)
+            db.execute(
+                "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, digest),
+            )
+        return digest
+
+    def key(self, source: Path, extractor) -> str:
+        """
+        Returns the cache key for the ``source`` file extracted using ``extractor``.
+        """
+        obj = {
+            "digest": self._digest(Path(source)),
+            "extractor": extractor.model_dump_json(),
+            "version": metadata.version("yadg"),
+            "source": source_fingerprint(extractor.filetype),
+        }
+        return hashlib.sha1(json.dumps(obj).encode()).hexdigest()
+
+    def get(self, key: str) -> DataTree | None:
+        """Returns the cached :class:`DataTree` stored under ``key``, if any."""
+        fn = self._fragment(key)
+        with self._connect() as db:
+            row = db.execute("SELECT key FROM entries WHERE key = ?", (key,))
+            if row.fetchone() is None or not fn.exists():
+                return None
+            db.execute("UPDATE entries SET atime = ? WHERE key = ?", (time.time(), key))
+        logger.debug("Loading cached entry '%s'.", key)
+        try:
+            return load_datatree(fn, engine="h5netcdf")
+        except OSError:
+            # The entry might have been evicted by another process in the meantime.
+            return None
+
+    def put(self, key: str, dt: DataTree) -> None:
+        """Stores the :class:`DataTree` under ``key``, evicting old entries."""
+        fd, tmp = tempfile.mkstemp(suffix=".nc.tmp", dir=self.path)
+        os.close(fd)
+        try:
+            dt.to_netcdf(tmp, engine="h5netcdf")
+            os.replace(tmp, self._fragment(key))
+        except Exception:
+            os.unlink(tmp)
+            raise
+        size = self._fragment(key).stat().st_size
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+                (key, size, time.time()),
+            )
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used entries until ``max_size`` is satisfied."""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT key, size FROM entries ORDER BY atime DESC"
+            ).fetchall()
+            total = 0
+            for key, size in rows:
+                total += size
+                if total <= self.max_size:
+                    continue
+                logger.debug("Evicting cached entry '%s'.", key)
+                self._fragment(key).unlink(missing_ok=True)
+                db.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Removes all entries from the cache."""
+        with self._connect() as db:
+            for (key,) in db.execute("SELECT key FROM entries").fetchall():
+                self._fragment(key).unlink(missing_ok=True)
+            db.execute("DELETE FROM entries")
+            db.execute("DELETE FROM digests")
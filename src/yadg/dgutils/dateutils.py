@@ -1,11 +1,15 @@
 import os
+import re
 import pickle
 import json
 import datetime
 import dateutil.parser
 import logging
+import warnings
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 import numpy as np
+import pandas as pd
 from pydantic import BaseModel
 from typing import Callable, Mapping, Iterable
 from xarray import Dataset
@@ -15,6 +19,74 @@ from dgbowl_schemas.yadg.dataschema_5_0.timestamp import TimestampSpec
 
 logger = logging.getLogger(__name__)
 
+# Formats which can be learned from a timestamp parsed by dateutil.parser.parse.
+# Any string matching one of these formats is parsed the same way by both
+# dateutil.parser.parse and datetime.datetime.strptime.
+LEARNED_FORMATS = [
+    f"{date}{sep}{time}{frac}{tz}"
+    for date in ("%Y-%m-%d", "%m/%d/%Y")
+    for sep in ("T", " ")
+    for time in ("%H:%M:%S", "%H:%M")
+    for frac in ((".%f", "") if time == "%H:%M:%S" else ("",))
+    for tz in ("", "%z")
+] + ["%Y-%m-%d", "%m/%d/%Y", "%m/%d/%Y %I:%M:%S %p", "%m/%d/%Y %I:%M %p"]
+
+# The learned formats, keyed by the shape of the timestamps, see _shape().
+_formats = {}
+
+# Full ISO 8601 dates, with an optional time and UTC offset, which are parsed the
+# same way by pandas.to_datetime and dateutil.parser.parse. Partial dates, such as
+# "2020-01", are completed differently and therefore excluded.
+ISO_DATETIME = (
+    r"\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d{1,6})?)?)?(Z|[+-]\d{2}(:?\d{2})?)?"
+)
+
+
+@lru_cache(maxsize=None)
+def get_zoneinfo(timezone: str) -> ZoneInfo:
+    """Returns the :class:`ZoneInfo` of the ``timezone``, cached for reuse."""
+    return ZoneInfo(timezone)
+
+
+def _shape(timestamp: str) -> str:
+    """Returns the shape of the ``timestamp``, with all digits replaced by ``0``."""
+    return re.sub(r"\d", "0", timestamp)
+
+
+def learn_format(timestamp: str, dt: datetime.datetime = None) -> str | None:
+    """
+    Learns the format of the ``timestamp`` which was parsed as ``dt`` by
+    :func:`dateutil.parser.parse`.
+
+    The format is chosen from the :obj:`LEARNED_FORMATS`, which are checked to
+    reproduce the ``dt`` using :func:`datetime.datetime.strptime`. The learned format
+    is stored under the shape of the ``timestamp``, so that it is reused for other
+    timestamps of the same shape by :func:`str_to_uts` and :func:`strs_to_uts`.
+    Returns :obj:`None` if none of the formats matches.
+
+    """
+    shape = _shape(timestamp)
+    if shape in _formats:
+        return _formats[shape]
+    if dt is None:
+        try:
+            dt = dateutil.parser.parse(timestamp)
+        except (dateutil.parser.ParserError, ValueError, OverflowError):
+            return None
+    ret = None
+    for fmt in LEARNED_FORMATS:
+        try:
+            ldt = datetime.datetime.strptime(timestamp, fmt)
+        except ValueError:
+            continue
+        naive = ldt.replace(tzinfo=None) == dt.replace(tzinfo=None)
+        if naive and ldt.utcoffset() == dt.utcoffset():
+            ret = fmt
+            break
+    if len(_formats) < 1024:
+        _formats[shape] = ret
+    return ret
+
 
 def now(
     asstr: bool = False, tz: datetime.timezone = datetime.timezone.utc
@@ -55,7 +127,7 @@ def ole_to_uts(ole_timestamp: float, timezone: str) -> float:
         The corresponding Unix timestamp.
 
     """
-    tzinfo = ZoneInfo(timezone)
+    tzinfo = get_zoneinfo(timezone)
     ole_base = datetime.datetime(year=1899, month=12, day=30, tzinfo=tzinfo)
     ole_delta = datetime.timedelta(days=ole_timestamp)
     time = ole_base + ole_delta
@@ -75,7 +147,9 @@ def str_to_uts(
     If the optional ``format`` is specified, the ``timestamp`` string is processed
     using the :func:`datetime.datetime.strptime` function; if no ``format`` is
     supplied, an ISO 8601 format is assumed and an attempt to parse using
-    :func:`dateutil.parser.parse` is made.
+    :func:`dateutil.parser.parse` is made. In the latter case, the format of the
+    ``timestamp`` is learned using :func:`learn_format`, and further timestamps
+    of the same shape are parsed using :func:`datetime.datetime.strptime`.
 
     Parameters
     ----------
@@ -100,11 +174,20 @@ def str_to_uts(
 
     try:
         if format is None:
-            dt = dateutil.parser.parse(timestamp)
+            dt = None
+            learned = _formats.get(_shape(timestamp))
+            if learned is not None:
+                try:
+                    dt = datetime.datetime.strptime(timestamp, learned)
+                except ValueError:
+                    pass
+            if dt is None:
+                dt = dateutil.parser.parse(timestamp)
+                learn_format(timestamp, dt)
         else:
             dt = datetime.datetime.strptime(timestamp, format)
 
-        local_tz = ZoneInfo(timezone) if dt.tzinfo is None else dt.tzinfo
+        local_tz = get_zoneinfo(timezone) if dt.tzinfo is None else dt.tzinfo
         local_dt = dt.replace(tzinfo=local_tz)
         utc_dt = local_dt.astimezone(datetime.timezone.utc)
         return utc_dt.timestamp()
@@ -120,6 +203,247 @@ def str_to_uts(
             return None
 
 
+def _to_datetimes(
+    values: list[str], format: str, pattern: str = None
+) -> pd.Series | None:
+    """
+    Parses the ``values`` using :func:`pandas.to_datetime` with the given ``format``,
+    or as ISO 8601 if no ``format`` is given. Unparseable entries, as well as those
+    not matching the ``pattern`` if supplied, are returned as ``NaT``. Returns
+    :obj:`None` if the ``values`` cannot be parsed in bulk, e.g. as they contain
+    mixed UTC offsets.
+    """
+    series = pd.Series(values, dtype=object)
+    if pattern is not None:
+        series = series.where(series.str.fullmatch(pattern, na=False), None)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            return pd.to_datetime(
+                series,
+                format="ISO8601" if format is None else format,
+                errors="coerce",
+            )
+    except (ValueError, TypeError, OverflowError, Warning):
+        return None
+
+
+def _to_microseconds(dt: pd.Series) -> np.ndarray:
+    """Returns the microseconds since epoch of the naive ``dt``, with NaN for ``NaT``."""
+    us = dt.to_numpy("datetime64[us]")
+    ret = us.view("i8").astype(float)
+    ret[np.isnat(us)] = np.nan
+    return ret
+
+
+def column_to_uts(
+    values: list[str],
+    *,
+    timezone: str,
+    format: str = None,
+    strict: bool = True,
+) -> np.ndarray:
+    """
+    Converts a column of strings to POSIX timestamps at once.
+
+    The whole column is parsed using :func:`pandas.to_datetime`, and localised to the
+    ``timezone`` in bulk. The entries which cannot be processed that way, such as
+    those which are not full ISO 8601 dates if no ``format`` is supplied, or those
+    which are ambiguous or do not exist due to DST transitions in the ``timezone``,
+    are converted one by one using :func:`str_to_uts`. The results are the same as if
+    all entries were converted using :func:`str_to_uts`.
+
+    Parameters
+    ----------
+    values
+        A list of strings containing the timestamps.
+
+    timezone
+        Timezone of the ``values``, unless they contain an UTC offset.
+
+    format
+        Optional format string for parsing of the ``values``.
+
+    strict
+        Whether to re-raise any parsing errors. Otherwise, unparseable entries
+        are returned as NaN.
+
+    Returns
+    -------
+    uts: np.ndarray
+        The POSIX timestamps.
+
+    """
+    uts = np.full(len(values), np.nan)
+    dt = _to_datetimes(values, format, ISO_DATETIME if format is None else None)
+    if dt is not None:
+        if dt.dt.tz is None:
+            dt = dt.dt.tz_localize(timezone, ambiguous="NaT", nonexistent="NaT")
+        uts = _to_microseconds(dt.dt.tz_convert(None)) / 1e6
+    for i in np.flatnonzero(np.isnan(uts)):
+        ret = str_to_uts(
+            timestamp=values[i], format=format, timezone=timezone, strict=strict
+        )
+        uts[i] = np.nan if ret is None else ret
+    return uts
+
+
+def strs_to_uts(
+    timestamps: list[str],
+    *,
+    timezone: str,
+    format: str = None,
+    strict: bool = True,
+) -> np.ndarray:
+    """
+    Converts a series of strings to POSIX timestamps.
+
+    This is the bulk version of :func:`str_to_uts`, with the same results. If no
+    ``format`` is supplied, the format of the series is learned from its first
+    entry using :func:`learn_format`, and the whole series is converted using
+    :func:`column_to_uts`. Entries which do not match the learned format are
+    parsed using :func:`dateutil.parser.parse`.
+
+    Parameters
+    ----------
+    timestamps
+        A list of strings containing the timestamps.
+
+    timezone
+        Timezone of the ``timestamps``, unless they contain an UTC offset.
+
+    format
+        Optional format string for parsing of the ``timestamps``.
+
+    strict
+        Whether to re-raise any parsing errors. Otherwise, unparseable entries
+        are returned as NaN.
+
+    Returns
+    -------
+    uts: np.ndarray
+        The POSIX timestamps.
+
+    """
+    timestamps = list(timestamps)
+    if format is not None or len(timestamps) == 0:
+        return column_to_uts(
+            timestamps, format=format, timezone=timezone, strict=strict
+        )
+    learned = learn_format(timestamps[0])
+    if learned is None:
+        return column_to_uts(timestamps, timezone=timezone, strict=strict)
+    uts = column_to_uts(timestamps, format=learned, timezone=timezone, strict=False)
+    for i in np.flatnonzero(np.isnan(uts)):
+        ret = str_to_uts(timestamp=timestamps[i], timezone=timezone, strict=strict)
+        uts[i] = np.nan if ret is None else ret
+    return uts
+
+
+def time_to_seconds(value: str, format: str = None) -> float:
+    """
+    Converts a string containing a time of day to the number of seconds since midnight.
+
+    If the optional ``format`` is specified, the ``value`` is processed using the
+    :func:`datetime.datetime.strptime` function; otherwise, an ISO 8601 format is
+    assumed.
+
+    """
+    if format is not None:
+        t = datetime.datetime.strptime(value, format)
+    else:
+        t = datetime.time.fromisoformat(value)
+    td = datetime.timedelta(
+        hours=t.hour,
+        minutes=t.minute,
+        seconds=t.second,
+        microseconds=t.microsecond,
+    )
+    return td.total_seconds()
+
+
+def column_to_seconds(values: list[str], format: str = None) -> np.ndarray:
+    """
+    Converts a column of strings containing times of day to the number of seconds
+    since midnight at once.
+
+    The whole column is parsed using :func:`pandas.to_datetime`. The entries which
+    cannot be processed that way, such as those which are not in the ``HH:MM:SS``
+    format if no ``format`` is supplied, are converted one by one using
+    :func:`time_to_seconds`, with the same results.
+
+    """
+    secs = np.full(len(values), np.nan)
+    if format is None:
+        dt = _to_datetimes(values, "%H:%M:%S", r"\d{2}:\d{2}:\d{2}")
+    else:
+        dt = _to_datetimes(values, format)
+    if dt is not None:
+        secs = _to_microseconds(dt - dt.dt.normalize() + pd.Timestamp(0)) / 1e6
+    for i in np.flatnonzero(np.isnan(secs)):
+        secs[i] = time_to_seconds(values[i], format)
+    return secs
+
+
+class DateFunc:
+    """
+    The :class:`Callable` returned by :func:`infer_timestamp_from`.
+
+    Calling the instance with the items of the ``datecolumns`` of a single row
+    returns the timestamp of that row. The method :meth:`columns` processes the
+    whole ``datecolumns`` at once.
+
+    """
+
+    def __init__(self, rowfunc: Callable, colfunc: Callable):
+        self.rowfunc = rowfunc
+        self.colfunc = colfunc
+
+    def __call__(self, *values: str) -> float:
+        return self.rowfunc(*values)
+
+    def columns(self, *columns: list[str]) -> np.ndarray:
+        """Returns the timestamps of all rows of the supplied ``columns``."""
+        return self.colfunc(*columns)
+
+
+def fix_day_rollover(uts: np.ndarray, period: float = 86400.0) -> np.ndarray:
+    """
+    Makes the time-of-day timestamps ``uts`` monotonic by adding day offsets.
+
+    Whenever a timestamp is lower than the preceding one, the timestamps are assumed
+    to cross a day boundary, and the smallest number of days making the sequence
+    non-decreasing at that point is added to it and all following timestamps. The
+    offsets are computed at once from the drops in ``uts`` and their cumulative sum.
+
+    Timestamps adjacent to a NaN are not considered as drops, and the offset reached
+    before a NaN is carried over to the following timestamps. This differs from the
+    former loop in the DryCal extractors, which compared the timestamp after a NaN
+    with the NaN and therefore did not apply the offset until the next drop.
+
+    Parameters
+    ----------
+    uts
+        The timestamps, e.g. seconds since midnight.
+
+    period
+        The length of a day, in the units of ``uts``.
+
+    Returns
+    -------
+    uts: np.ndarray
+        The corrected timestamps.
+
+    """
+    uts = np.asarray(uts, dtype=float)
+    if uts.size < 2:
+        return uts.copy()
+    # Differences with NaN are not drops, so NaN values do not add any offset.
+    drops = np.fmax(uts[:-1] - uts[1:], 0.0)
+    days = np.concatenate(([0.0], np.cumsum(np.ceil(drops / period))))
+    return uts + days * period
+
+
 def infer_timestamp_from(
     *,
     headers: list = None,
@@ -152,86 +476,61 @@ def infer_timestamp_from(
     (datecolumns, datefunc, fulldate): tuple[list, Callable, bool]
         A tuple containing a list of indices of columns, a Callable to which the
         columns have to be passed to obtain a uts timestamp, and whether the determined
-        timestamp is full or partial.
+        timestamp is full or partial. Except for "uts", the Callable is a
+        :class:`DateFunc`, which can also process whole columns at once.
 
     """
 
+    def strfunc(format: str) -> DateFunc:
+        def rowfunc(value):
+            return str_to_uts(timestamp=value, format=format, timezone=timezone)
+
+        def colfunc(values):
+            return strs_to_uts(values, format=format, timezone=timezone)
+
+        return DateFunc(rowfunc, colfunc)
+
     if spec is not None:
         if hasattr(spec, "uts"):
             return [spec.uts.index], float, True
         elif hasattr(spec, "timestamp"):
-
-            def retfunc(value):
-                return str_to_uts(
-                    timestamp=value, format=spec.timestamp.format, timezone=timezone
-                )
-
-            return [spec.timestamp.index], retfunc, True
+            return [spec.timestamp.index], strfunc(spec.timestamp.format), True
         elif hasattr(spec, "date") or hasattr(spec, "time"):
-            specdict = {
-                "date": datetime.datetime.fromtimestamp(0).timestamp,
-                "time": datetime.datetime.fromtimestamp(0).timestamp,
-            }
-            cols = [None, None]
             if spec.date is not None:
-
-                def datefn(value):
-                    return str_to_uts(
-                        timestamp=value, format=spec.date.format, timezone=timezone
-                    )
-
-                cols[0] = spec.date.index
-                specdict["date"] = datefn
+                datefn = strfunc(spec.date.format)
             if spec.time is not None:
-                if spec.time.format is not None:
-
-                    def timefn(value):
-                        t = datetime.datetime.strptime(value, spec.time.format)
-                        td = datetime.timedelta(
-                            hours=t.hour,
-                            minutes=t.minute,
-                            seconds=t.second,
-                            microseconds=t.microsecond,
-                        )
-                        return td.total_seconds()
-
-                else:
+                if spec.time.format is None:
                     logger.debug(
                         "Assuming specified column is time in ISO 8601 format."
                     )
+                tformat = spec.time.format
 
-                    def timefn(value):
-                        t = datetime.time.fromisoformat(value)
-                        td = datetime.timedelta(
-                            hours=t.hour,
-                            minutes=t.minute,
-                            seconds=t.second,
-                            microseconds=t.microsecond,
-                        )
-                        return td.total_seconds()
-
-                cols[1] = spec.time.index
-                specdict["time"] = timefn
-            if cols[0] is None:
-                return [cols[1]], specdict["time"], False
-            elif cols[1] is None:
-                return [cols[0]], specdict["date"], False
+                def rowtime(value):
+                    return time_to_seconds(value, tformat)
+
+                def coltime(values):
+                    return column_to_seconds(values, tformat)
+
+                timefn = DateFunc(rowtime, coltime)
+            if spec.date is None:
+                return [spec.time.index], timefn, False
+            elif spec.time is None:
+                return [spec.date.index], datefn, False
             else:
 
                 def retfn(date, time):
-                    return specdict["date"](date) + specdict["time"](time)
+                    return datefn(date) + timefn(time)
 
-                return cols, retfn, True
+                def colfn(dates, times):
+                    return datefn.columns(dates) + timefn.columns(times)
+
+                return [spec.date.index, spec.time.index], DateFunc(retfn, colfn), True
     elif "uts" in headers:
         logger.debug("Assuming column 'uts' is a valid unix timestamp.")
         return [headers.index("uts")], float, True
     elif "timestamp" in headers:
         logger.debug("Assuming column 'timestamp' is a valid ISO 8601 timestamp")
-
-        def retfunc(value):
-            return str_to_uts(timestamp=value, timezone=timezone)
-
-        return [headers.index("timestamp")], retfunc, True
+        return [headers.index("timestamp")], strfunc(None), True
     else:
         assert False, "dateutils: A valid timestamp could not be deduced."
 
@@ -350,7 +649,7 @@ def timestamps_from_file(
     type: str,
     match: str,
     timezone: str,
-) -> float | list[float]:
+) -> float | np.ndarray:
     """
     Load timestamps from file.
 
@@ -360,6 +659,10 @@ def timestamps_from_file(
     or a top-level :class:`Iterable`, both containing :class:`str` or :class:`float`
     -like objects that can be processed into an Unix timestamp.
 
+    The parsed timestamps are cached per process, keyed by the ``path`` and its
+    modification time, as well as the ``type``, ``match``, and ``timezone``, so
+    that a file shared by many files of a `step` is loaded and parsed only once.
+
     Parameters
     ----------
     path
@@ -376,13 +679,27 @@ def timestamps_from_file(
 
     Returns
     -------
-    parseddata: float | list[float]
-        A single or a list of POSIX timestamps.
+    parseddata: float | np.ndarray
+        A single or an array of POSIX timestamps.
 
     """
     assert os.path.exists(path), f"timestamps_from_file: path '{path}' doesn't exist."
     assert os.path.isfile(path), f"timestamps_from_file: Path '{path}' is not a file."
 
+    path = os.path.abspath(path)
+    data = _load_timestamps(path, os.path.getmtime(path), type, match, timezone)
+    # A copy is returned, so that the cached array cannot be modified.
+    return data.copy() if isinstance(data, np.ndarray) else data
+
+
+@lru_cache(maxsize=32)
+def _load_timestamps(
+    path: str,
+    mtime: float,
+    type: str,
+    match: str,
+    timezone: str,
+) -> float | np.ndarray | None:
     if type == "pkl":
         logger.debug("Loading '%s' as pickle.", path)
         with open(path, "rb") as infile:
@@ -401,24 +718,22 @@ def timestamps_from_file(
         if isinstance(data, Mapping):
             assert match in data
             data = data[match]
-        if isinstance(data, Iterable):
-            parseddata = []
-            for i in data:
-                if isinstance(i, str):
-                    delta = str_to_uts(
-                        timestamp=i, format=None, timezone=timezone, strict=True
-                    )
-                    parseddata.append(delta)
-                elif isinstance(i, (int, float, np.number)):
-                    parseddata.append(float(i))
+        if isinstance(data, Iterable) and not isinstance(data, str):
+            # Entries which are neither strings nor numbers are skipped.
+            data = [i for i in data if isinstance(i, (str, int, float, np.number))]
+            parseddata = np.empty(len(data))
+            strs = [i for i, v in enumerate(data) if isinstance(v, str)]
+            nums = [i for i, v in enumerate(data) if not isinstance(v, str)]
+            parseddata[nums] = [data[i] for i in nums]
+            if len(strs) > 0:
+                parseddata[strs] = strs_to_uts(
+                    [data[i] for i in strs], timezone=timezone, strict=True
+                )
             return parseddata
+        elif isinstance(data, str):
+            return str_to_uts(timestamp=data, format=None, timezone=timezone)
         else:
-            if isinstance(data, str):
-                return str_to_uts(
-                    timestamp=data, format=None, timezone=timezone, strict=True
-                )
-            else:
-                return float(data)
+            return float(data)
 
 
 def complete_uts(
@@ -1,7 +1,8 @@
+from array import array
 import numpy as np
 import xarray as xr
 from xarray import Dataset
-from typing import Any
+from typing import Any, Iterable
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,6 +30,19 @@ def append_dicts(
         meta[k].append(np.nan)
 
 
+def _constant(devs: list | np.ndarray) -> Any | None:
+    """Returns the single value of ``devs`` other than NaN, if there is one."""
+    if isinstance(devs, np.ndarray) and devs.dtype.kind == "f":
+        setdev = devs[~np.isnan(devs)]
+        if setdev.size > 0 and setdev.min() == setdev.max():
+            return setdev[0]
+        return None
+    setdev = set(devs)
+    if np.nan in setdev:
+        setdev.remove(np.nan)
+    return setdev.pop() if len(setdev) == 1 else None
+
+
 def dicts_to_dataset(
     data: dict[str, list[Any]],
     meta: dict[str, list[Any]],
@@ -56,11 +70,9 @@ def dicts_to_dataset(
             attrs["yadg_uncertainty_absolute"] = 1
             attrs["yadg_uncertainty_distribution"] = "rectangular"
             attrs["yadg_uncertainty_source"] = "sigfig"
-            setdev = set(meta[key])
-            if np.nan in setdev:
-                setdev.remove(np.nan)
-            if len(setdev) == 1:
-                darrs[err] = xr.DataArray(data=setdev.pop(), dims=[], attrs=attrs)
+            dev = _constant(meta[key])
+            if dev is not None:
+                darrs[err] = xr.DataArray(data=dev, dims=[], attrs=attrs)
             else:
                 darrs[err] = xr.DataArray(data=meta[key], dims=["uts"], attrs=attrs)
     if "uts" in data:
@@ -74,38 +86,300 @@ def dicts_to_dataset(
     return xr.Dataset(data_vars=darrs, coords=coords, attrs=attrs)
 
 
+class _Column:
+    """
+    A column of the :class:`DatasetBuilder`, storing the appended values along with
+    the indices of their rows in a typed, growable :class:`array.array`. The values
+    missing in some rows are only filled in by :meth:`values`.
+    """
+
+    def __init__(self):
+        self.rows = array("q")
+        self.items = []
+
+    def values(self, size: int) -> np.ndarray | list:
+        """
+        Returns the values of the column of ``size`` rows, filled in the same way
+        and with the same dtype as if they were accumulated by :func:`append_dicts`.
+        """
+        try:
+            data = np.asarray(self.items)
+        except ValueError:
+            data = None
+        numeric = data is not None and data.ndim == 1 and data.dtype.kind in "biuf"
+        if len(self.rows) == size:
+            return data if numeric else self.items
+        elif numeric:
+            ret = np.full(size, np.nan)
+            ret[np.frombuffer(self.rows, dtype=np.int64)] = data
+            return ret
+        first = self.rows[0]
+        ret = [None if isinstance(self.items[0], str) else np.nan] * first
+        ret += [np.nan] * (size - first)
+        for row, item in zip(self.rows, self.items):
+            ret[row] = item
+        return ret
+
+
+class _Columns:
+    """
+    The columns of the values or uncertainties of a :class:`DatasetBuilder`.
+
+    The values of rows with the same keys as the preceding row are collected in a
+    flat block, which is sliced into the columns once a row with other keys is
+    appended. The values of all other rows are appended to their columns one by one.
+    """
+
+    def __init__(self):
+        self.columns = {}
+        self.appends = {}
+        self.keys = None
+        self.start = 0
+        self.block = []
+
+    def append(self, row: int, vals: dict[str, Any]) -> None:
+        keys = tuple(vals)
+        if keys == self.keys:
+            self.block.extend(vals.values())
+            return
+        self.flush()
+        self.keys = keys
+        self.start = row + 1
+        for k, v in vals.items():
+            try:
+                append_row, append_item = self.appends[k]
+            except KeyError:
+                col = self.columns[k] = _Column()
+                append_row, append_item = self.appends[k] = (
+                    col.rows.append,
+                    col.items.append,
+                )
+            append_row(row)
+            append_item(v)
+
+    def flush(self) -> None:
+        if len(self.block) == 0:
+            return
+        nkeys = len(self.keys)
+        n = len(self.block) // nkeys
+        rows = np.arange(self.start, self.start + n, dtype=np.int64).tobytes()
+        for i, k in enumerate(self.keys):
+            col = self.columns[k]
+            col.rows.frombytes(rows)
+            col.items.extend(self.block[i::nkeys])
+        self.start += n
+        self.block = []
+
+    def values(self, size: int) -> dict[str, np.ndarray | list]:
+        self.flush()
+        return {k: col.values(size) for k, col in self.columns.items()}
+
+
+class DatasetBuilder:
+    """
+    A columnar replacement of :func:`append_dicts` and :func:`dicts_to_dataset`.
+
+    Rows of values and their uncertainties are appended using :meth:`append`. Each
+    value is stored in its column along with the index of its row, so that the cost
+    of appending a row does not depend on the number of all columns, and consecutive
+    rows with the same keys are stored in flat blocks. The columns are
+    converted to :mod:`numpy` arrays at once in :meth:`to_dataset`, with the values
+    missing in some rows filled in the same way as by :func:`append_dicts`. The
+    returned :class:`xarray.Dataset` is the same as the one created by
+    :func:`dicts_to_dataset`.
+
+    """
+
+    def __init__(self):
+        self.data = _Columns()
+        self.meta = _Columns()
+        self.size = 0
+
+    def append(self, vals: dict[str, Any], devs: dict[str, Any] | None = None) -> None:
+        """Appends a row of ``vals`` and their uncertainties ``devs``."""
+        self.data.append(self.size, vals)
+        self.meta.append(self.size, {} if devs is None else devs)
+        self.size += 1
+
+    def to_dataset(
+        self, units: dict[str, str] | None = None, fulldate: bool = True
+    ) -> Dataset:
+        """Creates the :class:`xarray.Dataset`, see :func:`dicts_to_dataset`."""
+        data = self.data.values(self.size)
+        meta = self.meta.values(self.size)
+        return dicts_to_dataset(data, meta, {} if units is None else units, fulldate)
+
+
+def _merge_error(old: dict, new: dict) -> RuntimeError:
+    return RuntimeError(
+        "Merging metadata from multiple files has failed, as some of the "
+        "values differ between files. This might be caused by trying to "
+        "parse data obtained using different techniques/protocols in a "
+        "single step. If you are certain this is what you want, try using "
+        "yadg with the '--ignore-merge-errors' option."
+        f"\n{old=}"
+        f"\n{new=}"
+    )
+
+
+def _attrs_equal(old: dict, new: dict) -> bool:
+    if old.keys() != new.keys():
+        return False
+    return all(np.array_equal(v, new[k]) for k, v in old.items())
+
+
+def _merge_attrs(old: dict, new: dict, strict_merge: bool) -> None:
+    """
+    Merges the ``new`` attrs into ``old`` in place.
+
+    Unless ``strict_merge`` is set, the entries of ``old`` conflicting with ``new``
+    are removed, and the entries missing in ``old`` are added. An entry removed due
+    to a conflict is therefore re-added by a later file, as when the files are merged
+    pairwise using ``combine_attrs="drop_conflicts"``.
+    """
+    if strict_merge:
+        if not _attrs_equal(old, new):
+            raise _merge_error(old, new)
+        return
+    for k, v in new.items():
+        if k not in old:
+            old[k] = v
+        elif not np.array_equal(old[k], v):
+            del old[k]
+
+
+def _drop_conflicts(variable_attrs: list[dict], context=None) -> dict:
+    ret = {}
+    for attrs in variable_attrs:
+        _merge_attrs(ret, attrs, strict_merge=False)
+    return ret
+
+
+def _concat_kwargs(strict_merge: bool) -> dict:
+    return dict(
+        dim="uts",
+        data_vars="different",
+        compat="identical" if strict_merge else "equals",
+        join="outer",
+        combine_attrs="identical" if strict_merge else _drop_conflicts,
+    )
+
+
 def merge_dicttrees(vals: dict, fvals: dict, strict_merge: bool) -> dict:
     """
     A helper function that merges two ``DataTree.to_dict()`` objects by concatenating
     the new values in ``fvals`` to the existing ones in ``vals``.
 
+    As each call copies all data accumulated in ``vals``, merging many objects
+    should be done using :func:`concat_dicttrees` instead.
+
     """
     if vals is None:
         return fvals
     for k in fvals.keys():
         try:
-            # vals[k] = xr.concat([vals[k], fvals[k]], dim="uts", combine_attrs=mode)
-            vals[k] = xr.concat(
-                [vals[k], fvals[k]],
-                dim="uts",
-                data_vars="different",
-                compat="identical" if strict_merge else "equals",
-                join="outer",
-                combine_attrs="identical" if strict_merge else "drop_conflicts",
-            )
+            vals[k] = xr.concat([vals[k], fvals[k]], **_concat_kwargs(strict_merge))
         except (xr.MergeError, ValueError) as e:
-            raise RuntimeError(
-                "Merging metadata from multiple files has failed, as some of the "
-                "values differ between files. This might be caused by trying to "
-                "parse data obtained using different techniques/protocols in a "
-                "single step. If you are certain this is what you want, try using "
-                "yadg with the '--ignore-merge-errors' option."
-                f"\n{vals[k].attrs=}"
-                f"\n{fvals[k].attrs=}"
-            ) from e
+            raise _merge_error(vals[k].attrs, fvals[k].attrs) from e
     return vals
 
 
+def concat_dicttrees(dicttrees: Iterable[dict], strict_merge: bool) -> dict | None:
+    """
+    A helper function that merges a sequence of ``DataTree.to_dict()`` objects.
+
+    The :class:`Dataset` objects belonging to each node are first accumulated, with
+    the compatibility of their ``attrs`` checked as each object arrives if
+    ``strict_merge`` is set. A single :func:`xarray.concat` along ``"uts"`` is then
+    performed per node, making the merge linear in the number of objects. The node
+    order follows the order of the supplied ``dicttrees``. Conflicting ``attrs`` are
+    resolved as in :func:`merge_dicttrees`, see :func:`_merge_attrs`.
+
+    Returns ``None`` if ``dicttrees`` is empty.
+
+    """
+    nodes: dict[str, list[Dataset]] = {}
+    for fvals in dicttrees:
+        for k, dset in fvals.items():
+            if k not in nodes:
+                nodes[k] = [dset]
+                continue
+            if strict_merge and not _attrs_equal(nodes[k][0].attrs, dset.attrs):
+                raise _merge_error(nodes[k][0].attrs, dset.attrs)
+            nodes[k].append(dset)
+
+    if len(nodes) == 0:
+        return None
+
+    vals = {}
+    for k, dsets in nodes.items():
+        if len(dsets) == 1:
+            vals[k] = dsets[0]
+            continue
+        try:
+            vals[k] = _concat_datasets(dsets, strict_merge)
+        except (xr.MergeError, ValueError) as e:
+            raise _merge_error(dsets[0].attrs, dsets[-1].attrs) from e
+    return vals
+
+
+def _concat_datasets(dsets: list[Dataset], strict_merge: bool) -> Dataset:
+    """
+    Concatenates ``dsets`` along ``"uts"`` in a single :func:`xarray.concat` call.
+
+    The variables without a ``"uts"`` dimension are resolved first, so that the result
+    is the same as the one obtained by pairwise merging using :func:`merge_dicttrees`:
+    such a variable stays constant as long as all files carrying it agree, otherwise
+    it is broadcast along ``"uts"`` from the first file where it differs, with the
+    previous constant value used for all preceding files.
+
+    """
+    compare = "identical" if strict_merge else "equals"
+    names = {}
+    for dset in dsets:
+        for name, var in dset.variables.items():
+            if "uts" not in var.dims and name not in dset.indexes:
+                names.setdefault(name, name in dset.coords)
+
+    dsets = list(dsets)
+    constants = {}
+    for name, iscoord in names.items():
+        value = None
+        start = None
+        for i, dset in enumerate(dsets):
+            var = dset.variables.get(name)
+            if var is None:
+                continue
+            elif "uts" in var.dims or (
+                value is not None and not getattr(value, compare)(var)
+            ):
+                start = i
+                break
+            elif value is None:
+                value = var
+        if start is None:
+            constants[name] = (value, iscoord)
+            dsets = [dset.drop_vars(name, errors="ignore") for dset in dsets]
+            continue
+        for i, dset in enumerate(dsets):
+            var = dset.variables.get(name) if i >= start else value
+            if var is None or "uts" in var.dims:
+                continue
+            dims = ("uts", *var.dims)
+            shape = (dset.sizes["uts"], *var.shape)
+            dsets[i] = dset.assign({name: var.set_dims(dims, shape)})
+            if iscoord:
+                dsets[i] = dsets[i].set_coords(name)
+
+    ret = xr.concat(dsets, **_concat_kwargs(strict_merge))
+    for name, (value, iscoord) in constants.items():
+        if iscoord:
+            ret = ret.assign_coords({name: value})
+        else:
+            ret[name] = value
+    return ret
+
+
 def merge_meta(old: dict, new: dict):
     for k, v in new.items():
         if k not in old:
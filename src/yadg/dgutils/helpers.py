@@ -1,5 +1,8 @@
+import io
 import sys
 from importlib import metadata
+from pathlib import Path
+from typing import IO
 
 
 def get_yadg_metadata() -> dict:
@@ -11,3 +14,43 @@ def get_yadg_metadata() -> dict:
         "yadg_command": " ".join(sys.argv),
     }
     return md
+
+
+def open_source(
+    source: Path | bytes,
+    mode: str = "r",
+    encoding: str = None,
+    errors: str = None,
+) -> IO:
+    """
+    Opens the ``source`` file, or wraps the ``source`` bytes in a file-like object.
+
+    This allows the extractors to process files as well as raw :class:`bytes`
+    received from memory, without writing them to disk. The returned object is
+    equivalent to the one returned by :func:`open` using the same arguments.
+
+    Parameters
+    ----------
+    source
+        The :class:`Path` to the file, or the contents of the file as :class:`bytes`.
+
+    mode
+        Either ``"r"`` for text or ``"rb"`` for binary mode.
+
+    encoding
+        The encoding used in text mode.
+
+    errors
+        The handling of decoding errors in text mode, see :func:`open`.
+
+    """
+    if not isinstance(source, bytes):
+        return open(source, mode, encoding=encoding, errors=errors)
+    elif "b" in mode:
+        return io.BytesIO(source)
+    return io.TextIOWrapper(io.BytesIO(source), encoding=encoding, errors=errors)
+
+
+def source_name(source: Path | bytes) -> str:
+    """Returns a name of the ``source`` suitable for log and error messages."""
+    return f"<{len(source)} bytes>" if isinstance(source, bytes) else str(source)
@@ -0,0 +1,276 @@
+import os
+import logging
+import h5netcdf
+import h5py
+import numpy as np
+from xarray import Dataset, Variable
+from xarray.conventions import encode_cf_variable
+
+from .dsutils import _merge_attrs
+
+logger = logging.getLogger(__name__)
+
+# Target size of a single chunk of a variable along "uts", in bytes.
+CHUNK_BYTES = 2**20
+
+
+def _fill_value(dtype: np.dtype):
+    if dtype.kind == "f":
+        return dtype.type(np.nan)
+    elif dtype.kind == "i":
+        return np.iinfo(dtype).min
+    elif dtype.kind == "u":
+        return np.iinfo(dtype).max
+    return None
+
+
+class _NodeWriter:
+    """
+    Appends the :class:`Dataset` objects belonging to a single node of a `step`
+    into a NetCDF group with an unlimited ``"uts"`` dimension.
+
+    The data variables with a ``"uts"`` dimension are written as they arrive. The
+    variables without ``"uts"`` are kept in memory for as long as they are identical
+    in all files; when they differ, they are broadcast along ``"uts"`` and written
+    to disk, following the rules of :func:`yadg.dgutils.concat_dicttrees`.
+
+    """
+
+    def __init__(self, group: h5netcdf.Group, strict_merge: bool):
+        self.group = group
+        self.strict_merge = strict_merge
+        self.size = 0
+        self.attrs = None
+        self.coords = set()
+        self.constants = {}
+        self.vattrs = {}
+        self.missing = set()
+
+    def _create_dimension(self, name: str, var: Variable) -> None:
+        self.group.dimensions[name] = var.size
+        self._write_constant(name, var)
+
+    def _check_dimension(self, name: str, var: Variable) -> None:
+        ref = self.group.variables[name][...]
+        if ref.shape != var.shape or not np.array_equal(ref, var.values):
+            raise RuntimeError(
+                f"The coordinate {name!r} differs between files. Such files cannot "
+                "be processed in the streaming mode, please process them in memory."
+            )
+
+    def _write_constant(self, name: str, var: Variable) -> None:
+        enc = encode_cf_variable(var, name=name)
+        attrs = dict(enc.attrs)
+        fill = attrs.pop("_FillValue", None)
+        data = enc.values
+        dtype = data.dtype
+        if dtype.kind in {"O", "U"}:
+            dtype = h5py.string_dtype()
+            data = data.astype(object)
+        v = self.group.create_variable(
+            name, enc.dims, dtype=dtype, data=data, fillvalue=fill
+        )
+        v.attrs.update(attrs)
+
+    def _create_series(self, name: str, enc: Variable, start: int) -> None:
+        if "uts" not in self.group.dimensions:
+            self.group.dimensions["uts"] = None
+            self.group.resize_dimension("uts", self.size)
+        dtype = enc.dtype
+        if dtype.kind in {"O", "U"}:
+            dtype = h5py.string_dtype()
+            itemsize = 8
+        else:
+            itemsize = dtype.itemsize
+        other = tuple(self.group.dimensions[d].size for d in enc.dims[1:])
+        rows = max(1, CHUNK_BYTES // (itemsize * int(np.prod(other, dtype=int))))
+        fill = _fill_value(dtype)
+        self.group.create_variable(
+            name,
+            enc.dims,
+            dtype=dtype,
+            fillvalue=fill,
+            chunks=(rows, *other),
+        )
+        self.vattrs[name] = {k: v for k, v in enc.attrs.items() if k != "_FillValue"}
+        if start > 0:
+            self.missing.add(name)
+
+    def _write_series(self, name: str, var: Variable, start: int) -> None:
+        if "uts" not in var.dims:
+            nrows = self.size - start
+            var = var.set_dims(("uts", *var.dims), (nrows, *var.shape))
+        enc = encode_cf_variable(var, name=name)
+        if name not in self.group.variables:
+            self._create_series(name, enc, start)
+        else:
+            attrs = {k: v for k, v in enc.attrs.items() if k != "_FillValue"}
+            _merge_attrs(self.vattrs[name], attrs, self.strict_merge)
+        data = enc.values
+        if data.dtype.kind in {"O", "U"}:
+            data = data.astype(object)
+        self.group.variables[name][start : self.size, ...] = data
+
+    def append(self, dset: Dataset) -> None:
+        if self.attrs is None:
+            self.attrs = dict(dset.attrs)
+        else:
+            _merge_attrs(self.attrs, dset.attrs, self.strict_merge)
+
+        start = self.size
+        nrows = dset.sizes.get("uts", 0)
+        self.coords.update(k for k in dset.coords if k not in dset.dims)
+        for name, var in dset.variables.items():
+            if name in dset.indexes and name != "uts":
+                if name not in self.group.dimensions:
+                    self._create_dimension(name, var)
+                else:
+                    self._check_dimension(name, var)
+
+        if "uts" in dset.dims:
+            if "uts" not in self.group.dimensions:
+                self.group.dimensions["uts"] = None
+                self.group.create_variable(
+                    "uts",
+                    ("uts",),
+                    dtype=dset["uts"].dtype,
+                    fillvalue=_fill_value(dset["uts"].dtype),
+                    chunks=(CHUNK_BYTES // dset["uts"].dtype.itemsize,),
+                )
+            self.size = start + nrows
+            self.group.resize_dimension("uts", self.size)
+            self.group.variables["uts"][start : self.size] = dset["uts"].values
+            self.vattrs.setdefault("uts", dict(dset["uts"].attrs))
+
+        compare = "identical" if self.strict_merge else "equals"
+        for name, var in dset.variables.items():
+            if name in dset.indexes:
+                continue
+            elif name in self.group.variables:
+                self._write_series(name, var, start)
+            elif "uts" in var.dims:
+                self._promote(name, start)
+                self._write_series(name, var, start)
+            elif name not in self.constants:
+                self.constants[name] = var
+            elif not getattr(self.constants[name], compare)(var):
+                self._promote(name, start)
+                self._write_series(name, var, start)
+
+        for name in self.group.variables:
+            if name not in dset.variables and name not in self.group.dimensions:
+                self.missing.add(name)
+
+    def _promote(self, name: str, start: int) -> None:
+        """Writes a constant variable as a series covering the first ``start`` rows."""
+        value = self.constants.pop(name, None)
+        if value is None or start == 0:
+            return
+        end, self.size = self.size, start
+        self._write_series(name, value, 0)
+        self.size = end
+
+    def close(self) -> None:
+        for name, var in self.constants.items():
+            self._write_constant(name, var)
+        for name, attrs in self.vattrs.items():
+            var = self.group.variables[name]
+            if name not in self.missing and var.dtype.kind in {"i", "u"}:
+                del var.attrs["_FillValue"]
+            var.attrs.update(attrs)
+        if len(self.coords) > 0:
+            self.group.attrs["coordinates"] = " ".join(sorted(self.coords))
+        if self.attrs is not None:
+            self.group.attrs.update(self.attrs)
+
+
+class DataTreeWriter:
+    """
+    Writes a datagram into a NetCDF file incrementally.
+
+    Each file of a `step` is passed in as a ``DataTree.to_dict()`` object using
+    :meth:`append`, and its data are appended along the unlimited ``"uts"``
+    dimension of the corresponding groups in the NetCDF file. Only the data of a
+    single file therefore need to be held in memory. Metadata are merged following
+    the ``strict_merge`` rules of :func:`yadg.dgutils.concat_dicttrees`, and are
+    written into the file on :meth:`close`.
+
+    The resulting file can be opened using :func:`xarray.open_datatree`, and is
+    equivalent to the one written using :meth:`xarray.DataTree.to_netcdf`. The data
+    are written into a temporary file next to ``path``, which replaces ``path`` only
+    once the writer is closed successfully. If an exception is raised within the
+    ``with`` block, the temporary file is removed and ``path`` is left untouched.
+
+    Parameters
+    ----------
+
+    path:
+        Path of the NetCDF file to be created.
+
+    attrs:
+        The metadata of the root node of the datagram.
+
+    strict_merge:
+        A :class:`bool` indicating whether metadata of the files within each group
+        has to be identical.
+
+    """
+
+    def __init__(self, path: str, attrs: dict, strict_merge: bool = False):
+        self.path = os.path.abspath(path)
+        head, tail = os.path.split(self.path)
+        self.tmp = os.path.join(head, f".{tail}.{os.getpid()}.tmp")
+        self.file = h5netcdf.File(self.tmp, mode="w")
+        self.attrs = dict(attrs)
+        self.strict_merge = strict_merge
+        self.nodes: dict[str, _NodeWriter] = {}
+
+    def _node(self, path: str) -> _NodeWriter:
+        if path not in self.nodes:
+            group = self.file
+            for part in path.strip("/").split("/"):
+                if part == "":
+                    continue
+                elif part not in group.groups:
+                    group = group.create_group(part)
+                else:
+                    group = group.groups[part]
+            self.nodes[path] = _NodeWriter(group, self.strict_merge)
+        return self.nodes[path]
+
+    def create_group(self, group: str) -> None:
+        """Creates an empty ``group``, e.g. for a `step` without any files."""
+        self._node(group)
+
+    def append(self, group: str, fvals: dict) -> None:
+        """Appends a ``DataTree.to_dict()`` object into the provided ``group``."""
+        for name, dset in fvals.items():
+            path = group if name == "/" else f"{group.rstrip('/')}{name}"
+            self._node(path).append(dset)
+
+    def close(self) -> None:
+        """Writes out all metadata, closes the NetCDF file and moves it to ``path``."""
+        try:
+            for node in self.nodes.values():
+                node.close()
+            self.file.attrs.update(self.attrs)
+            self.file.close()
+            os.replace(self.tmp, self.path)
+        except Exception:
+            self.abort()
+            raise
+
+    def abort(self) -> None:
+        """Closes and removes the temporary file, leaving ``path`` untouched."""
+        self.file.close()
+        if os.path.exists(self.tmp):
+            os.unlink(self.tmp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
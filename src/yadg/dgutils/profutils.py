@@ -0,0 +1,199 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Iterator
+from importlib import metadata
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss() -> int | None:
+    """Returns the peak resident set size of the current process in bytes, if known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # The value is reported in bytes on macOS, and in kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def profile_stage(profiler: "Profiler | None", name: str, **args: dict):
+    """Records the stage ``name`` using the ``profiler``, unless it is :obj:`None`."""
+    if profiler is None:
+        return nullcontext(args)
+    return profiler.stage(name, **args)
+
+
+class Profiler:
+    """
+    Records the wall time, CPU time, and peak memory use of the stages of processing.
+
+    Each stage is recorded using the :meth:`stage` context manager, which stores an
+    event containing the start time and duration of the stage, the CPU time of the
+    process, and the peak resident set size of the process at the end of the stage.
+    Stages may be nested; the ``self`` time of each stage excludes the time spent in
+    its nested stages. The events can be summarised using :meth:`summary` and
+    exported in the Chrome trace format using :meth:`dump`.
+
+    Events recorded in other processes, e.g. by the worker processes when files are
+    processed in parallel, can be added using :meth:`add_events`.
+
+    Parameters
+    ----------
+
+    tracemalloc:
+        Whether to also record the peak memory allocated by Python within each stage
+        using :mod:`tracemalloc`. This slows down the processing considerably. Unless
+        it is already running, the tracing is stopped at the end of each outermost
+        stage, and the peak only includes the memory allocated since its start.
+
+    """
+
+    def __init__(self, tracemalloc: bool = False):
+        self.tracemalloc = tracemalloc
+        self.events = []
+        self._stack = []
+        self._tracing = False
+
+    @contextmanager
+    def stage(self, name: str, **args: dict) -> Iterator[dict]:
+        """
+        Records the stage ``name``, with the supplied ``args`` stored in the event.
+
+        The ``args`` of the event are yielded, so that they can be amended within
+        the stage.
+
+        """
+        if self.tracemalloc:
+            if not tracemalloc.is_tracing():
+                # Tracing started here is stopped at the end of the outermost stage.
+                tracemalloc.start()
+                self._tracing = True
+            elif len(self._stack) > 0:
+                parent = self._stack[-1]
+                parent["traced"] = max(
+                    parent["traced"], tracemalloc.get_traced_memory()[1]
+                )
+            tracemalloc.reset_peak()
+        frame = {"children": 0.0, "traced": 0}
+        self._stack.append(frame)
+        cpu = time.process_time()
+        start = time.time()
+        t0 = time.perf_counter()
+        try:
+            yield args
+        finally:
+            wall = time.perf_counter() - t0
+            cpu = time.process_time() - cpu
+            self._stack.pop()
+            event = {
+                "name": name,
+                "start": start,
+                "wall": wall,
+                "self": wall - frame["children"],
+                "cpu": cpu,
+                "peak_rss": peak_rss(),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+            if self.tracemalloc:
+                traced = max(frame["traced"], tracemalloc.get_traced_memory()[1])
+                event["peak_traced"] = traced
+            if len(self._stack) > 0:
+                parent = self._stack[-1]
+                parent["children"] += wall
+                if self.tracemalloc:
+                    parent["traced"] = max(parent["traced"], traced)
+            elif self._tracing:
+                tracemalloc.stop()
+                self._tracing = False
+            self.events.append(event)
+
+    def add_events(self, events: list[dict]) -> None:
+        """Adds the ``events`` recorded by another :class:`Profiler`."""
+        self.events.extend(events)
+
+    def summary(self) -> dict:
+        """
+        Summarises the recorded events.
+
+        Returns a :class:`dict` containing the total wall, self, and CPU times as well
+        as the peak memory use of each stage, both over all events (``"stages"``)
+        and for each `step` of the dataschema (``"steps"``), along with the number
+        of events of each stage (``"count"``).
+
+        """
+
+        def update(entry: dict, event: dict) -> None:
+            entry["count"] = entry.get("count", 0) + 1
+            for k in ("wall", "self", "cpu"):
+                entry[k] = entry.get(k, 0.0) + event[k]
+            for k in ("peak_rss", "peak_traced"):
+                if event.get(k) is not None:
+                    entry[k] = max(entry.get(k, 0), event[k])
+
+        stages = {}
+        steps = {}
+        for event in sorted(self.events, key=lambda e: e["start"]):
+            update(stages.setdefault(event["name"], {}), event)
+            tag = event["args"].get("step")
+            if tag is not None:
+                step = steps.setdefault(tag, {"filetype": None, "stages": {}})
+                if event["args"].get("filetype") is not None:
+                    step["filetype"] = event["args"]["filetype"]
+                update(step["stages"].setdefault(event["name"], {}), event)
+        if len(self.events) > 0:
+            start = min(e["start"] for e in self.events)
+            wall = max(e["start"] + e["wall"] for e in self.events) - start
+        else:
+            wall = 0.0
+        return {"wall": wall, "stages": stages, "steps": steps}
+
+    def to_chrome_trace(self) -> dict:
+        """
+        Returns the recorded events in the Chrome trace event format, which can be
+        loaded in e.g. ``chrome://tracing`` or https://ui.perfetto.dev. The result of
+        :meth:`summary` is stored under the ``"summary"`` key.
+
+        """
+        t0 = min((e["start"] for e in self.events), default=0.0)
+        events = []
+        for event in self.events:
+            args = dict(event["args"])
+            for k in ("self", "cpu", "peak_rss", "peak_traced"):
+                if event.get(k) is not None:
+                    args[k] = event[k]
+            events.append(
+                {
+                    "name": event["name"],
+                    "cat": "yadg",
+                    "ph": "X",
+                    "ts": (event["start"] - t0) * 1e6,
+                    "dur": event["wall"] * 1e6,
+                    "pid": event["pid"],
+                    "tid": event["tid"],
+                    "args": args,
+                }
+            )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"yadg_version": metadata.version("yadg")},
+            "summary": self.summary(),
+        }
+
+    def dump(self, path: str) -> None:
+        """Writes the result of :meth:`to_chrome_trace` into a JSON file at ``path``."""
+        logger.info("Writing profile into '%s'.", path)
+        with open(path, "w") as out:
+            json.dump(self.to_chrome_trace(), out, default=str)
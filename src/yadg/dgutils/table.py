@@ -1,6 +1,14 @@
-from babel.numbers import parse_decimal
+import numpy as np
+from babel import Locale
+from babel.numbers import (
+    parse_decimal,
+    get_decimal_symbol,
+    get_group_symbol,
+    LC_NUMERIC,
+)
 from decimal import Decimal
-from typing import Callable
+from itertools import chain, islice
+from typing import Callable, Iterable
 
 
 def process_row(
@@ -40,6 +48,286 @@ def process_row(
     return vals, kind, digs, exps
 
 
+def _babel_column(
+    items: list[str],
+    locale: str = "en_GB",
+    uncertainties: bool = True,
+) -> tuple[list, type, int]:
+    """
+    Processes all items of a single column, returning their values, the inferred type
+    of the column, and the precision of the values. Each item is parsed using
+    :func:`babel.numbers.parse_decimal`.
+    """
+    vals, kinds, digs, exps = process_row(items, locale)
+    kind = int
+    prec = 0
+    if uncertainties is False:
+        return vals, kind, prec
+    for t, d, e in zip(kinds, digs, exps):
+        if kind is int:
+            kind = t
+        elif kind is Decimal and t is not int:
+            kind = t
+        if t is str:
+            continue
+        elif t in (int, Decimal):
+            if e in {"n", "F"}:
+                e = 0
+            prec = max(prec, abs(e))
+        else:
+            prec = max(prec, d)
+    return vals, kind, prec
+
+
+def _numpy_column(
+    items: list[str],
+    group: str,
+    decimal: str,
+    uncertainties: bool = True,
+) -> tuple[np.ndarray, type, int] | None:
+    """
+    A vectorized version of :func:`_babel_column`.
+
+    The items are translated into the ``C`` locale in bulk, and viewed as a 2D array
+    of code points. Items which are not plain decimal numbers are detected from the
+    positions of the digits, signs, decimal points and exponents, which are also
+    used to determine the type and precision of each item. The values are converted
+    using numpy. Returns ``None`` for columns which cannot be processed this way.
+    """
+    if len(items) == 0:
+        return None
+    joined = "\n".join(items).replace(group, "").replace(decimal, ".")
+    strs = np.array(joined.split("\n"), dtype=str)
+    n = strs.size
+    width = strs.dtype.itemsize // 4
+    # Very long items might overflow the int and float conversions.
+    if n != len(items) or width == 0 or width > 64:
+        return None
+
+    chars = strs.view(np.uint32).reshape(n, width)
+    index = np.arange(width)
+    length = (chars != 0).sum(axis=1)
+    empty = length == 0
+    is_digit = (chars >= ord("0")) & (chars <= ord("9"))
+    is_exp = (chars == ord("e")) | (chars == ord("E"))
+    is_dot = chars == ord(".")
+    is_sign = (chars == ord("+")) | (chars == ord("-"))
+    has_exp = is_exp.any(axis=1)
+    pexp = np.where(has_exp, is_exp.argmax(axis=1), length)
+    has_dot = is_dot.any(axis=1)
+    pdot = np.where(has_dot, is_dot.argmax(axis=1), pexp)
+    mantissa = index < pexp[:, np.newaxis]
+    digit = is_digit & mantissa
+
+    # Only items matching [+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)? are accepted.
+    valid = (
+        (is_digit | is_exp | is_dot | is_sign | (chars == 0)).all(axis=1)
+        & ((chars != 0) == (index < length[:, np.newaxis])).all(axis=1)
+        & (is_exp.sum(axis=1) <= 1)
+        & (is_dot.sum(axis=1) <= 1)
+        & (pdot <= pexp)
+        & ~(is_sign & (index != 0) & (index != pexp[:, np.newaxis] + 1)).any(axis=1)
+        & (digit.any(axis=1) | empty)
+        & ((is_digit & ~mantissa).any(axis=1) | ~has_exp)
+    )
+    # Items consisting only of group symbols are not valid numbers either.
+    if not valid.all() or empty.sum() != items.count(""):
+        return None
+
+    # The number of digits after the decimal point is the (negative) exponent.
+    frac = np.where(has_dot, pexp - pdot - 1, 0)
+    # The number of significant digits in the mantissa, ignoring leading zeros.
+    nonzero = digit & (chars != ord("0"))
+    lead = digit & (index < nonzero.argmax(axis=1)[:, np.newaxis])
+    digs = np.where(nonzero.any(axis=1), digit.sum(axis=1) - lead.sum(axis=1), 1)
+
+    is_int = ~has_exp & (frac == 0)
+    if uncertainties is False:
+        kind = int
+        prec = 0
+    else:
+        kind = float if has_exp.any() else Decimal if not is_int.all() else int
+        prec = int(max(np.where(has_exp, digs, frac).max(), 0))
+
+    if is_int.all() and not empty.any():
+        if digs.max() > 15:
+            return None
+        vals = strs.astype(float).astype(np.int64)
+    else:
+        vals = np.full(n, np.nan)
+        vals[~empty] = strs[~empty].astype(float)
+        # Integers are converted via int, which drops the sign of zero.
+        vals[is_int & ~empty] += 0.0
+    return vals, kind, prec
+
+
+def _combine_kinds(kind: type, other: type) -> type:
+    """Combines the types of consecutive parts of a column, see :func:`_babel_column`."""
+    if kind is int:
+        return other
+    elif kind is Decimal and other is not int:
+        return other
+    return kind
+
+
+class _ColumnBuffer:
+    """
+    A growable buffer collecting the values of a single column.
+
+    Numerical values are stored in a preallocated :class:`numpy.ndarray`, which is
+    grown geometrically and upcast as necessary. Once any non-numerical values are
+    encountered, the buffer switches to a :class:`list`, so that the values of the
+    whole column are converted in the same way as by :func:`process_table`.
+    """
+
+    def __init__(self):
+        self.data = None
+        self.size = 0
+        self.items = None
+
+    def extend(self, vals: np.ndarray | list) -> None:
+        if self.items is None:
+            arr = np.asarray(vals)
+            if arr.dtype.kind in {"i", "u", "f"}:
+                end = self.size + arr.size
+                if self.data is None:
+                    self.data = np.empty(end, dtype=arr.dtype)
+                dtype = np.result_type(self.data, arr)
+                if end > self.data.size or dtype != self.data.dtype:
+                    data = np.empty(max(end, 2 * self.data.size), dtype=dtype)
+                    data[: self.size] = self.data[: self.size]
+                    self.data = data
+                self.data[self.size : end] = arr
+                self.size = end
+                return
+            self.items = [] if self.data is None else self.values().tolist()
+            self.data = None
+        self.items.extend(vals.tolist() if isinstance(vals, np.ndarray) else vals)
+
+    def values(self) -> np.ndarray | list:
+        if self.items is not None:
+            return self.items
+        return self.data[: self.size]
+
+
+def _strip_items(items: list[str], strip: str) -> list[str]:
+    items = list(map(str.strip, items))
+    if strip is not None:
+        items = [i.strip(strip) for i in items]
+    return items
+
+
+def _date_column(datefunc: Callable, columns: list[list[str]]) -> list | np.ndarray:
+    """
+    Computes the timestamps from the ``columns`` using the ``datefunc``, processing
+    the whole ``columns`` at once if the ``datefunc`` supports it.
+    """
+    if hasattr(datefunc, "columns"):
+        return datefunc.columns(*columns)
+    return list(map(datefunc, *columns))
+
+
+def _process_columns(
+    lines: list[str],
+    headers: list[str],
+    sep: str,
+    strip: str,
+    locale: str,
+    uncertainties: bool,
+    datecolumns: list[int],
+    datefunc: Callable,
+) -> tuple[dict, dict, dict, list]:
+    uts = None
+    rows = [line.split(sep) for line in lines]
+    ncols = {len(parts) for parts in rows}
+    if len(ncols) == 1:
+        # All rows have the same length, so they can be split into columns in bulk.
+        ncols = ncols.pop()
+        flat = list(chain.from_iterable(rows))
+        table = [_strip_items(flat[i::ncols], strip) for i in range(ncols)]
+        if datecolumns is not None:
+            uts = _date_column(datefunc, [table[i] for i in datecolumns])
+    else:
+        rows = [_strip_items(parts, strip) for parts in rows]
+        table = None
+        if datecolumns is not None:
+            cols = [[parts[i] for parts in rows] for i in datecolumns]
+            uts = _date_column(datefunc, cols)
+
+    # Items of columns with duplicate headers are interleaved, row by row.
+    columns = {k: [] for k in headers}
+    for i, k in enumerate(headers):
+        if datecolumns is not None and i in datecolumns:
+            continue
+        columns[k].append(i)
+
+    loc = Locale.parse(locale or LC_NUMERIC)
+    group = get_group_symbol(loc)
+    decimal = get_decimal_symbol(loc)
+    vals = {}
+    types = {}
+    precs = {}
+    for k, cols in columns.items():
+        if table is None:
+            items = [parts[i] for parts in rows for i in cols if i < len(parts)]
+        elif len(cols) == 1:
+            items = table[cols[0]] if cols[0] < len(table) else []
+        else:
+            cols = [table[i] for i in cols if i < len(table)]
+            items = list(chain.from_iterable(zip(*cols)))
+        ret = _numpy_column(items, group, decimal, uncertainties)
+        if ret is None:
+            ret = _babel_column(items, locale, uncertainties)
+        vals[k], types[k], precs[k] = ret
+
+    return vals, types, precs, uts
+
+
+def _table_vars(
+    headers: list[str],
+    vals: dict,
+    types: dict,
+    precs: dict,
+    uts: list,
+    uncertainties: bool,
+    uncertainties_int_columns: bool,
+    datecolumns: list[int],
+) -> dict:
+    data_vars = {}
+
+    for i, k in enumerate(headers):
+        if datecolumns is not None and i in datecolumns:
+            continue
+        data_vars[k] = (("uts",) if datecolumns is not None else (k,), vals[k], {})
+
+        if types[k] is str:
+            continue
+        if types[k] is int and uncertainties_int_columns is False:
+            continue
+        if uncertainties is False:
+            continue
+
+        ku = f"{k.replace(' ', '_')}_uncertainty"
+        data_vars[k][2]["ancillary_variables"] = ku
+        data_vars[ku] = (
+            [],
+            precs[k] if types[k] is float else 10 ** (-precs[k]),
+            {
+                "standard_name": f"{k} standard_error",
+                "standard_error_multiplier": 1,
+                "yadg_uncertainty_type": "sig" if types[k] is float else "abs",
+                "yadg_uncertainty_distribution": "rectangular",
+                "yadg_uncertainty_source": "str_conv",
+            },
+        )
+    if datecolumns is not None:
+        data_vars["uts"] = (
+            ("uts",),
+            uts,
+        )
+    return data_vars
+
+
 def process_table(
     lines: list[str],
     headers: list[str],
@@ -55,6 +343,10 @@ def process_table(
     A function for parsing a list of string values, containing numerical data, into a dict
     structure that can be used to construct a xr.Dataset.
 
+    The items of each column are converted in bulk using numpy, whenever they are
+    all formatted as plain decimal numbers. Other columns, e.g. those containing
+    strings, are processed item by item using :mod:`babel`; the results are the same.
+
     Parameters
     ----------
     lines
@@ -89,67 +381,90 @@ def process_table(
 
     """
 
-    vals = {k: [] for k in headers}
-    types = {k: int for k in headers}
-    precs = {k: 0 for k in headers}
-    if datecolumns is not None:
-        uts = []
+    vals, types, precs, uts = _process_columns(
+        lines, headers, sep, strip, locale, uncertainties, datecolumns, datefunc
+    )
+    return _table_vars(
+        headers,
+        vals,
+        types,
+        precs,
+        uts,
+        uncertainties,
+        uncertainties_int_columns,
+        datecolumns,
+    )
 
-    for line in lines:
-        parts = [i.strip().strip(strip) for i in line.split(sep)]
-        if datecolumns is not None:
-            uts.append(datefunc(*[parts[i] for i in datecolumns]))
-        vs, ts, ds, es = process_row(parts, locale)
-        for i, (k, v, t, d, e) in enumerate(zip(headers, vs, ts, ds, es)):
-            if datecolumns is not None and i in datecolumns:
-                continue
-            vals[k].append(v)
-            if uncertainties is False:
-                continue
-            if types[k] is int:
-                types[k] = t
-            elif types[k] is Decimal and t is not int:
-                types[k] = t
-            if t is str:
-                continue
-            elif t in (int, Decimal):
-                if e in {"n", "F"}:
-                    e = 0
-                prec = abs(e)
-            else:
-                prec = d
-            precs[k] = max(precs[k], prec)
 
-    data_vars = {}
+def process_table_chunked(
+    lines: Iterable[str],
+    headers: list[str],
+    sep: str = None,
+    strip: str = None,
+    locale: str = "en_GB",
+    uncertainties: bool = True,
+    uncertainties_int_columns: bool = True,
+    datecolumns: list[int] = None,
+    datefunc: Callable = None,
+    chunksize: int = 2**14,
+) -> dict:
+    """
+    A version of :func:`process_table` which consumes the ``lines`` lazily.
 
-    for i, k in enumerate(headers):
-        if datecolumns is not None and i in datecolumns:
-            continue
-        data_vars[k] = (("uts",) if datecolumns is not None else (k,), vals[k], {})
+    The ``lines``, e.g. an open file, are processed in chunks of ``chunksize``
+    records, with the values of each column collected in growable :mod:`numpy`
+    buffers. The peak memory use is therefore proportional to the size of the
+    resulting arrays rather than the size of the text. The returned ``data_vars``
+    are identical to those returned by :func:`process_table`.
 
-        if types[k] is str:
-            continue
-        if types[k] is int and uncertainties_int_columns is False:
-            continue
-        if uncertainties is False:
-            continue
+    Parameters
+    ----------
+    lines
+        An iterable of individual records.
 
-        ku = f"{k.replace(' ', '_')}_uncertainty"
-        data_vars[k][2]["ancillary_variables"] = ku
-        data_vars[ku] = (
-            [],
-            precs[k] if types[k] is float else 10 ** (-precs[k]),
-            {
-                "standard_name": f"{k} standard_error",
-                "standard_error_multiplier": 1,
-                "yadg_uncertainty_type": "sig" if types[k] is float else "abs",
-                "yadg_uncertainty_distribution": "rectangular",
-                "yadg_uncertainty_source": "str_conv",
-            },
+    chunksize
+        The number of records processed at once.
+
+    All other parameters are passed to :func:`process_table`.
+
+    Returns
+    -------
+    data_vars
+        A :class:`dict` structured in order to construct a :class:`xarray.Dataset` via :func:`xarray.Dataset.from_dict`.
+
+    """
+    lines = iter(lines)
+    buffers = None
+    for chunk in iter(lambda: list(islice(lines, chunksize)), []):
+        vals, ktypes, kprecs, kuts = _process_columns(
+            chunk, headers, sep, strip, locale, uncertainties, datecolumns, datefunc
         )
-    if datecolumns is not None:
-        data_vars["uts"] = (
-            ("uts",),
-            uts,
+        if buffers is None:
+            buffers = {k: _ColumnBuffer() for k in vals}
+            types = dict.fromkeys(vals, int)
+            precs = dict.fromkeys(vals, 0)
+            uts = None if kuts is None else _ColumnBuffer()
+        for k, v in vals.items():
+            buffers[k].extend(v)
+            types[k] = _combine_kinds(types[k], ktypes[k])
+            precs[k] = max(precs[k], kprecs[k])
+        if kuts is not None:
+            uts.extend(kuts)
+
+    if buffers is None:
+        vals, types, precs, uts = _process_columns(
+            [], headers, sep, strip, locale, uncertainties, datecolumns, datefunc
         )
-    return data_vars
+    else:
+        vals = {k: buf.values() for k, buf in buffers.items()}
+        uts = None if uts is None else uts.values()
+    return _table_vars(
+        headers,
+        vals,
+        types,
+        precs,
+        uts,
+        uncertainties,
+        uncertainties_int_columns,
+        datecolumns,
+    )
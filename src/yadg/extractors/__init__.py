@@ -1,19 +1,52 @@
 import importlib
+import io
 import json
 import logging
-import os
-import tempfile
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from dgbowl_schemas.yadg.dataschema import ExtractorFactory, FileType
-from functools import singledispatch
+from functools import singledispatch, wraps
+from itertools import chain, repeat
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 from xarray import DataTree
 from yadg import dgutils
+from yadg.dgutils.cacheutils import ExtractionCache
 
 
 logger = logging.getLogger(__name__)
 
+# Filetypes with fixed record layouts, which support the lazy extraction mode.
+LAZY_FILETYPES = {"eclab.mpr", "quadstar.sac", "agilent.ch", "phi.spe"}
+
+
+def get_extractor(
+    filetype: str,
+    timezone: str = None,
+    encoding: str = None,
+    locale: str = None,
+    suffix: str = None,
+) -> FileType:
+    """
+    Creates a default extractor object for a given ``filetype``.
+
+    The ``timezone``, ``encoding``, and ``locale`` are passed to the
+    :class:`ExtractorFactory`, while ``suffix`` replaces the default suffixes used
+    for matching files within zip files.
+
+    """
+    extractor = ExtractorFactory(
+        extractor={
+            "filetype": filetype,
+            "timezone": timezone,
+            "encoding": encoding,
+            "locale": locale,
+        }
+    ).extractor
+    if suffix is not None:
+        extractor.suffix = [suffix]
+    return extractor
+
 
 def extract(
     filetype: str,
@@ -22,14 +55,17 @@ def extract(
     encoding: str = None,
     locale: str = None,
     suffix: str = None,
+    lazy: bool = False,
+    jobs: int = 1,
     **kwargs: dict,
 ) -> DataTree:
     """
     Extract data and metadata from a path using the supplied filetype.
 
     A wrapper around the :func:`extract_from_path` and :func:`extract_from_zip` worker functions.
-    Creates a default extractor object for a given ``filetype``. Coerces any :class:`str`s provided
-    as ``path`` to :class:`Path`. If the provided ``path`` is a zip file, it is treated as such.
+    Creates a default extractor object for a given ``filetype`` using :func:`get_extractor`.
+    Coerces any :class:`str`s provided as ``path`` to :class:`Path`. If the provided ``path``
+    is a zip file, it is treated as such.
 
     Parameters
     ----------
@@ -52,29 +88,38 @@ def extract(
     suffix:
         A :class:`str` containing a non-default suffix for matching files within a zip file.
 
-    """
-    extractor = ExtractorFactory(
-        extractor={
-            "filetype": filetype,
-            "timezone": timezone,
-            "encoding": encoding,
-            "locale": locale,
-        }
-    ).extractor
+    lazy:
+        A :class:`bool` requesting the lazy extraction mode. For the binary filetypes in
+        :obj:`LAZY_FILETYPES`, the data variables are returned as lazily indexed arrays,
+        and only the values selected using e.g. ``.sel()`` are read from the file when
+        they are accessed. The file must therefore not be modified or removed while the
+        returned object is in use. Ignored for other filetypes and for zip files.
 
-    if suffix is not None:
-        extractor.suffix = [suffix]
+    jobs:
+        An :class:`int` number of worker processes used to extract the files within a
+        zip file, see :func:`extract_from_zip`. Ignored for other files.
+
+    """
+    extractor = get_extractor(filetype, timezone, encoding, locale, suffix)
     path = Path(path)
     if path.suffix == ".zip" and zipfile.is_zipfile(path):
         logger.info("Processing zipfile")
-        return extract_from_zip(path, extractor, **kwargs)
-    else:
-        return extract_from_path(path, extractor, **kwargs)
+        if lazy:
+            logger.warning("The lazy mode is not supported for zip files.")
+        return extract_from_zip(path, extractor, jobs=jobs, **kwargs)
+    elif lazy and extractor.filetype not in LAZY_FILETYPES:
+        logger.warning(
+            "The lazy mode is not supported for filetype '%s'.", extractor.filetype
+        )
+    elif lazy:
+        kwargs["lazy"] = True
+    return extract_from_path(path, extractor, **kwargs)
 
 
 def extract_from_path(
     source: Path,
     extractor: FileType,
+    cache: ExtractionCache = None,
     **kwargs: dict,
 ) -> DataTree:
     """
@@ -94,8 +139,25 @@ def extract_from_path(
 
     extractor:
         A :class:`FileType` object describing the extraction process.
+
+    cache:
+        An optional :class:`~yadg.dgutils.cacheutils.ExtractionCache`. If provided,
+        the cached :class:`DataTree` is returned for files which have been extracted
+        previously using the same ``extractor``, and newly extracted files are added
+        to the cache.
     """
 
+    key = None
+    if cache is not None and len(kwargs) == 0:
+        key = cache.key(source, extractor)
+        ret = cache.get(key)
+        if ret is not None:
+            logger.info("Using cached data for '%s'.", source)
+            ret = ret.map_over_datasets(lambda ds: ds.drop_encoding())
+            ret.attrs["yadg_extract_filename"] = str(source)
+            ret.attrs.update(dgutils.get_yadg_metadata())
+            return ret
+
     m = importlib.import_module(f"yadg.extractors.{extractor.filetype}")
     func = getattr(m, "extract")
 
@@ -113,11 +175,13 @@ def extract_from_path(
     )
     ret.attrs.update(dgutils.get_yadg_metadata())
 
+    if key is not None:
+        cache.put(key, ret)
     return ret
 
 
 def extract_from_bytes(
-    source: bytes,
+    source: bytes | memoryview | BinaryIO,
     extractor: FileType,
     **kwargs: dict,
 ) -> DataTree:
@@ -134,7 +198,8 @@ def extract_from_bytes(
     ----------
 
     source:
-        A :obj:`bytes` object containing the raw data to be extracted.
+        A :obj:`bytes` object containing the raw data to be extracted. Other buffers,
+        such as :obj:`memoryview`, as well as binary file-like objects are accepted.
 
     extractor:
         A :class:`FileType` object describing the extraction process.
@@ -159,19 +224,64 @@ def extract_from_bytes(
     return ret
 
 
+def zip_members(zf: zipfile.ZipFile, suffix: list[str]) -> list[str]:
+    """
+    Returns the sorted names of the top-level files in the zip archive ``zf``, which
+    match any of the ``suffix``. Only the central directory of the archive is read.
+
+    """
+    return sorted(
+        info.filename
+        for info in zf.infolist()
+        if not info.is_dir()
+        and "/" not in info.filename
+        and info.filename.endswith(tuple(suffix))
+    )
+
+
+def _extract_zip_members(
+    source: Path,
+    filenames: list[str],
+    extractor: FileType,
+) -> list[dict]:
+    """
+    Extracts the members ``filenames`` of the zip file ``source``, returning a list
+    of ``DataTree.to_dict()`` objects in the same order.
+
+    """
+    m = importlib.import_module(f"yadg.extractors.{extractor.filetype}")
+    func = getattr(m, "extract")
+
+    ret = []
+    with zipfile.ZipFile(source) as zf:
+        for ffn in filenames:
+            logger.debug("Processing filename '%s'", ffn)
+            with zf.open(ffn) as inf:
+                fdt = func(inf, **vars(extractor))
+            jsonize_orig_meta(fdt)
+            ret.append(fdt.to_dict())
+    return ret
+
+
 def extract_from_zip(
     source: Path,
     extractor: FileType,
     ignore_merge_errors: bool = False,
+    jobs: int = 1,
     **kwargs: dict,
 ) -> DataTree:
     """
     Extracts data and metadata from the provided zip file path using the supplied extractor.
 
-    The zip file is extracted into a temporary directory, and all top-level files that match
-    the :obj:`extractor.suffix`, are then processed. Metadata in the files within the zip file
-    are combined strictly, unless :obj:`ignore_merge_errors` is set to :obj:`True`.
+    All top-level files in the zip file that match the :obj:`extractor.suffix` are
+    processed, by streaming their contents from the archive into the extractor, without
+    unpacking the archive to disk. Metadata in the files within the zip file are combined
+    strictly, unless :obj:`ignore_merge_errors` is set to :obj:`True`.
 
+    The files can be extracted in parallel by setting ``jobs``. The files are then
+    split into contiguous chunks, which are extracted in a pool of worker processes,
+    and merged in their sorted order, so that the output is the same as when
+    processed serially.
 
     Parameters
     ----------
@@ -184,12 +294,11 @@ def extract_from_zip(
 
     ignore_merge_errors:
         A :class:`bool` for enforcing metadata consistency.
-    """
 
-    m = importlib.import_module(f"yadg.extractors.{extractor.filetype}")
-    func = getattr(m, "extract")
+    jobs:
+        An :class:`int` number of worker processes used to extract the files.
+    """
 
-    zf = zipfile.ZipFile(source)
     strict_merge = not ignore_merge_errors
     if strict_merge is False:
         logger.info(
@@ -197,27 +306,28 @@ def extract_from_zip(
             extractor.filetype,
         )
 
-    with tempfile.TemporaryDirectory() as tempdir:
-        zf.extractall(tempdir)
-        dtdict = None
-        filenames = []
-        for ffn in os.listdir(tempdir):
-            for suffix in extractor.suffix:
-                if ffn.endswith(suffix):
-                    filenames.append(ffn)
-        if len(filenames) == 0:
-            logger.critical(
-                "No files of filetype '%s' were found in the zip file using suffix %s.",
-                extractor.filetype,
-                extractor.suffix,
-            )
+    with zipfile.ZipFile(source) as zf:
+        filenames = zip_members(zf, extractor.suffix)
+    if len(filenames) == 0:
+        logger.critical(
+            "No files of filetype '%s' were found in the zip file using suffix %s.",
+            extractor.filetype,
+            extractor.suffix,
+        )
 
-        for ffn in sorted(filenames):
-            logger.debug("Processing filename '%s'", ffn)
-            path = Path(tempdir) / ffn
-            fdt = func(path, **vars(extractor))
-            jsonize_orig_meta(fdt)
-            dtdict = dgutils.merge_dicttrees(dtdict, fdt.to_dict(), strict_merge)
+    if jobs is None or jobs < 2 or len(filenames) < 2:
+        results = _extract_zip_members(source, filenames, extractor)
+    else:
+        logger.info(f"Using a pool of {jobs} worker processes.")
+        # Each chunk is extracted with a single read of the zip file directory.
+        size = max(1, len(filenames) // (4 * jobs))
+        chunks = [filenames[i : i + size] for i in range(0, len(filenames), size)]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            parts = pool.map(
+                _extract_zip_members, repeat(source), chunks, repeat(extractor)
+            )
+            results = list(chain.from_iterable(parts))
+    dtdict = dgutils.concat_dicttrees(results, strict_merge)
 
     ret = DataTree.from_dict(dtdict)
     ret.attrs.update(
@@ -247,7 +357,7 @@ __all__ = ["extract"]
 
 def get_extract_dispatch():
     @singledispatch
-    def extract(
+    def dispatch(
         source: Any,
         *,
         timezone: str,
@@ -258,4 +368,20 @@ def get_extract_dispatch():
             "provided. Please check the available extractors or enter a valid file path."
         )
 
+    # Unlike the singledispatch function, this also accepts source as a keyword.
+    @wraps(dispatch)
+    def extract(source: Any, **kwargs: dict) -> DataTree:
+        return dispatch.dispatch(type(source))(source, **kwargs)
+
+    # Other in-memory and file-like sources are passed to the bytes handler.
+    @extract.register(memoryview)
+    @extract.register(bytearray)
+    def extract_from_buffer(source: memoryview | bytearray, **kwargs: dict):
+        return extract(bytes(source), **kwargs)
+
+    @extract.register(io.BufferedIOBase)
+    @extract.register(io.RawIOBase)
+    def extract_from_stream(source: BinaryIO, **kwargs: dict):
+        return extract(source.read(), **kwargs)
+
     return extract
@@ -67,8 +67,10 @@ as ``offset = ("data offset" - 1) * 512``) until the end of the file.
 
 """
 
+import mmap
 import numpy as np
 from yadg import dgutils
+from yadg.dgutils.btools import BlockArray, lazy_array
 import xarray as xr
 from xarray import DataTree
 from pathlib import Path
@@ -103,11 +105,32 @@ def extract_from_path(
     source: Path,
     *,
     timezone: str,
+    lazy: bool = False,
     **kwargs: dict,
 ) -> DataTree:
-    with open(source, "rb") as inf:
-        ch = inf.read()
+    with dgutils.map_file(source) as contents:
+        return extract_raw_bytes(
+            source=contents, timezone=timezone, lazy_path=source if lazy else None
+        )
+
+
+@extract.register(bytes)
+def extract_from_bytes(
+    source: bytes,
+    *,
+    timezone: str,
+    **kwargs: dict,
+) -> DataTree:
+    return extract_raw_bytes(source=source, timezone=timezone)
+
 
+def extract_raw_bytes(
+    *,
+    source: bytes | mmap.mmap,
+    timezone: str,
+    lazy_path: Path = None,
+) -> DataTree:
+    ch = memoryview(source)
     magic = dgutils.read_value(ch, 0, "utf-8")
     pars = {}
     orig_meta = {}
@@ -125,15 +148,28 @@ def extract_from_path(
 
     xsn = np.linspace(orig_meta["xmin"] / 1000, orig_meta["xmax"] / 1000, num=npoints)
     xss = xsn[0]
-    ysn = (
-        np.frombuffer(
-            ch,
-            offset=pars["start"],
-            dtype=ddtype,
-            count=npoints,
+    if lazy_path is not None:
+        ysn = lazy_array(
+            BlockArray(
+                lazy_path,
+                pars["start"],
+                nbytes,
+                1,
+                ddtype,
+                npoints,
+                func=lambda y, rows: y * orig_meta["slope"],
+            )
         )
-        * orig_meta["slope"]
-    )
+    else:
+        ysn = [
+            np.frombuffer(
+                ch,
+                offset=pars["start"],
+                dtype=ddtype,
+                count=npoints,
+            )
+            * orig_meta["slope"]
+        ]
     yss = orig_meta["slope"]
 
     detector, title = orig_meta["tracetitle"].split(",")
@@ -146,7 +182,7 @@ def extract_from_path(
         data_vars={
             "signal": (
                 ["uts", "elution_time"],
-                [ysn],
+                ysn,
                 {
                     "units": orig_meta["yunit"],
                     "ancillary_variables": "signal_uncertainty",
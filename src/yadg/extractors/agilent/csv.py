@@ -102,14 +102,15 @@ def process_trace(lines: list[str], uts: float) -> Dataset:
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     encoding: str,
     timezone: str,
     **kwargs: dict,
 ) -> DataTree:
-    with open(source, "r", encoding=encoding, errors="ignore") as infile:
+    with dgutils.open_source(source, "r", encoding=encoding, errors="ignore") as infile:
         lines = infile.readlines()
     orig_meta = {}
     tstart = 0
@@ -41,12 +41,11 @@ The following metadata is extracted:
 
 """
 
+import io
 import zipfile
-import tempfile
-import os
 from xarray import DataTree
 from pathlib import Path
-from yadg.extractors import get_extract_dispatch
+from yadg.extractors import get_extract_dispatch, zip_members
 from yadg.extractors.agilent.ch import extract as extract_ch
 from yadg import dgutils
 
@@ -54,19 +53,19 @@ extract = get_extract_dispatch()
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     timezone: str,
     **kwargs: dict,
 ) -> DataTree:
-    zf = zipfile.ZipFile(source)
-    with tempfile.TemporaryDirectory() as tempdir:
-        zf.extractall(tempdir)
+    # The members of the archive are streamed into the extractor in memory.
+    archive = source if isinstance(source, Path) else io.BytesIO(source)
+    with zipfile.ZipFile(archive) as zf:
         dt = None
-        filenames = [ffn for ffn in os.listdir(tempdir) if ffn.endswith("CH")]
-        for ffn in sorted(filenames):
-            path = Path(tempdir) / ffn
-            fdt = extract_ch(path, timezone=timezone, **kwargs)
+        for ffn in zip_members(zf, ["CH"]):
+            with zf.open(ffn) as inf:
+                fdt = extract_ch(inf, timezone=timezone, **kwargs)
             dt = dgutils.merge_dicttrees(dt, fdt.to_dict(), True)
     return DataTree.from_dict(dt)
@@ -60,8 +60,9 @@ logger = logging.getLogger(__name__)
 
 
 @extract.register(Path)
-def extract(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     encoding: str,
     locale: str,
@@ -75,7 +76,7 @@ def extract(
         strip = None
 
     # Load file, extract headers and get timestamping function
-    with open(source, "r", encoding=encoding) as infile:
+    with dgutils.open_source(source, "r", encoding=encoding) as infile:
         # This decode/encode is done to account for some csv files that have a BOM
         # at the beginning of each line.
         lines = [i.encode().decode(encoding) for i in infile.readlines()]
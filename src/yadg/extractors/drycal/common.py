@@ -9,6 +9,7 @@ and ensuring timestamps are increasing.
 """
 
 import logging
+import numpy as np
 from pydantic import BaseModel
 from striprtf.striprtf import rtf_to_text
 from typing import Optional
@@ -29,11 +30,11 @@ class TimeDate(BaseModel):
 
 
 def rtf(
-    fn: str,
+    fn: str | bytes,
     encoding: str,
     timezone: str,
 ) -> Dataset:
-    with open(fn, "r", encoding=encoding) as infile:
+    with dgutils.open_source(fn, "r", encoding=encoding) as infile:
         rtf = infile.read()
     lines = rtf_to_text(rtf).split("\n")
     for li in range(len(lines)):
@@ -87,12 +88,12 @@ def rtf(
 
 
 def sep(
-    fn: str,
+    fn: str | bytes,
     sep: str,
     encoding: str,
     timezone: str,
 ) -> Dataset:
-    with open(fn, "r", encoding=encoding) as infile:
+    with dgutils.open_source(fn, "r", encoding=encoding) as infile:
         lines = infile.readlines()
     for li in range(len(lines)):
         if lines[li].startswith("Sample"):
@@ -175,19 +176,10 @@ def drycal_header(line: str, sep: str = ",") -> tuple[list, dict]:
 
 
 def check_timestamps(vals: Dataset) -> Dataset:
-    warn = True
-    ndays = 0
     utslist = vals.uts.values
-    for i in range(1, vals.uts.size):
-        if utslist[i] < utslist[i - 1]:
-            if warn:
-                logger.warning("DryCal log crossing day boundary. Adding offset.")
-                warn = False
-            uts = utslist[i] + ndays * 86400
-            while uts < utslist[i - 1]:
-                ndays += 1
-                uts = utslist[i] + ndays * 86400
-            utslist[i] = uts
+    if np.any(utslist[1:] < utslist[:-1]):
+        logger.warning("DryCal log crossing day boundary. Adding offset.")
+        utslist = dgutils.fix_day_rollover(utslist)
     vals["uts"] = DataArray(data=utslist, dims=["uts"])
     vals.attrs["fulldate"] = False
     return vals
@@ -56,12 +56,13 @@ extract = get_extract_dispatch()
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     encoding: str,
     timezone: str,
     **kwargs: dict,
 ) -> DataTree:
-    vals = common.rtf(str(source), encoding, timezone)
+    vals = common.rtf(source, encoding, timezone)
     return DataTree(common.check_timestamps(vals))
@@ -55,12 +55,13 @@ extract = get_extract_dispatch()
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     encoding: str,
     timezone: str,
     **kwargs: dict,
 ) -> DataTree:
-    vals = common.sep(str(source), "\t", encoding, timezone)
+    vals = common.sep(source, "\t", encoding, timezone)
     return DataTree(common.check_timestamps(vals))
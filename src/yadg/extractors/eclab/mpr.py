@@ -69,8 +69,8 @@ log module and then an optional loop module.
     0x???? MODULE                  # Module magic.
     ...                            # Module 4.
 
-After splitting the entire file on ``MODULE``, each module starts with a
-header that is structured like this (offsets from start of module):
+Each module starts with a header following the ``MODULE`` keyword, which is
+structured like this (offsets from start of module):
 
 .. code-block::
 
@@ -193,6 +193,8 @@ host address and an acquisition start timestamp in Microsoft OLE format.
 """
 
 import logging
+import mmap
+import functools
 import numpy as np
 from .mpr_columns import (
     module_header_dtypes,
@@ -207,11 +209,14 @@ from .mpr_columns import (
 from .techniques import (
     technique_params_dtypes,
     param_from_key,
+    params_from_keys,
     split_control,
     get_unc,
 )
 from pathlib import Path
+from typing import NamedTuple
 from yadg import dgutils
+from yadg.dgutils.btools import BlockArray, lazy_array
 from yadg.extractors import get_extract_dispatch
 from xarray import DataTree, Dataset, DataArray
 
@@ -392,10 +397,94 @@ def parse_columns(
     return names, dtypes, units, flags
 
 
+class DataLayout(NamedTuple):
+    """The compiled layout of the records in a data module.
+
+    Attributes
+    ----------
+    dtype
+        The structured dtype of a single record.
+
+    offset
+        The offset of the first record from the start of the module data.
+
+    plan
+        The output columns, as ``(column, name, kind, arg)`` tuples. The ``kind``
+        is either ``"flag"`` with the ``(bitmask, shift)`` as ``arg``, ``"param"``
+        for integer-coded columns, or ``"data"`` with the unit as ``arg``.
+
+    """
+
+    dtype: np.dtype
+    offset: int
+    plan: tuple[tuple[str, str, str, object], ...]
+
+
+@functools.lru_cache(maxsize=128)
+def compile_layout(
+    column_ids: tuple[int, ...],
+    technique: str,
+    version: int,
+) -> DataLayout:
+    """Compiles the layout of the records in a data module.
+
+    The layout is memoized, so that extracting files with a repeated sequence of
+    column IDs skips :func:`parse_columns` and the construction of the dtype. The
+    warnings about the columns are therefore only logged once per layout.
+
+    Parameters
+    ----------
+    column_ids
+        A tuple of column IDs.
+
+    technique
+        The technique name from the settings module.
+
+    version
+        Module version from the data module header.
+
+    Returns
+    -------
+    DataLayout
+        The compiled dtype, offset and the plan of the output columns.
+
+    """
+    # Length of each datapoint depends on number and IDs of columns.
+    namelist, dtypelist, unitlist, flaglist = parse_columns(column_ids, technique)
+    dtype = np.dtype(list(zip(namelist, dtypelist)))
+    # Depending on module version, datapoints start at different offsets.
+    if version in {10, 11}:
+        offset = 0x3EF
+    elif version == 2:
+        offset = 0x195
+    elif version == 3:
+        offset = 0x196
+    else:
+        raise NotImplementedError(f"Unknown data module version: {version}")
+
+    plan = []
+    for name, unit in zip(dtype.names, unitlist):
+        if name.startswith("unknown_"):
+            continue
+        elif name == "flags" and flaglist:
+            for fname, bitmask in flaglist.items():
+                # Two's complement hack to find the position of the
+                # rightmost set bit.
+                shift = (bitmask & -bitmask).bit_length() - 1
+                plan.append((name, fname, "flag", (bitmask, shift)))
+        elif unit is None:
+            plan.append((name, name, "param", None))
+        else:
+            plan.append((name, name, "data", unit))
+    return DataLayout(dtype, offset, tuple(plan))
+
+
 def process_data(
     data: bytes,
     version: int,
     technique: str,
+    lazy_path: Path = None,
+    base: int = 0,
 ):
     """Processes the contents of data modules.
 
@@ -407,6 +496,13 @@ def process_data(
     version
         Module version from the data module header.
 
+    lazy_path
+        If provided, the flag and data columns are returned as lazily indexed arrays,
+        reading the values from the file at ``lazy_path`` on access.
+
+    base
+        The offset of the ``data`` within the file at ``lazy_path``.
+
     Returns
     -------
     list[dict]
@@ -423,45 +519,50 @@ def process_data(
     elif version in {2, 3}:
         column_ids = np.frombuffer(data, offset=0x005, dtype="<u2", count=n_columns)
     logger.debug("Found %d columns with IDs: %s", n_columns, column_ids)
-    # Length of each datapoint depends on number and IDs of columns.
-    namelist, dtypelist, unitlist, flaglist = parse_columns(column_ids, technique)
-    data_dtype = np.dtype(list(zip(namelist, dtypelist)))
-    # Depending on module version, datapoints start at different offsets.
-    if version in {10, 11}:
-        offset = 0x3EF
-    elif version == 2:
-        offset = 0x195
-    elif version == 3:
-        offset = 0x196
-    else:
-        raise NotImplementedError(f"Unknown data module version: {version}")
+    layout = compile_layout(tuple(column_ids.tolist()), technique, version)
 
-    values = np.frombuffer(data, offset=offset, dtype=data_dtype, count=n_datapoints)
+    # The records are a view into the data, only the used columns are copied.
+    values = np.frombuffer(
+        data, offset=layout.offset, dtype=layout.dtype, count=n_datapoints
+    )
 
     data_vars = {}
-    for name, unit in zip(values.dtype.names, unitlist):
-        if name.startswith("unknown_"):
-            continue
-        elif len(values[name]) == 0:
-            continue
-        elif name == "flags" and flaglist:
-            for fname, bitmask in flaglist.items():
-                # Two's complement hack to find the position of the
-                # rightmost set bit.
-                shift = (bitmask & -bitmask).bit_length() - 1
-                # Rightshift flag by that amount.
-                data_vars[fname] = (("uts",), (values[name] & bitmask) >> shift, {})
-        elif unit is None:
+    plan = layout.plan if n_datapoints > 0 else ()
+    for column, name, kind, arg in plan:
+        if lazy_path is not None and kind != "param":
+            dtype, field_offset = layout.dtype.fields[column][:2]
+            func = None
+            if kind == "flag":
+                bitmask, shift = arg
+
+                def func(v, rows, b=bitmask, s=shift):
+                    return (v & b) >> s
+
+            array = BlockArray(
+                lazy_path,
+                base + layout.offset + field_offset,
+                layout.dtype.itemsize,
+                n_datapoints,
+                dtype,
+                func=func,
+            )
+            attrs = {} if kind == "flag" else {"units": arg}
+            data_vars[name] = (("uts",), lazy_array(array), attrs)
+        elif kind == "flag":
+            bitmask, shift = arg
+            # Rightshift flag by that amount.
+            data_vars[name] = (("uts",), (values[column] & bitmask) >> shift, {})
+        elif kind == "param":
             data_vars[name] = (
                 ("uts",),
-                [param_from_key(name, int(v)) for v in values[name]],
+                params_from_keys(name, values[column].astype(np.int64)),
                 {},
             )
         else:
             data_vars[name] = (
                 ("uts",),
-                values[name],
-                {"units": unit},
+                values[column].copy(),
+                {"units": arg},
             )
 
     coords = dict()
@@ -506,7 +607,7 @@ def process_loop(data: bytes) -> dict:
 
     """
     n_indexes = np.frombuffer(data, offset=0x0000, dtype="<u4", count=1)[0]
-    indexes = np.frombuffer(data, offset=0x0004, dtype="<u4", count=n_indexes)
+    indexes = np.frombuffer(data, offset=0x0004, dtype="<u4", count=n_indexes).copy()
     return {"n_indexes": n_indexes, "indexes": indexes}
 
 
@@ -531,13 +632,57 @@ def process_ext(data: bytes) -> dict:
     return ext
 
 
-def process_modules(contents: bytes) -> tuple[dict, list, list, dict, dict]:
+def read_module_header(
+    contents: bytes | mmap.mmap,
+    view: memoryview,
+    start: int,
+    previous: np.dtype = None,
+) -> tuple[dict, np.dtype, int]:
+    """
+    Reads the header of the module starting at ``start``, returning the header, its
+    dtype, and the offset of the end of the module.
+
+    The dtype of the header is selected so that the module is followed by another
+    one or by the end of file. The last module may also be followed by trailing
+    bytes which do not contain any further modules, in which case the dtype of the
+    ``previous`` module header is used.
+
+    """
+    trailing = None
+    for mhd in module_header_dtypes:
+        try:
+            header = dgutils.read_value(view, start, mhd)
+        except (UnicodeDecodeError, ValueError):
+            continue
+        end = start + mhd.itemsize + header["length"]
+        if end == len(view) or view[end : end + 6] == b"MODULE":
+            return header, mhd, end
+        elif mhd == previous and end < len(view):
+            if contents.find(b"MODULE", end) == -1:
+                trailing = header, mhd, end
+    if trailing is not None:
+        return trailing
+    raise RuntimeError("Unknown module header.")
+
+
+def process_modules(
+    contents: bytes | mmap.mmap,
+    lazy_path: Path = None,
+) -> tuple[dict, list, list, dict, dict]:
     """Handles the processing of all modules.
 
+    The modules are located by reading their headers, starting from the first
+    ``MODULE`` keyword. The module data are passed on as :class:`memoryview`
+    slices of the ``contents``, so that no copies of the file are made.
+
     Parameters
     ----------
     contents
-        The contents of an .mpr file, minus the file magic.
+        The contents of an .mpr file, e.g. as bytes or a memory-mapped file.
+
+    lazy_path
+        If provided, the data module is read lazily from the file at this path, see
+        :func:`process_data`.
 
     Returns
     -------
@@ -546,25 +691,24 @@ def process_modules(contents: bytes) -> tuple[dict, list, list, dict, dict]:
         not present in the provided modules, returns None instead.
 
     """
-    modules = contents.split(b"MODULE")[1:]
-    settings = log = loop = ext = None
+    view = memoryview(contents)
+    settings = ds = log = loop = ext = None
     technique = None
-    for module in modules:
-        for mhd in module_header_dtypes:
-            try:
-                header = dgutils.read_value(module, 0x0000, mhd)
-                if len(module) == mhd.itemsize + header["length"]:
-                    version = header.get("newver", 0) + header["oldver"]
-                    logger.debug(
-                        "Parsed module header with length %d, version %s",
-                        header["length"],
-                        version,
-                    )
-                    break
-            except UnicodeDecodeError:
-                continue
-        else:
-            raise RuntimeError("Unknown module header.")
+    min_size = min(mhd.itemsize for mhd in module_header_dtypes)
+    mhd = None
+    start = contents.find(b"MODULE")
+    # The walk stops at the end of file, or at any trailing bytes after the modules.
+    while start != -1 and view[start : start + 6] == b"MODULE":
+        start += len(b"MODULE")
+        if len(view) - start < min_size:
+            break
+        header, mhd, end = read_module_header(contents, view, start, mhd)
+        version = header.get("newver", 0) + header["oldver"]
+        logger.debug(
+            "Parsed module header with length %d, version %s",
+            header["length"],
+            version,
+        )
         name = header["short_name"].strip()
         # We need to determine file version from the header to be able to select correct
         # dtypes. Unfortunately, the header["oldver"] of the "VMP Set" module is always
@@ -577,12 +721,14 @@ def process_modules(contents: bytes) -> tuple[dict, list, list, dict, dict]:
             minver = "10.40"
 
         logger.debug("Read '%s' with version '%s' ('%s')", name, version, minver)
-        module_data = module[mhd.itemsize :]
+        module_data = view[start + mhd.itemsize : end]
+        start = end
         if name == "VMP Set":
             technique, settings, params = process_settings(module_data, minver)
 
         elif name == "VMP data":
-            ds = process_data(module_data, version, technique)
+            base = end - len(module_data)
+            ds = process_data(module_data, version, technique, lazy_path, base)
         elif name == "VMP LOG":
             log = process_log(module_data)
         elif name == "VMP loop":
@@ -601,11 +747,13 @@ def extract_from_path(
     source: Path,
     *,
     timezone: str,
+    lazy: bool = False,
     **kwargs: dict,
 ) -> DataTree:
-    with open(source, "rb") as mpr_file:
-        mpr_bytes = mpr_file.read()
-    return extract_raw_bytes(source=mpr_bytes, timezone=timezone)
+    with dgutils.map_file(source) as contents:
+        return extract_raw_bytes(
+            source=contents, timezone=timezone, lazy_path=source if lazy else None
+        )
 
 
 @extract.register(bytes)
@@ -620,13 +768,14 @@ def extract_from_bytes(
 
 def extract_raw_bytes(
     *,
-    source: bytes,
+    source: bytes | mmap.mmap,
     timezone: str,
+    lazy_path: Path = None,
     **kwargs: dict,
 ) -> DataTree:
     file_magic = b"BIO-LOGIC MODULAR FILE\x1a                         \x00\x00\x00\x00"
     assert source[: len(file_magic)] == file_magic, "invalid file magic"
-    settings, params, ds, log, loop = process_modules(source)
+    settings, params, ds, log, loop = process_modules(source, lazy_path)
     assert settings is not None, "no settings module"
     assert ds is not None, "no data module"
     # Arrange all the data into the correct format.
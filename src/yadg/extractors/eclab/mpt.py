@@ -67,20 +67,25 @@ The metadata will contain the information from the header of the file.
 """
 
 import logging
+import numpy as np
+from itertools import chain, islice
 from .mpt_columns import column_units
-from .techniques import param_from_key, get_unc, split_control
+from .techniques import param_from_key, params_from_keys, get_unc, split_control
 from babel.numbers import parse_decimal
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 from xarray import DataTree, Dataset, DataArray
 from yadg import dgutils
 from yadg.extractors import get_extract_dispatch
-from yadg.dgutils.table import process_table
+from yadg.dgutils.table import process_table_chunked
 
 
 logger = logging.getLogger(__name__)
 extract = get_extract_dispatch()
 
+# Number of data lines parsed at once.
+CHUNK_LINES = 2**14
+
 
 def process_settings(lines: list[str]) -> dict[str, str]:
     settings = {}
@@ -271,11 +276,14 @@ def process_header(
 
 
 def process_data(
-    lines: list[str],
+    lines: Iterable[str],
     locale: str,
 ):
     """Processes the data lines.
 
+    The data lines are consumed lazily, in chunks of ``CHUNK_LINES``, so that the
+    text of the whole file does not have to be held in memory.
+
     Parameters
     ----------
     lines
@@ -293,8 +301,10 @@ def process_data(
 
     """
     # At this point the first two lines have already been read.
+    lines = iter(lines)
+    next(lines)
     # Remove extra column due to an extra tab in .mpt file column names.
-    names = lines[1].split("\t")[:-1]
+    names = next(lines).split("\t")[:-1]
     units = dict()
     columns = list()
     for n in names:
@@ -308,14 +318,16 @@ def process_data(
         if u is not None:
             units[c] = u
     # Remove empty lines from data_lines, see issue #151.
-    data_lines = [line for line in lines[2:] if line.strip() != ""]
+    data_lines = (line for line in lines if line.strip() != "")
 
-    if len(data_lines) > 0:
-        data_vars = process_table(
-            lines=data_lines,
+    first = next(data_lines, None)
+    if first is not None:
+        data_vars = process_table_chunked(
+            lines=chain([first], data_lines),
             headers=columns,
             locale=locale,
             uncertainties_int_columns=False,
+            chunksize=CHUNK_LINES,
         )
     else:
         data_vars = {}
@@ -326,7 +338,7 @@ def process_data(
         data_vars[k] = (("uts",), *data_vars[k][1:])
 
     if "I Range" in data_vars:
-        params = [param_from_key("I Range", int(v)) for v in data_vars["I Range"][1]]
+        params = params_from_keys("I Range", np.asarray(data_vars["I Range"][1], int))
         data_vars["I Range"] = (
             data_vars["I Range"][0],
             params,
@@ -345,8 +357,9 @@ def process_data(
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     encoding: str,
     locale: str,
@@ -354,36 +367,36 @@ def extract_from_path(
     **kwargs: dict,
 ) -> DataTree:
     file_magic = "EC-Lab ASCII FILE\n"
-    with open(source, "r", encoding=encoding) as mpt_file:
+    with dgutils.open_source(source, "r", encoding=encoding) as mpt_file:
         assert mpt_file.read(len(file_magic)) == file_magic, "invalid file magic"
-        mpt = mpt_file.read()
-    lines = mpt.split("\n")
-    nb_header_lines = int(lines[0].split()[-1])
-    header_lines = lines[: nb_header_lines - 3]
-    data_lines = lines[nb_header_lines - 3 :]
-    settings, params = {}, []
-
-    if nb_header_lines <= 3:
-        logger.warning("Header contains no settings and hence no timestamp.")
-        start_time = 0.0
-        fulldate = False
-        Erange = 10.0
-    else:
-        header = process_header(header_lines, timezone, locale)
-        start_time = header.get("uts")
-        settings = header.get("settings")
-        params = header.get("params")
-        fulldate = True
-        Er_max = params.get("E range max (V)", [10.0])
-        Er_min = params.get("E range min (V)", [0.0])
-        Erange = max([_max - _min for _max, _min in zip(Er_max, Er_min)])
-
-    # Arrange all the data into the correct format.
-    # TODO: Metadata could be handled in a nicer way.
-    metadata = {"settings": settings, "params": params}
-
-    # Data processing including mpt quirks
-    ds = process_data(data_lines, locale)
+        lines = (line.removesuffix("\n") for line in mpt_file)
+        first = next(lines)
+        nb_header_lines = int(first.split()[-1])
+        settings, params = {}, []
+
+        if nb_header_lines <= 3:
+            logger.warning("Header contains no settings and hence no timestamp.")
+            lines = chain([first], lines)
+            start_time = 0.0
+            fulldate = False
+            Erange = 10.0
+        else:
+            header_lines = [first, *islice(lines, nb_header_lines - 4)]
+            header = process_header(header_lines, timezone, locale)
+            start_time = header.get("uts")
+            settings = header.get("settings")
+            params = header.get("params")
+            fulldate = True
+            Er_max = params.get("E range max (V)", [10.0])
+            Er_min = params.get("E range min (V)", [0.0])
+            Erange = max([_max - _min for _max, _min in zip(Er_max, Er_min)])
+
+        # Arrange all the data into the correct format.
+        # TODO: Metadata could be handled in a nicer way.
+        metadata = {"settings": settings, "params": params}
+
+        # Data processing including mpt quirks
+        ds = process_data(lines, locale)
 
     if "I Range" in ds:
         Irange = max(
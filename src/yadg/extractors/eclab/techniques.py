@@ -1659,6 +1659,18 @@ param_map = {
 }
 
 
+def _param_table(entries: tuple) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    entries = sorted((i for i in entries if isinstance(i[1], int)), key=lambda i: i[1])
+    keys = np.array([i[1] for i in entries], dtype=np.int64)
+    strs = np.array([i[0] for i in entries], dtype=object)
+    vals = np.array([i[2] if len(i) > 2 else None for i in entries], dtype=object)
+    return keys, strs, vals
+
+
+# Lookup tables of the entries in ``param_map``, sorted by their integer keys.
+param_tables = {k: _param_table(v) for k, v in param_map.items()}
+
+
 def param_from_key(param: str, key: int | str, to_str: bool = True) -> str | float:
     """
     Convert a supplied key of a certain parameter to its string or float value.
@@ -1698,6 +1710,50 @@ def param_from_key(param: str, key: int | str, to_str: bool = True) -> str | flo
     return key
 
 
+def params_from_keys(
+    param: str, keys: np.ndarray, to_str: bool = True
+) -> np.ndarray | list:
+    """
+    Convert an array of integer keys of a certain parameter to their string or float
+    values.
+
+    This is a vectorized version of :func:`param_from_key`, using the lookup tables
+    in ``param_tables``. Each unique key is located using :func:`numpy.searchsorted`,
+    and the values are then broadcast back into the shape of ``keys``.
+
+    Parameters
+    ----------
+    param
+        The name of the parameter, a key within the ``param_map``. If ``param``
+        is not present in ``param_map``, the supplied keys are returned back.
+
+    keys
+        The integer keys of the parameter that are to be converted.
+
+    to_str
+        A switch between :class:`str` and :class:`float` output.
+
+    Returns
+    -------
+    values: np.ndarray
+        The keys converted to the requested format.
+
+    """
+    keys = np.asarray(keys)
+    if param not in param_tables:
+        return keys
+    tkeys, strs, vals = param_tables[param]
+    uniq, inv = np.unique(keys, return_inverse=True)
+    pos = np.searchsorted(tkeys, uniq)
+    found = pos < tkeys.size
+    found[found] = tkeys[pos[found]] == uniq[found]
+    if not found.all():
+        key = keys[np.isin(keys, uniq[~found])][0]
+        raise ValueError(f"element '{key}' for parameter '{param}' not understood.")
+    table = strs if to_str else vals
+    return np.array(table[pos].tolist())[inv.reshape(keys.shape)]
+
+
 def get_unc(name: str, range: float) -> tuple[float, dict]:
     val = dev_VI(name=name, fsr=range)
     attrs = {
@@ -52,6 +52,7 @@ import xarray as xr
 import numpy as np
 from xarray import DataTree
 from pathlib import Path
+from yadg import dgutils
 from yadg.extractors import get_extract_dispatch
 
 extract = get_extract_dispatch()
@@ -60,13 +61,15 @@ logger = logging.getLogger(__name__)
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     encoding: str,
     **kwargs: dict,
 ) -> DataTree:
-    with open(str(source), "r", encoding=encoding, errors="ignore") as infile:
+    name = dgutils.source_name(source)
+    with dgutils.open_source(source, "r", encoding=encoding, errors="ignore") as infile:
         lines = infile.readlines()
 
     metadata = {}
@@ -74,7 +77,7 @@ def extract_from_path(
         line = lines.pop(0)
         if len(lines) == 0:
             raise RuntimeError(
-                f"Last line of file '{source}' read during metadata section."
+                f"Last line of file '{name}' read during metadata section."
             )
         elif line.strip() == "":
             break
@@ -90,14 +93,14 @@ def extract_from_path(
             metadata["version"] = int(line.split(":,")[1])
 
     if metadata.get("version", None) is None:
-        raise RuntimeError(f"Report version in file '{source}' was not specified.")
+        raise RuntimeError(f"Report version in file '{name}' was not specified.")
 
     samples = {}
     while len(lines) > 0:
         line = lines.pop(0)
         if len(lines) == 0:
             raise RuntimeError(
-                f"Last line of file '{source}' read during samples section."
+                f"Last line of file '{name}' read during samples section."
             )
         elif line.strip() == "":
             break
@@ -125,15 +128,15 @@ def extract_from_path(
     svals = samples.values()
     if len(svals) == 0:
         raise RuntimeError(
-            f"No complete sample data found in file '{source}'. "
+            f"No complete sample data found in file '{name}'. "
             "Have you added time offsets?"
         )
     r = next(iter(svals))
     # check that acquisition and integration methods are consistent throughout file:
     if any([s["acquisition"]["method"] != r["acquisition"]["method"] for s in svals]):
-        logger.warning("Acquisition method is inconsistent in file '%s'.", source)
+        logger.warning("Acquisition method is inconsistent in file '%s'.", name)
     if any([s["integration"]["method"] != r["integration"]["method"] for s in svals]):
-        logger.warning("Integration method is inconsistent in file '%s'.", source)
+        logger.warning("Integration method is inconsistent in file '%s'.", name)
 
     metadata["method"] = r["acquisition"]["method"]
 
@@ -170,7 +173,7 @@ def extract_from_path(
                 logger.warning(
                     "Report version '%d' in file '%s' not understood.",
                     metadata["version"],
-                    source,
+                    name,
                 )
                 c = data[headers.index("Concentration")]
             if c != "":
@@ -210,7 +213,7 @@ def extract_from_path(
             except ValueError:
                 raise RuntimeError(
                     f"It was not possible to parse offset '{offset}' present in file "
-                    f"'{source}' using known formats."
+                    f"'{name}' using known formats."
                 )
         else:
             td = datetime.timedelta(hours=t.hour, minutes=t.minute, seconds=t.second)
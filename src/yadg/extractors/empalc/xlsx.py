@@ -45,6 +45,7 @@ The following metadata is extracted:
 
 """
 
+import io
 import logging
 import datetime
 import openpyxl
@@ -53,6 +54,7 @@ import xarray as xr
 from xarray import DataTree
 import numpy as np
 from pathlib import Path
+from yadg import dgutils
 from yadg.extractors import get_extract_dispatch
 
 extract = get_extract_dispatch()
@@ -60,19 +62,21 @@ logger = logging.getLogger(__name__)
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     **kwargs: dict,
 ) -> DataTree:
+    name = dgutils.source_name(source)
     try:
         wb = openpyxl.load_workbook(
-            filename=str(source),
+            filename=str(source) if isinstance(source, Path) else io.BytesIO(source),
             read_only=True,
         )
     except TypeError:
         raise RuntimeError(
-            f"Could not read the file '{source}' using openpyxl. Try to open and save the "
-            f"file in Excel."
+            f"Could not read the file '{name}' using openpyxl. "
+            "Try to open and save the file in Excel."
         )
 
     ws = wb["Page 1"]
@@ -91,7 +95,7 @@ def extract_from_path(
             metadata["version"] = int(val)
 
     if metadata.get("version", None) is None:
-        raise RuntimeError(f"Report version in file '{source}' was not specified.")
+        raise RuntimeError(f"Report version in file '{name}' was not specified.")
 
     ws = wb["Page 2"]
     samples = {}
@@ -121,15 +125,15 @@ def extract_from_path(
     svals = samples.values()
     if len(svals) == 0:
         raise RuntimeError(
-            f"No complete sample data found in file '{source}'. "
+            f"No complete sample data found in file '{name}'. "
             "Have you added time offsets?"
         )
     r = next(iter(svals))
     # check that acquisition and integration methods are consistent throughout file:
     if any([s["acquisition"]["method"] != r["acquisition"]["method"] for s in svals]):
-        logger.warning("Acquisition method is inconsistent in file '%s'.", source)
+        logger.warning("Acquisition method is inconsistent in file '%s'.", name)
     if any([s["integration"]["method"] != r["integration"]["method"] for s in svals]):
-        logger.warning("Integration method is inconsistent in file '%s'.", source)
+        logger.warning("Integration method is inconsistent in file '%s'.", name)
 
     metadata["method"] = r["acquisition"]["method"].replace("\n", "").replace(" ", "")
 
@@ -162,7 +166,7 @@ def extract_from_path(
                 logger.warning(
                     "Report version '%d' in file '%s' not understood.",
                     metadata["version"],
-                    source,
+                    name,
                 )
                 c = data[headers.index("Concentration")]
             if c is not None:
@@ -203,7 +207,7 @@ def extract_from_path(
             except ValueError:
                 raise RuntimeError(
                     f"It was not possible to parse offset '{offset}' present in file "
-                    f"'{source}' using known formats."
+                    f"'{name}' using known formats."
                 )
         else:
             td = datetime.timedelta(hours=t.hour, minutes=t.minute, seconds=t.second)
@@ -44,8 +44,9 @@ extract = get_extract_dispatch()
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     parameters: BaseModel,
     **kwargs: dict,
@@ -55,14 +55,16 @@ logger = logging.getLogger(__name__)
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     encoding: str,
     timezone: str,
     **kwargs: dict,
 ) -> DataTree:
-    with open(source, "r", encoding=encoding, errors="ignore") as infile:
+    name = dgutils.source_name(source)
+    with dgutils.open_source(source, "r", encoding=encoding, errors="ignore") as infile:
         lines = infile.readlines()
     metadata = {}
     data = {}
@@ -84,13 +86,13 @@ def extract_from_path(
             )
         if line.startswith("Sampling Rate:"):
             assert "Hz" in line, (
-                f"datasc: Incorrect units for rate in file {source}: {line}"
+                f"datasc: Incorrect units for rate in file {name}: {line}"
             )
             parts = line.split("\t")
             samplerates = [float(each.strip()) for each in parts[1:-1]]
         if line.startswith("Total Data Points:"):
             assert "Pts." in line, (
-                f"datasc: Incorrect units for number of points in file {source}: {line}"
+                f"datasc: Incorrect units for number of points in file {name}: {line}"
             )
             parts = line.split("\t")
             npoints = [int(each.strip()) for each in parts[1:-1]]
@@ -120,12 +122,12 @@ def extract_from_path(
         == len(yunits)
         == len(xmuls)
         == len(ymuls)
-    ), f"datasc: Inconsistent number of traces in {source}."
+    ), f"datasc: Inconsistent number of traces in {name}."
 
     data = {}
     for ti, npts in enumerate(npoints):
         assert xunits[ti] == "Minutes", (
-            f"datasc: X units label of trace {ti} in {source} was not understood."
+            f"datasc: X units label of trace {ti} in {name} was not understood."
         )
         dt = 60
         xmul = xmuls[ti] * dt / samplerates[ti]
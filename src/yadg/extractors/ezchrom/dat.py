@@ -71,8 +71,9 @@ detector_trace_struct = [
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     timezone: str,
     **kwargs: dict,
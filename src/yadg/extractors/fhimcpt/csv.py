@@ -62,15 +62,16 @@ logger = logging.getLogger(__name__)
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     encoding: str,
     timezone: str,
     parameters: BaseModel,
     **kwargs: dict,
 ) -> DataTree:
-    with open(source, "r", encoding=encoding) as infile:
+    with dgutils.open_source(source, "r", encoding=encoding) as infile:
         lines = [i.strip() for i in infile.readlines()]
 
     headers = [i.strip() for i in lines.pop(0).split(";")]
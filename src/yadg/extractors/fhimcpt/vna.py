@@ -46,6 +46,7 @@ No metadata is returned.
 from pathlib import Path
 from uncertainties.core import str_to_number_with_uncert as tuple_fromstr
 from yadg.dgutils.table import process_table
+from yadg import dgutils
 from yadg.extractors import get_extract_dispatch
 from xarray import DataTree, Dataset
 
@@ -54,16 +55,18 @@ extract = get_extract_dispatch()
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     encoding: str,
     **kwargs: dict,
 ) -> DataTree:
-    with open(source, "r", encoding=encoding) as infile:
+    name = dgutils.source_name(source)
+    with dgutils.open_source(source, "r", encoding=encoding) as infile:
         lines = infile.readlines()
     assert len(lines) > 2, (
-        f"qftrace: Only {len(lines) - 1} points supplied in {source}; fitting impossible."
+        f"qftrace: Only {len(lines) - 1} points supplied in {name}; fitting impossible."
     )
 
     # process header
@@ -73,14 +73,15 @@ data_units = {
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     encoding: str,
     timezone: str,
     **kwargs: dict,
 ) -> DataTree:
-    with open(source, "r", encoding=encoding, errors="ignore") as infile:
+    with dgutils.open_source(source, "r", encoding=encoding, errors="ignore") as infile:
         lines = infile.readlines()
 
     data = []
@@ -118,9 +119,7 @@ def extract_from_path(
                 "area": {},
                 "retention time": {},
                 "sampleid": items[sni],
-                "uts": dgutils.str_to_uts(
-                    timestamp=f"{items[0]}{offset}", timezone=timezone
-                ),
+                "timestamp": f"{items[0]}{offset}",
             }
             for ii, i in enumerate(items[2:]):
                 ii += 2
@@ -129,6 +128,7 @@ def extract_from_path(
             data.append(point)
 
     species = sorted(species)
+    uts = dgutils.strs_to_uts([i["timestamp"] for i in data], timezone=timezone)
     data_vars = {}
     for kk in {"concentration", "xout", "area", "retention time"}:
         vals = []
@@ -163,7 +163,7 @@ def extract_from_path(
         data_vars=data_vars,
         coords={
             "species": (["species"], species),
-            "uts": (["uts"], [i["uts"] for i in data]),
+            "uts": (["uts"], uts),
         },
         attrs=dict(original_metadata=dict(method=method)),
     )
@@ -239,14 +239,15 @@ def chromtrace(jsdata: dict, uts: float) -> DataTree:
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     encoding: str,
     timezone: str,
     **kwargs: dict,
 ) -> DataTree:
-    with open(source, "r", encoding=encoding, errors="ignore") as infile:
+    with dgutils.open_source(source, "r", encoding=encoding, errors="ignore") as infile:
         jsdata = json.load(infile)
     uts = dgutils.str_to_uts(timestamp=jsdata["runTimeStamp"], timezone=timezone)
     data = chromdata(jsdata, uts)
@@ -43,6 +43,7 @@ from pathlib import Path
 from xarray import DataTree, Dataset
 from yadg.dgutils import dateutils
 from yadg.dgutils.table import process_table
+from yadg import dgutils
 from yadg.extractors import get_extract_dispatch
 from yadg.extractors.panalytical.common import panalytical_comment, snake_case
 
@@ -120,14 +121,15 @@ def process_data(data: str) -> tuple[list, list]:
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     encoding: str,
     timezone: str,
     **kwargs: dict,
 ) -> DataTree:
-    with open(source, "r", encoding=encoding) as csv_file:
+    with dgutils.open_source(source, "r", encoding=encoding) as csv_file:
         csv = csv_file.read()
     # Split file into its sections.
     __, header, data = csv.split("[")
@@ -55,11 +55,13 @@ are discarded.
 
 """
 
+import io
 import numpy as np
 from collections import defaultdict
 from pathlib import Path
 from xarray import DataTree, Dataset
 from xml.etree import ElementTree
+from yadg import dgutils
 from yadg.dgutils import dateutils
 from yadg.extractors import get_extract_dispatch
 from yadg.extractors.panalytical.common import panalytical_comment
@@ -195,13 +197,16 @@ def process_measurement(measurement: dict, timezone: str):
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     timezone: str,
     **kwargs: dict,
 ) -> DataTree:
-    it = ElementTree.iterparse(source)
+    it = ElementTree.iterparse(
+        source if isinstance(source, Path) else io.BytesIO(source)
+    )
     # Removing xmlns prefixes from all tags.
     # From https://stackoverflow.com/a/25920989.
     for __, e in it:
@@ -220,7 +225,7 @@ def extract_from_path(
     sample["type"] = sample.pop("@type")
     # Process measurement data.
     data, meta = process_measurement(measurements["xrdMeasurement"], timezone)
-    data["fn"] = str(source)
+    data["fn"] = dgutils.source_name(source)
     # Shove unused data into meta
     meta["sample"] = sample
     meta["comment"] = comment
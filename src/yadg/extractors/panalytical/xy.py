@@ -41,19 +41,21 @@ timestamp.
 from pathlib import Path
 from xarray import DataTree, Dataset
 from yadg.dgutils.table import process_table
+from yadg import dgutils
 from yadg.extractors import get_extract_dispatch
 
 extract = get_extract_dispatch()
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     encoding: str,
     **kwargs: dict,
 ) -> DataTree:
-    with open(source, "r", encoding=encoding) as xy_file:
+    with dgutils.open_source(source, "r", encoding=encoding) as xy_file:
         xy = xy_file.readlines()
 
     data_vars = process_table(
@@ -123,6 +123,7 @@ import re
 import yadg.dgutils as dgutils
 from pathlib import Path
 from xarray import DataTree, Dataset
+from yadg.dgutils.btools import BlockArray, lazy_array
 from yadg.extractors import get_extract_dispatch
 
 
@@ -254,7 +255,11 @@ def _process_trace_defs(header: dict) -> list[dict]:
     return trace_defs
 
 
-def _process_traces(spe: list[bytes], trace_defs: list[dict]) -> dict:
+def _process_traces(
+    spe: list[bytes],
+    trace_defs: list[dict],
+    lazy_path: Path = None,
+) -> dict:
     """Processes the spectral traces in the file.
 
     Parameters
@@ -265,6 +270,10 @@ def _process_traces(spe: list[bytes], trace_defs: list[dict]) -> dict:
     trace_defs
         The list of trace definitions parsed from the file header.
 
+    lazy_path
+        If provided, the traces are returned as lazily indexed arrays, reading the
+        data from the file at ``lazy_path`` on access.
+
     Returns
     -------
     dict
@@ -273,6 +282,8 @@ def _process_traces(spe: list[bytes], trace_defs: list[dict]) -> dict:
 
     """
     data = b"".join(spe[spe.index(b"EOFH\n") + 1 :])
+    # Offset of the binary data within the file.
+    base = sum(len(line) for line in spe[: spe.index(b"EOFH\n") + 1])
     data_header = dgutils.read_value(data, 0x0000, data_header_dtype)
     assert data_header["num_traces"] == len(trace_defs)
     # All trace headers I have seen are 192 (0xc0) bytes long.
@@ -301,12 +312,23 @@ def _process_traces(spe: list[bytes], trace_defs: list[dict]) -> dict:
         # Construct data from trace_header
         data_dtype = np.dtype(f"{trace_header['data_dtype'].decode()}")
         data_offset = trace_header["end_of_data"] - trace_header["num_data_bytes"]
-        datapoints = np.frombuffer(
-            data,
-            offset=data_offset,
-            dtype=data_dtype,
-            count=trace_header["num_datapoints"],
-        )
+        if lazy_path is not None:
+            datapoints = lazy_array(
+                BlockArray(
+                    lazy_path,
+                    base + data_offset,
+                    data_dtype.itemsize,
+                    trace_header["num_datapoints"],
+                    data_dtype,
+                )
+            )
+        else:
+            datapoints = np.frombuffer(
+                data,
+                offset=data_offset,
+                dtype=data_dtype,
+                count=trace_header["num_datapoints"],
+            )
         dwell_time = dgutils.read_value(data, trace_header["end_of_data"], "<f4")
         np.testing.assert_almost_equal(dwell_time, float(trace_def["dwell_time"]))
         # TODO: Figure out the correct error. This signal count should
@@ -330,11 +352,14 @@ def _process_traces(spe: list[bytes], trace_defs: list[dict]) -> dict:
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
+    *,
+    lazy: bool = False,
     **kwargs: dict,
 ) -> DataTree:
-    with open(source, "rb") as spe_file:
+    with dgutils.open_source(source, "rb") as spe_file:
         spe = spe_file.readlines()
     header = _process_header(spe)
     software_id, version = header.get("software_version").split()
@@ -345,7 +370,9 @@ def extract_from_path(
         "file_header": header,
     }
     trace_defs = _process_trace_defs(header)
-    traces = _process_traces(spe, trace_defs)
+    traces = _process_traces(
+        spe, trace_defs, source if lazy and isinstance(source, Path) else None
+    )
     vals = {}
     for v in traces.values():
         fvals = Dataset(
@@ -50,12 +50,11 @@ Currently, the data is extracted from the ``1.0.gz`` file only.
 
 """
 
-import os
+import io
 import json
 import numpy as np
 import tarfile
 import gzip
-import tempfile
 import xarray as xr
 from xarray import DataTree
 from yadg import dgutils
@@ -66,23 +65,26 @@ extract = get_extract_dispatch()
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     **kwargs: dict,
 ) -> DataTree:
-    with tarfile.open(source, mode="r") as tf:
-        with tempfile.TemporaryDirectory() as tempdir:
-            tf.extractall(tempdir, filter="data")
-
-            # Get file metadata
-            with open(os.path.join(tempdir, "metadata.json")) as inf:
-                metadata = json.load(inf)
-
-            # Get data from 1.0.gz
-            with gzip.open(os.path.join(tempdir, "data-map.json.gz"), "rb") as inp:
-                dmap = json.loads(inp.read())
-            with gzip.open(os.path.join(tempdir, "1.0.gz"), "rb") as inp:
-                raw = inp.read()
+    # The members of the archive are streamed in memory.
+    if isinstance(source, Path):
+        tf = tarfile.open(source, mode="r")
+    else:
+        tf = tarfile.open(fileobj=io.BytesIO(source), mode="r")
+    with tf:
+        # Get file metadata
+        with tf.extractfile("metadata.json") as inf:
+            metadata = json.load(inf)
+
+        # Get data from 1.0.gz
+        with gzip.open(tf.extractfile("data-map.json.gz"), "rb") as inp:
+            dmap = json.loads(inp.read())
+        with gzip.open(tf.extractfile("1.0.gz"), "rb") as inp:
+            raw = inp.read()
 
     uts = dgutils.str_to_uts(timestamp=metadata["startDate"], timezone=None)
 
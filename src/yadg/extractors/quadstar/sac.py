@@ -93,11 +93,13 @@ are still one or two unknown fields.
 
 """
 
+import mmap
 import numpy as np
 import yadg.dgutils as dgutils
-import xarray as xr
 from pathlib import Path
+from typing import Callable
 from xarray import DataTree, Dataset
+from yadg.dgutils.btools import BlockArray, lazy_array
 from yadg.extractors import get_extract_dispatch
 
 
@@ -161,13 +163,42 @@ def _find_first_data_position(scan_headers: list[dict]) -> int:
         return header["data_position"]
 
 
+def _mask_overflow(fsr: np.ndarray) -> Callable:
+    """Returns a function replacing the y values outside of the FSR with NaNs."""
+    limit = fsr.astype(np.float32)[:, np.newaxis]
+
+    def mask(yvals: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        yvals[yvals > limit[rows]] = np.nan
+        return yvals
+
+    return mask
+
+
 @extract.register(Path)
 def extract_from_path(
     source: Path,
+    *,
+    lazy: bool = False,
     **kwargs: dict,
 ) -> DataTree:
-    with open(source, "rb") as sac_file:
-        sac = sac_file.read()
+    with dgutils.map_file(source) as contents:
+        return extract_raw_bytes(source=contents, lazy_path=source if lazy else None)
+
+
+@extract.register(bytes)
+def extract_from_bytes(
+    source: bytes,
+    **kwargs: dict,
+) -> DataTree:
+    return extract_raw_bytes(source=source)
+
+
+def extract_raw_bytes(
+    *,
+    source: bytes | mmap.mmap,
+    lazy_path: Path = None,
+) -> DataTree:
+    sac = source
     meta = dgutils.read_value(sac, 0x0000, general_header_dtype)
     uts_base_s = dgutils.read_value(sac, 0x00C2, "<u4")
     # The ms part of the timestamps is actually saved as tenths of ms so
@@ -182,109 +213,128 @@ def extract_from_path(
     )
     # Find the data position of the first data-containing timestep.
     data_pos_0 = _find_first_data_position(trace_headers)
+    n_timesteps = meta["n_timesteps"]
+    stride = meta["timestep_length"]
     traces = {}
-    for n in range(meta["n_timesteps"]):
-        ts_offset = n * meta["timestep_length"]
-        uts_offset_s = dgutils.read_value(sac, data_pos_0 - 0x0006 + ts_offset, "<u4")
-        uts_offset_ms = (
-            dgutils.read_value(sac, data_pos_0 - 0x0002 + ts_offset, "<u2") * 1e-1
+    if n_timesteps == 0 or data_pos_0 is None:
+        ret = DataTree.from_dict(traces)
+        ret.attrs = dict(original_metadata=meta)
+        return ret
+
+    # The timestamps of all timesteps are read at once.
+    uts_offset_s = dgutils.read_blocks(
+        sac, data_pos_0 - 0x0006, stride, n_timesteps, "<u4"
+    )
+    uts_offset_ms = (
+        dgutils.read_blocks(sac, data_pos_0 - 0x0002, stride, n_timesteps, "<u2") * 1e-1
+    )
+    uts = uts_base + (uts_offset_s[:, 0] + uts_offset_ms[:, 0] * 1e-3)
+    for ti, header in enumerate(trace_headers):
+        if header["type"] != 0x11:
+            continue
+        info = dgutils.read_value(sac, header["info_position"], trace_info_dtype)
+        # Construct the mass data.
+        ndm = info["values_per_mass"]
+        mvals, dm = np.linspace(
+            info["first_mass"],
+            info["first_mass"] + info["scan_width"],
+            info["scan_width"] * ndm,
+            endpoint=False,
+            retstep=True,
         )
-        uts_timestamp = uts_base + (uts_offset_s + uts_offset_ms * 1e-3)
-        for ti, header in enumerate(trace_headers):
-            if header["type"] != 0x11:
-                continue
-            info = dgutils.read_value(sac, header["info_position"], trace_info_dtype)
-            # Construct the mass data.
-            ndm = info["values_per_mass"]
-            mvals, dm = np.linspace(
-                info["first_mass"],
-                info["first_mass"] + info["scan_width"],
-                info["scan_width"] * ndm,
-                endpoint=False,
-                retstep=True,
+        # Determine the detector's full scale range in each timestep.
+        data_pos = header["data_position"]
+        exps = dgutils.read_blocks(sac, data_pos + 0x0004, stride, n_timesteps, "<i2")
+        exps = exps[:, 0]
+        if exps.min() < 0:
+            fsr = 10.0 ** exps.astype(np.float64)
+        else:
+            fsr = 10 ** exps.astype(np.int64)
+        # The n_datapoints value at timestep_data_position is
+        # sometimes wrong. Calculating this here works, however.
+        n_datapoints = info["scan_width"] * info["values_per_mass"]
+        # Once a y_value leaves the FSR it jumps to the maximum
+        # of a float32. These values should be NaNs instead.
+        mask = _mask_overflow(fsr)
+        if lazy_path is not None:
+            yvals = lazy_array(
+                BlockArray(
+                    lazy_path,
+                    data_pos + 0x0006,
+                    stride,
+                    n_timesteps,
+                    "<f4",
+                    n_datapoints,
+                    func=mask,
+                )
             )
-            # Read and construct the y data.
-            ts_data_pos = header["data_position"] + ts_offset
-            # Determine the detector's full scale range.
-            fsr = 10 ** dgutils.read_value(sac, ts_data_pos + 0x0004, "<i2")
-            # The n_datapoints value at timestep_data_position is
-            # sometimes wrong. Calculating this here works, however.
-            n_datapoints = info["scan_width"] * info["values_per_mass"]
-            yvals = np.frombuffer(
-                sac, offset=ts_data_pos + 0x0006, dtype="<f4", count=n_datapoints
-            ).copy()
-            # Once a y_value leaves the FSR it jumps to the maximum
-            # of a float32. These values should be NaNs instead.
-            yvals[yvals > fsr] = np.nan
-            # TODO: Determine the correct accuracy from fsr. The 32bit
-            # ADC is a guess that seems to put the error in the correct
-            # order of magnitude.
-            sigma_adc = fsr / 2**32
-            ds = Dataset(
-                data_vars={
-                    "fsr": (
-                        ["uts"],
-                        [fsr],
-                    ),
-                    "mass_to_charge_uncertainty": (
-                        [],
-                        dm,
-                        {
-                            "standard_name": "mass_to_charge standard_error",
-                            "standard_error_multiplier": 1,
-                            "yadg_uncertainty_type": "abs",
-                            "yadg_uncertainty_distribution": "rectangular",
-                            "yadg_uncertainty_source": "scaling",
-                        },
-                    ),
-                    "y": (
-                        ["uts", "mass_to_charge"],
-                        [yvals],
-                        {
-                            "units": info["y_unit"],
-                            "ancilliary_variables": "y_uncertainty",
-                        },
-                    ),
-                    "y_uncertainty": (
-                        [],
-                        sigma_adc,
-                        {
-                            "standard_name": "y standard_error",
-                            "standard_error_multiplier": 1,
-                            "yadg_uncertainty_type": "abs",
-                            "yadg_uncertainty_distribution": "rectangular",
-                            "yadg_uncertainty_source": "scaling",
-                        },
-                    ),
-                },
-                coords={
-                    "mass_to_charge": (
-                        ["mass_to_charge"],
-                        mvals,
-                        {
-                            "units": info["x_unit"],
-                            "ancillary_variables": "mass_to_charge_uncertainty",
-                        },
-                    ),
-                    "uts": (["uts"], [uts_timestamp]),
-                },
-                attrs=dict(original_metadata=info),
+        else:
+            yvals = dgutils.read_blocks(
+                sac, data_pos + 0x0006, stride, n_timesteps, "<f4", n_datapoints
             )
-            if f"{ti}" not in traces:
-                traces[f"{ti}"] = ds
-            else:
-                try:
-                    traces[f"{ti}"] = xr.concat(
-                        [traces[f"{ti}"], ds],
-                        data_vars="all",
-                        dim="uts",
-                        combine_attrs="identical",
-                    )
-                except xr.MergeError:
-                    raise RuntimeError(
-                        "Merging metadata from the individual traces has failed. "
-                        "This is a bug. Please open an issue on GitHub."
-                    )
+            yvals = mask(yvals, np.arange(n_timesteps))
+        # TODO: Determine the correct accuracy from fsr. The 32bit
+        # ADC is a guess that seems to put the error in the correct
+        # order of magnitude.
+        sigma_adc = fsr / 2**32
+        # The uncertainties are stored for each timestep in multi-timestep files.
+        if n_timesteps > 1:
+            unc_dims = ["uts"]
+            dm = np.full(n_timesteps, dm)
+        else:
+            unc_dims = []
+            sigma_adc = sigma_adc[0]
+        ds = Dataset(
+            data_vars={
+                "fsr": (
+                    ["uts"],
+                    fsr,
+                ),
+                "mass_to_charge_uncertainty": (
+                    unc_dims,
+                    dm,
+                    {
+                        "standard_name": "mass_to_charge standard_error",
+                        "standard_error_multiplier": 1,
+                        "yadg_uncertainty_type": "abs",
+                        "yadg_uncertainty_distribution": "rectangular",
+                        "yadg_uncertainty_source": "scaling",
+                    },
+                ),
+                "y": (
+                    ["uts", "mass_to_charge"],
+                    yvals,
+                    {
+                        "units": info["y_unit"],
+                        "ancilliary_variables": "y_uncertainty",
+                    },
+                ),
+                "y_uncertainty": (
+                    unc_dims,
+                    sigma_adc,
+                    {
+                        "standard_name": "y standard_error",
+                        "standard_error_multiplier": 1,
+                        "yadg_uncertainty_type": "abs",
+                        "yadg_uncertainty_distribution": "rectangular",
+                        "yadg_uncertainty_source": "scaling",
+                    },
+                ),
+            },
+            coords={
+                "mass_to_charge": (
+                    ["mass_to_charge"],
+                    mvals,
+                    {
+                        "units": info["x_unit"],
+                        "ancillary_variables": "mass_to_charge_uncertainty",
+                    },
+                ),
+                "uts": (["uts"], uts),
+            },
+            attrs=dict(original_metadata=info),
+        )
+        traces[f"{ti}"] = ds
 
     ret = DataTree.from_dict(traces)
     ret.attrs = dict(original_metadata=meta)
@@ -82,7 +82,7 @@ I_ranges = {
 }
 
 
-def biologic_tomato_json(fn: Path, jsdata: dict) -> DataTree:
+def biologic_tomato_json(fn: Path | bytes, jsdata: dict) -> DataTree:
     technique = jsdata["technique"]
     previous = jsdata.get("previous", None)
     current = jsdata["current"]
@@ -175,21 +175,21 @@ def biologic_tomato_json(fn: Path, jsdata: dict) -> DataTree:
     return DataTree(ds)
 
 
-def dummy_tomato_json(fn: Path, jsdata: dict) -> DataTree:
-    data_vals = {}
-    meta_vals = {}
-    for vi, vals in enumerate(jsdata["data"]):
+def dummy_tomato_json(fn: Path | bytes, jsdata: dict) -> DataTree:
+    builder = dgutils.DatasetBuilder()
+    for vals in jsdata["data"]:
         vals["uts"] = vals.pop("time")
-        dgutils.append_dicts(vals, {}, data_vals, meta_vals, vi)
-    return DataTree(dgutils.dicts_to_dataset(data_vals, meta_vals, fulldate=False))
+        builder.append(vals)
+    return DataTree(builder.to_dataset(fulldate=False))
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     **kwargs: dict,
 ) -> DataTree:
-    with open(source, "r") as inf:
+    with dgutils.open_source(source, "r") as inf:
         jsdata = json.load(inf)
 
     if "technique" in jsdata:
@@ -85,6 +85,21 @@ def process_filename(filename: str) -> dict:
     return {"params": params}
 
 
+def process_columns(lines: list[str]) -> dict:
+    # Without a filename, the number of ports is determined from the first data line.
+    for line in lines:
+        if line.startswith(("#", "!")) or line.strip() == "":
+            continue
+        ncols = len(line.split("!")[0].split())
+        if ncols == 3:
+            return {"params": ["_11"]}
+        elif ncols == 9:
+            return {"params": ["_11", "_21", "_12", "_22"]}
+        break
+    logger.warning("Could not determine number of ports, assuming 1 port.")
+    return {"params": ["_11"]}
+
+
 def process_options(line: str) -> dict:
     _, freq_unit, param, format, _, Rref = line.split()
     if format == "DB" or format == "dB":
@@ -174,17 +189,21 @@ def process_comments(lines: list[str], tz: str) -> dict:
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     encoding: str,
     timezone: str,
     locale: str,
     **kwargs: dict,
 ) -> DataTree:
-    with open(source, encoding=encoding) as inf:
+    with dgutils.open_source(source, encoding=encoding) as inf:
         lines = inf.readlines()
-    metadata = process_filename(str(source))
+    if isinstance(source, Path):
+        metadata = process_filename(str(source))
+    else:
+        metadata = process_columns(lines)
 
     # Find options line
     for li in lines:
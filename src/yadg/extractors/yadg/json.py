@@ -33,6 +33,7 @@ import json
 import logging
 from pathlib import Path
 from xarray import Dataset, DataTree
+from yadg import dgutils
 from yadg.extractors import get_extract_dispatch
 
 
@@ -182,13 +183,14 @@ def process_4_x(jsdata: dict) -> DataTree:
 
 
 @extract.register(Path)
-def extract_from_path(
-    source: Path,
+@extract.register(bytes)
+def extract_from_source(
+    source: Path | bytes,
     *,
     encoding: str,
     **kwargs: dict,
 ) -> DataTree:
-    with open(source, "r", encoding=encoding, errors="ignore") as infile:
+    with dgutils.open_source(source, "r", encoding=encoding, errors="ignore") as infile:
         jsdata = json.load(infile)
 
     if isinstance(jsdata, list):
@@ -25,6 +25,7 @@ def run_with_arguments():
     - ``process``: processes a given dataschema, extracting data into a NetCDF file.
     - ``update``: updates a given dataschema to the current version.
     - ``preset``: creates a dataschema from a preset file and a target folder.
+    - ``serve``: runs a long-running extraction service.
 
     """
     parser = argparse.ArgumentParser(add_help=False)
@@ -73,6 +74,62 @@ def run_with_arguments():
         help="Ignore metadata merge errors while processing multiple files in a step.",
         default=False,
     )
+    process.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="Number of worker processes used to extract files within each step.",
+        default=1,
+    )
+    process.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write the data of each processed file into the outfile immediately.",
+        default=False,
+    )
+    process.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        nargs="?",
+        const="",
+        help=(
+            "Use a persistent cache of extracted files in this folder, "
+            "or in the default location if no folder is given."
+        ),
+        default=None,
+    )
+    process.add_argument(
+        "--cache-size",
+        dest="cache_size",
+        type=int,
+        help="Maximum size of the persistent cache of extracted files in MB.",
+        default=None,
+    )
+    process.add_argument(
+        "--update",
+        action="store_true",
+        help="Only process new files and append them to an existing outfile.",
+        default=False,
+    )
+    process.add_argument(
+        "--profile",
+        help="Write the timings and memory use of processing into a JSON trace file.",
+        default=None,
+    )
+    process.add_argument(
+        "--profile-attrs",
+        dest="profile_attrs",
+        action="store_true",
+        help="Store a summary of the timings and memory use in the datagram.",
+        default=False,
+    )
+    process.add_argument(
+        "--profile-tracemalloc",
+        dest="profile_tracemalloc",
+        action="store_true",
+        help="Trace the memory allocated by Python while profiling.",
+        default=False,
+    )
     process.set_defaults(func=subcommands.process)
 
     update = subparsers.add_parser("update")
@@ -135,6 +192,62 @@ def run_with_arguments():
         help="Ignore metadata merge errors while processing multiple files in a step.",
         default=False,
     )
+    preset.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="Number of worker processes used to extract files within each step.",
+        default=1,
+    )
+    preset.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write the data of each processed file into the outfile immediately.",
+        default=False,
+    )
+    preset.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        nargs="?",
+        const="",
+        help=(
+            "Use a persistent cache of extracted files in this folder, "
+            "or in the default location if no folder is given."
+        ),
+        default=None,
+    )
+    preset.add_argument(
+        "--cache-size",
+        dest="cache_size",
+        type=int,
+        help="Maximum size of the persistent cache of extracted files in MB.",
+        default=None,
+    )
+    preset.add_argument(
+        "--update",
+        action="store_true",
+        help="Only process new files and append them to an existing outfile.",
+        default=False,
+    )
+    preset.add_argument(
+        "--profile",
+        help="Write the timings and memory use of processing into a JSON trace file.",
+        default=None,
+    )
+    preset.add_argument(
+        "--profile-attrs",
+        dest="profile_attrs",
+        action="store_true",
+        help="Store a summary of the timings and memory use in the datagram.",
+        default=False,
+    )
+    preset.add_argument(
+        "--profile-tracemalloc",
+        dest="profile_tracemalloc",
+        action="store_true",
+        help="Trace the memory allocated by Python while profiling.",
+        default=False,
+    )
     preset.set_defaults(func=subcommands.preset)
 
     extract = subparsers.add_parser("extract")
@@ -144,7 +257,9 @@ def run_with_arguments():
     )
     extract.add_argument(
         "infile",
+        nargs="?",
         help="Specify the input file which should be extracted.",
+        default=None,
     )
     extract.add_argument(
         "outfile",
@@ -190,8 +305,69 @@ def run_with_arguments():
         help="Ignore metadata merge errors while processing multiple files in a step.",
         default=False,
     )
+    extract.add_argument(
+        "--batch",
+        help="Extract all files listed in the supplied file, one path per line.",
+        default=None,
+        type=str,
+    )
+    extract.add_argument(
+        "--out-dir",
+        dest="out_dir",
+        help="Set the output folder of the files extracted using --batch.",
+        default=None,
+        type=str,
+    )
+    extract.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="Number of worker processes used to extract the files in --batch mode,"
+        " or the files within a zip file.",
+        default=1,
+    )
     extract.set_defaults(func=subcommands.extract)
 
+    serve = subparsers.add_parser("serve")
+    serve.add_argument(
+        "--host",
+        help="Set the host name the extraction service listens on.",
+        default="localhost",
+        type=str,
+    )
+    serve.add_argument(
+        "--port",
+        help="Set the port the extraction service listens on.",
+        default=8000,
+        type=int,
+    )
+    serve.add_argument(
+        "--socket",
+        help="Listen on the supplied Unix socket instead of a port.",
+        default=None,
+        type=str,
+    )
+    serve.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="Number of worker processes used to extract the requested files.",
+        default=1,
+    )
+    serve.add_argument(
+        "--preload",
+        nargs="*",
+        help="Filetypes whose extractors are imported when the workers start.",
+        default=None,
+    )
+    serve.add_argument(
+        "--root",
+        help="Allow the extraction of files by path within this folder.",
+        default=None,
+        type=str,
+    )
+    serve.set_defaults(func=subcommands.serve)
+
     # parse subparser args
     args, extras = parser.parse_known_args()
     # parse extras for verbose tags
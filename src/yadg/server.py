@@ -0,0 +1,258 @@
+"""
+A long-running extraction service for **yadg**.
+
+The service keeps a pool of worker processes, in which **yadg** and the requested
+`extractors` are imported only once, and accepts extraction requests over HTTP,
+served either on a localhost port or on a Unix socket. The following endpoints
+are available:
+
+- ``GET /health``: returns a JSON object with the ``status`` and ``yadg_version``.
+- ``POST /extract``: extracts a file, configured using the query parameters
+  ``filetype`` (required), ``path``, ``timezone``, ``locale``, ``encoding``,
+  ``suffix``, and ``meta_only``. If ``path`` is provided, the file at that path
+  is extracted using :func:`yadg.extractors.extract_from_path`; otherwise, the
+  body of the request is extracted as raw bytes using
+  :func:`yadg.extractors.extract_from_bytes`. The response contains the NetCDF
+  file (``application/x-netcdf``), or the metadata as JSON if ``meta_only`` is set.
+
+Files can only be extracted using ``path`` if the service is started with a
+``root`` folder. Relative paths are resolved against the ``root``, and paths
+resolving outside of it are rejected with a ``403`` status code.
+
+Failed extractions are reported with a ``422`` status code and malformed requests
+with a ``400`` status code, along with a JSON object containing the ``error``. If
+a worker process dies, the pool of workers is restarted and the request is
+reported with a ``503`` status code.
+
+"""
+
+import json
+import logging
+import os
+import signal
+import socketserver
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import import_module, metadata
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+
+logger = logging.getLogger(__name__)
+
+OPTIONS = {"filetype", "path", "timezone", "locale", "encoding", "suffix", "meta_only"}
+
+
+@lru_cache(maxsize=64)
+def _get_extractor(filetype: str, timezone: str, encoding: str, locale: str, suffix):
+    from yadg import extractors
+
+    return extractors.get_extractor(filetype, timezone, encoding, locale, suffix)
+
+
+def _warm_up(preload: tuple[str]) -> None:
+    """Imports **yadg** and the ``preload`` extractors in each worker process."""
+    # Interrupts are handled by the server, which shuts down the pool.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    import_module("yadg.extractors")
+    for filetype in preload:
+        _get_extractor(filetype, None, None, None, None)
+        import_module(f"yadg.extractors.{filetype}")
+    logger.debug("Worker process %d is ready.", os.getpid())
+
+
+def extract_request(
+    filetype: str,
+    path: str = None,
+    data: bytes = None,
+    timezone: str = None,
+    locale: str = None,
+    encoding: str = None,
+    suffix: str = None,
+    meta_only: bool = False,
+    filename: str = None,
+) -> tuple[str, bytes]:
+    """
+    Processes a single extraction request, returning the content type and the body
+    of the response. If provided, the ``filename`` is stored as the name of the
+    extracted file instead of ``path``.
+
+    """
+    from yadg import extractors
+    from yadg.subcommands import _obj_to_meta_dict
+
+    extractor = _get_extractor(filetype, timezone, encoding, locale, suffix)
+    if path is None:
+        ret = extractors.extract_from_bytes(data, extractor)
+    elif Path(path).suffix == ".zip" and zipfile.is_zipfile(path):
+        ret = extractors.extract_from_zip(Path(path), extractor)
+    else:
+        ret = extractors.extract_from_path(Path(path), extractor)
+    if filename is not None:
+        ret.attrs["yadg_extract_filename"] = filename
+    if meta_only:
+        return "application/json", json.dumps(_obj_to_meta_dict(ret)).encode()
+    return "application/x-netcdf", bytes(ret.to_netcdf(engine="h5netcdf"))
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """Handles the requests of the extraction service, see :mod:`yadg.server`."""
+
+    server_version = f"yadg/{metadata.version('yadg')}"
+
+    def address_string(self) -> str:
+        # The client address is empty when served on a Unix socket.
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args) -> None:
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def _respond(self, status: HTTPStatus, ctype: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: HTTPStatus, error: str) -> None:
+        body = json.dumps({"error": error}).encode()
+        self._respond(status, "application/json", body)
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path != "/health":
+            return self._error(HTTPStatus.NOT_FOUND, f"Unknown path {self.path!r}.")
+        status = {"status": "ok", "yadg_version": metadata.version("yadg")}
+        self._respond(HTTPStatus.OK, "application/json", json.dumps(status).encode())
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path != "/extract":
+            return self._error(HTTPStatus.NOT_FOUND, f"Unknown path {url.path!r}.")
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            return self._error(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.")
+        data = self.rfile.read(length)
+        if set(query) - OPTIONS:
+            unknown = sorted(set(query) - OPTIONS)
+            return self._error(HTTPStatus.BAD_REQUEST, f"Unknown options {unknown}.")
+        elif "filetype" not in query:
+            return self._error(HTTPStatus.BAD_REQUEST, "No filetype provided.")
+        elif ("path" in query) == (len(data) > 0):
+            return self._error(
+                HTTPStatus.BAD_REQUEST, "Provide either a path or the data to extract."
+            )
+        query["meta_only"] = query.get("meta_only", "false").lower() in {"1", "true"}
+        if "path" not in query:
+            query["data"] = data
+        elif self.server.root is None:
+            return self._error(
+                HTTPStatus.FORBIDDEN, "Extraction of files by path is not enabled."
+            )
+        else:
+            path = (self.server.root / query["path"]).resolve()
+            if not path.is_relative_to(self.server.root):
+                return self._error(
+                    HTTPStatus.FORBIDDEN, f"Path {query['path']!r} is not allowed."
+                )
+            query["filename"] = query["path"]
+            query["path"] = str(path)
+
+        pool = self.server.pool
+        try:
+            future = pool.submit(extract_request, **query)
+            ctype, body = future.result()
+        except BrokenProcessPool as e:
+            logger.error("A worker process has died, restarting the pool.")
+            _restart_pool(self.server, pool)
+            return self._error(
+                HTTPStatus.SERVICE_UNAVAILABLE, f"{type(e).__name__}: {e}"
+            )
+        except Exception as e:
+            logger.error("Extraction of %r failed: %s", query.get("path", "data"), e)
+            return self._error(
+                HTTPStatus.UNPROCESSABLE_ENTITY, f"{type(e).__name__}: {e}"
+            )
+        self._respond(HTTPStatus.OK, ctype, body)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """A threading HTTP server listening on a Unix socket."""
+
+    daemon_threads = True
+
+
+def _start_pool(jobs: int, preload: tuple[str]) -> ProcessPoolExecutor:
+    pool = ProcessPoolExecutor(
+        max_workers=jobs, initializer=_warm_up, initargs=(preload,)
+    )
+    # The worker processes are started on demand, so we start them upfront.
+    for future in [pool.submit(os.getpid) for _ in range(jobs)]:
+        future.result()
+    return pool
+
+
+def _restart_pool(server: socketserver.BaseServer, pool: ProcessPoolExecutor) -> None:
+    """Replaces the broken ``pool`` of the ``server``, unless already replaced."""
+    with server.pool_lock:
+        if server.pool is pool:
+            pool.shutdown(wait=False)
+            server.pool = _start_pool(*server.pool_args)
+
+
+def make_server(
+    host: str = "localhost",
+    port: int = 8000,
+    socket: str = None,
+    jobs: int = 1,
+    preload: list[str] = (),
+    root: str = None,
+) -> socketserver.BaseServer:
+    """
+    Creates the extraction server, along with its pool of worker processes.
+
+    The server is either listening on the ``host`` and ``port``, or on the Unix
+    ``socket`` if it is provided. Requests are handled concurrently, using a pool
+    of ``jobs`` worker processes, in which the extractors for the filetypes in
+    ``preload`` are imported upfront. The pool is available as the ``pool``
+    attribute of the returned server, and has to be shut down along with it.
+    Files can be extracted by path only if they are within the ``root`` folder.
+
+    """
+    if socket is not None:
+        server = UnixHTTPServer(socket, RequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), RequestHandler)
+    server.root = None if root is None else Path(root).resolve()
+    server.pool_args = (jobs, tuple(preload))
+    server.pool_lock = threading.Lock()
+    server.pool = _start_pool(*server.pool_args)
+    return server
+
+
+def serve(
+    host: str = "localhost",
+    port: int = 8000,
+    socket: str = None,
+    jobs: int = 1,
+    preload: list[str] = (),
+    root: str = None,
+) -> None:
+    """Runs the extraction server created by :func:`make_server` until interrupted."""
+    server = make_server(host, port, socket, jobs, preload, root)
+    address = socket if socket is not None else f"http://{host}:{server.server_port}"
+    logger.info("Serving yadg extraction requests on '%s'.", address)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.pool.shutdown()
+        if socket is not None:
+            os.unlink(socket)
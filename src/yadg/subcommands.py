@@ -1,14 +1,24 @@
 import os
+import sys
+import time
 import logging
 import json
-import yaml
 import shutil
 import hashlib
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from xarray import Dataset, DataTree
+from typing import TYPE_CHECKING
 
-from dgbowl_schemas.yadg import to_dataschema
-from yadg import core, dgutils, extractors
+from yadg import dgutils
+
+# The heavy dependencies are imported within the subcommands which need them, so
+# that e.g. ``yadg --version`` or ``yadg update`` start up quickly.
+if TYPE_CHECKING:
+    from xarray import DataTree
+    from yadg.dgutils.cacheutils import ExtractionCache
+    from yadg.dgutils.profutils import Profiler
 
 
 logger = logging.getLogger(__name__)
@@ -19,6 +29,8 @@ def _load_file(infile: str) -> dict:
         if infile.endswith("json"):
             obj = json.load(inf)
         elif infile.endswith("yml") or infile.endswith("yaml"):
+            import yaml
+
             obj = yaml.safe_load(inf)
         else:
             logging.critical("Filename type not recognised: '%s'", infile)
@@ -43,7 +55,9 @@ def _zip_file(folder: str, outpath: str, method: str = "zip") -> str:
     return fn, m.hexdigest()
 
 
-def _obj_to_meta_dict(dt: DataTree) -> dict:
+def _obj_to_meta_dict(dt: "DataTree") -> dict:
+    from xarray import Dataset, DataTree
+
     ret = {}
     for k, v in dt.to_dict().items():
         if isinstance(v, Dataset):
@@ -55,11 +69,57 @@ def _obj_to_meta_dict(dt: DataTree) -> dict:
     return ret
 
 
+def _get_cache(cache_dir: str, cache_size: int) -> "ExtractionCache | None":
+    if cache_dir is None:
+        return None
+    from yadg.dgutils.cacheutils import ExtractionCache, DEFAULT_CACHE_SIZE
+
+    max_size = DEFAULT_CACHE_SIZE if cache_size is None else cache_size * 2**20
+    cache = ExtractionCache(cache_dir or None, max_size=max_size)
+    logger.info("Using extraction cache in '%s'.", cache.path)
+    return cache
+
+
+def _get_previous(outfile: str, update: bool) -> "DataTree | None":
+    if not update or not os.path.exists(outfile):
+        return None
+    from xarray import load_datatree
+
+    logger.info("Updating existing datatree in '%s'.", outfile)
+    # The previous datatree is loaded into memory and the file is closed, as the
+    # outfile is replaced once the updated datatree is written.
+    return load_datatree(outfile, engine="h5netcdf")
+
+
+def _get_profiler(
+    profile: str, profile_attrs: bool, profile_tracemalloc: bool
+) -> "Profiler | None":
+    if profile is None and not profile_attrs:
+        return None
+    from yadg.dgutils.profutils import Profiler
+
+    return Profiler(tracemalloc=profile_tracemalloc)
+
+
+def _profile_attrs(profiler: "Profiler | None", profile_attrs: bool) -> dict:
+    if profiler is None or not profile_attrs:
+        return {}
+    return {"yadg_profile": json.dumps(profiler.summary())}
+
+
 def process(
     *,
     infile: str,
     outfile: str,
     ignore_merge_errors: bool,
+    jobs: int = 1,
+    stream: bool = False,
+    cache_dir: str = None,
+    cache_size: int = None,
+    update: bool = False,
+    profile: str = None,
+    profile_attrs: bool = False,
+    profile_tracemalloc: bool = False,
     **kwargs: dict,
 ) -> None:
     """
@@ -70,24 +130,80 @@ def process(
     this is successful, the datatree is written out into ``outfile`` (which is
     ``"datagram.nc"`` by default).
 
+    The files within each step can be extracted in parallel by setting ``jobs``. If
+    ``stream`` is set, the data are appended into ``outfile`` as each file is
+    processed, instead of building the whole datatree in memory first.
+
+    If ``cache_dir`` is set, the extracted files are stored in a persistent cache in
+    that folder, limited to ``cache_size`` MB, so that only new or modified files are
+    extracted when the dataschema is processed again. An empty ``cache_dir`` selects
+    the default location, see :func:`yadg.dgutils.cacheutils.default_cache_dir`.
+
+    If ``update`` is set and ``outfile`` already exists, only the files which have
+    not been processed into ``outfile`` yet are extracted and appended to its data.
+
+    If ``profile`` is set, the timings and the peak memory use of the stages of the
+    processing are written into the ``profile`` file, in the Chrome trace format. A
+    summary of the profile is stored in the datagram if ``profile_attrs`` is set,
+    and the memory allocated by Python is traced if ``profile_tracemalloc`` is set.
+    See :class:`yadg.dgutils.profutils.Profiler` for details.
+
     """
     assert os.path.exists(infile) and os.path.isfile(infile), (
         f"Supplied dataschema filename '{infile}' does not exist "
         "or is not a valid file."
     )
 
+    from dgbowl_schemas.yadg import to_dataschema
+    from yadg import core
+
     logger.info(f"Reading input file from '{infile}'.")
     schema = _load_file(infile)
 
     logger.info("Loading dataschema.")
     inobj = to_dataschema(**schema)
     ds = dgutils.update_schema(inobj)
+    cache = _get_cache(cache_dir, cache_size)
+    previous = _get_previous(outfile, update)
+    profiler = _get_profiler(profile, profile_attrs, profile_tracemalloc)
+
+    if stream:
+        logger.info("Streaming dataschema into '%s'.", outfile)
+        core.stream_schema(
+            ds,
+            outfile,
+            strict_merge=not ignore_merge_errors,
+            jobs=jobs,
+            cache=cache,
+            previous=previous,
+            profiler=profiler,
+        )
+        attrs = _profile_attrs(profiler, profile_attrs)
+        if len(attrs) > 0:
+            import h5netcdf
+
+            with h5netcdf.File(outfile, mode="a") as nc:
+                nc.attrs.update(attrs)
+        if profile is not None:
+            profiler.dump(profile)
+        return
 
     logger.debug("Processing dataschema")
-    datagram = core.process_schema(ds, strict_merge=not ignore_merge_errors)
+    datagram = core.process_schema(
+        ds,
+        strict_merge=not ignore_merge_errors,
+        jobs=jobs,
+        cache=cache,
+        previous=previous,
+        profiler=profiler,
+    )
 
     logger.info("Saving datatree to '%s'.", outfile)
-    datagram.to_netcdf(outfile, engine="h5netcdf")
+    datagram.attrs.update(_profile_attrs(profiler, profile_attrs))
+    with dgutils.profile_stage(profiler, "to_netcdf"):
+        datagram.to_netcdf(outfile, engine="h5netcdf")
+    if profile is not None:
+        profiler.dump(profile)
 
 
 def update(
@@ -132,6 +248,14 @@ def preset(
     archive: bool,
     packwith: str,
     ignore_merge_errors: bool,
+    jobs: int = 1,
+    stream: bool = False,
+    cache_dir: str = None,
+    cache_size: int = None,
+    update: bool = False,
+    profile: str = None,
+    profile_attrs: bool = False,
+    profile_tracemalloc: bool = False,
     **kwargs: dict,
 ) -> None:
     """
@@ -149,6 +273,13 @@ def preset(
     Additionally, the contents of the ``folder`` can be archived (if ``archive`` is
     set), using a compression algorithm of your choice.
 
+    The files within each step can be extracted in parallel by setting ``jobs``, and
+    the datatree can be written out incrementally by setting ``stream``. The
+    extraction cache is configured using ``cache_dir`` and ``cache_size``, an
+    existing ``outfile`` is updated if ``update`` is set, and the processing is
+    profiled using ``profile``, ``profile_attrs`` and ``profile_tracemalloc``, as
+    in :func:`process`.
+
     """
     assert os.path.exists(folder) and os.path.isdir(folder), (
         f"Supplied folder path '{folder}' does not exist or is not a valid folder."
@@ -164,6 +295,8 @@ def preset(
         f"Supplied preset path '{preset}' does not exist or is not a valid file."
     )
 
+    from dgbowl_schemas.yadg import to_dataschema
+
     logger.info("Reading input file from '%s'.", preset)
     preset = _load_file(preset)
 
@@ -175,17 +308,52 @@ def preset(
 
     logger.info("Loaded dataschema version '%s'", ds.version)
     if process:
-        logger.info("Processing created schema.")
-        datagram = core.process_schema(ds, strict_merge=not ignore_merge_errors)
+        from yadg import core
+
         outfile = "datagram.nc" if outfile is None else outfile
+        cache = _get_cache(cache_dir, cache_size)
+        previous = _get_previous(outfile, update)
+        profiler = _get_profiler(profile, profile_attrs, profile_tracemalloc)
+        if stream:
+            logger.info("Streaming created schema into '%s'.", outfile)
+            core.stream_schema(
+                ds,
+                outfile,
+                strict_merge=not ignore_merge_errors,
+                jobs=jobs,
+                cache=cache,
+                previous=previous,
+                profiler=profiler,
+            )
+        else:
+            logger.info("Processing created schema.")
+            datagram = core.process_schema(
+                ds,
+                strict_merge=not ignore_merge_errors,
+                jobs=jobs,
+                cache=cache,
+                previous=previous,
+                profiler=profiler,
+            )
+        attrs = _profile_attrs(profiler, profile_attrs)
         if archive:
-            zipfile = outfile.replace(".nc", "")
-            logger.info("Zipping input folder into '%s'", zipfile)
-            fn, hash = _zip_file(folder, zipfile, method=packwith)
-            datagram.attrs["data_archive_sha-1"] = hash
-            datagram.attrs["data_archive_path"] = fn
-        logger.info("Saving datagram to '%s'.", outfile)
-        datagram.to_netcdf(outfile, engine="h5netcdf")
+            zippath = outfile.replace(".nc", "")
+            logger.info("Zipping input folder into '%s'", zippath)
+            fn, hash = _zip_file(folder, zippath, method=packwith)
+            attrs.update({"data_archive_sha-1": hash, "data_archive_path": fn})
+        if not stream:
+            datagram.attrs.update(attrs)
+        elif len(attrs) > 0:
+            import h5netcdf
+
+            with h5netcdf.File(outfile, mode="a") as nc:
+                nc.attrs.update(attrs)
+        if not stream:
+            logger.info("Saving datagram to '%s'.", outfile)
+            with dgutils.profile_stage(profiler, "to_netcdf"):
+                datagram.to_netcdf(outfile, engine="h5netcdf")
+        if profile is not None:
+            profiler.dump(profile)
     else:
         if archive:
             logger.warning(
@@ -198,12 +366,143 @@ def preset(
             json.dump(ds.model_dump(), ofile, indent=1)
 
 
+def _write_extracted(ret: "DataTree", outpath: Path, meta_only: bool) -> None:
+    if meta_only:
+        meta = _obj_to_meta_dict(ret)
+        with outpath.open("w", encoding="UTF-8") as target:
+            json.dump(meta, target)
+    else:
+        ret.to_netcdf(outpath, engine="h5netcdf")
+
+
+def _extract_batch_file(
+    infile: str,
+    outpath: Path,
+    extractor,
+    meta_only: bool,
+    ignore_merge_errors: bool,
+) -> dict:
+    """
+    Extracts a single file in the batch mode of :func:`extract`, returning its entry
+    in the summary.
+
+    """
+    from yadg import extractors
+
+    start = time.perf_counter()
+    entry = {"infile": infile, "outfile": str(outpath)}
+    try:
+        path = Path(infile)
+        if path.suffix == ".zip" and zipfile.is_zipfile(path):
+            ret = extractors.extract_from_zip(
+                path, extractor, ignore_merge_errors=ignore_merge_errors
+            )
+        else:
+            ret = extractors.extract_from_path(path, extractor)
+        _write_extracted(ret, outpath, meta_only)
+        entry["status"] = "ok"
+    except Exception as e:
+        logger.error("Extracting file '%s' failed: %s", infile, e)
+        entry["status"] = "failed"
+        entry["error"] = f"{type(e).__name__}: {e}"
+    entry["time"] = time.perf_counter() - start
+    return entry
+
+
+def _read_batch(batch: str) -> list[str]:
+    infiles = []
+    with open(batch, "r") as inf:
+        for line in inf:
+            line = line.strip()
+            if line != "" and not line.startswith("#"):
+                infiles.append(line)
+    return infiles
+
+
+def extract_batch(
+    *,
+    filetype: str,
+    batch: str,
+    out_dir: str = None,
+    meta_only: bool = False,
+    jobs: int = 1,
+    locale: str = None,
+    encoding: str = None,
+    timezone: str = None,
+    suffix: str = None,
+    ignore_merge_errors: bool = False,
+) -> list[dict]:
+    """
+    The batch mode of the ``extract`` subcommand of yadg.
+
+    Extracts all files listed in the ``batch`` file, one path per line, using a single
+    extractor object. Empty lines and lines starting with ``#`` are skipped. Each
+    file is stored in the ``out_dir`` folder, using the stem of the file with a ``.nc``
+    suffix (or ``.json`` if ``meta_only`` is set). The files can be extracted in
+    parallel by setting ``jobs``, in which case each worker process is reused for
+    many files.
+
+    A summary containing the timings and failures of each file is stored in
+    ``yadg_extract_summary.json`` in the ``out_dir``, and the list of files in the
+    summary is returned. Failed files do not stop the processing of the remaining
+    files.
+
+    """
+    from yadg import extractors
+
+    infiles = _read_batch(batch)
+    outdir = Path(".") if out_dir is None else Path(out_dir)
+    outdir.mkdir(parents=True, exist_ok=True)
+    outpaths = [
+        outdir / Path(fn).with_suffix(".json" if meta_only else ".nc").name
+        for fn in infiles
+    ]
+    if len(set(outpaths)) != len(outpaths):
+        raise RuntimeError(
+            f"Files listed in '{batch}' would be extracted into the same outfile. "
+            "Please make sure the stems of the listed files are unique."
+        )
+
+    extractor = extractors.get_extractor(filetype, timezone, encoding, locale, suffix)
+    args = (repeat(extractor), repeat(meta_only), repeat(ignore_merge_errors))
+    start = time.perf_counter()
+    if jobs is None or jobs < 2 or len(infiles) < 2:
+        files = list(map(_extract_batch_file, infiles, outpaths, *args))
+    else:
+        logger.info(f"Using a pool of {jobs} worker processes.")
+        chunksize = max(1, len(infiles) // (4 * jobs))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            files = list(
+                pool.map(
+                    _extract_batch_file, infiles, outpaths, *args, chunksize=chunksize
+                )
+            )
+
+    failed = sum(entry["status"] != "ok" for entry in files)
+    if failed > 0:
+        logger.warning("Failed to extract %d out of %d files.", failed, len(files))
+    summary = {
+        "filetype": filetype,
+        "jobs": jobs,
+        "time": time.perf_counter() - start,
+        "n_files": len(files),
+        "n_failed": failed,
+        "files": files,
+    }
+    with (outdir / "yadg_extract_summary.json").open("w", encoding="UTF-8") as out:
+        json.dump(summary, out, indent=1)
+    return files
+
+
 def extract(
     *,
     filetype: str,
     infile: str,
     outfile: str,
     meta_only: bool,
+    batch: str = None,
+    out_dir: str = None,
+    jobs: int = 1,
     **kwargs: dict,
 ) -> None:
     """
@@ -219,7 +518,37 @@ def extract(
     Optionally, an export of just the metadata can be requested by setting the
     ``meta_only`` argument, in this case the output is a json file.
 
+    If the ``infile`` is a zip file, the files within it are extracted using ``jobs``
+    worker processes, see :func:`yadg.extractors.extract_from_zip`.
+
+    Alternatively, a ``batch`` file listing many files can be supplied instead of the
+    ``infile``. The files are then processed by :func:`extract_batch` into the
+    ``out_dir``, using ``jobs`` worker processes. If any of the files fails to be
+    extracted, yadg exits with a nonzero exit code once all files are processed.
+
     """
+    if batch is not None:
+        assert infile is None, "Supply either an infile or a --batch file, not both."
+        keys = {"locale", "encoding", "timezone", "suffix", "ignore_merge_errors"}
+        files = extract_batch(
+            filetype=filetype,
+            batch=batch,
+            out_dir=out_dir,
+            meta_only=meta_only,
+            jobs=jobs,
+            **{k: v for k, v in kwargs.items() if k in keys},
+        )
+        failed = sum(entry["status"] != "ok" for entry in files)
+        if failed > 0:
+            sys.exit(
+                f"Failed to extract {failed} out of {len(files)} files listed in "
+                f"'{batch}', see 'yadg_extract_summary.json' for details."
+            )
+        return
+
+    assert infile is not None, "Supply either an infile or a --batch file."
+    from yadg import extractors
+
     path = Path(infile)
 
     assert path.is_file(), (
@@ -231,10 +560,31 @@ def extract(
     else:
         outpath = Path(outfile)
 
-    ret = extractors.extract(filetype, path, **kwargs)
-    if meta_only:
-        meta = _obj_to_meta_dict(ret)
-        with outpath.open("w", encoding="UTF-8") as target:
-            json.dump(meta, target)
-    else:
-        ret.to_netcdf(outpath, engine="h5netcdf")
+    ret = extractors.extract(filetype, path, jobs=jobs, **kwargs)
+    _write_extracted(ret, outpath, meta_only)
+
+
+def serve(
+    *,
+    host: str = "localhost",
+    port: int = 8000,
+    socket: str = None,
+    jobs: int = 1,
+    preload: list[str] = None,
+    root: str = None,
+    **kwargs: dict,
+) -> None:
+    """
+    The ``serve`` subcommand of yadg.
+
+    Starts a long-running extraction service, accepting requests over HTTP on the
+    ``host`` and ``port``, or on a Unix ``socket``. The requests are processed by a
+    pool of ``jobs`` worker processes, which are kept warm between requests. The
+    extractors for the filetypes listed in ``preload`` are imported upfront. Files
+    can be extracted by path only if ``root`` is set, and only within that folder.
+    See :mod:`yadg.server` for a description of the API.
+
+    """
+    from yadg import server
+
+    server.serve(host, port, socket, jobs, [] if preload is None else preload, root)
@@ -0,0 +1,50 @@
+import numpy as np
+import xarray as xr
+from pathlib import Path
+from yadg.dgutils import read_blocks, map_file
+from yadg.dgutils.btools import BlockArray, lazy_array
+
+
+def make_blocks(tmpdir) -> tuple[Path, np.ndarray]:
+    # 10 records of a 4-byte header followed by 3 floats, after a 7-byte preamble.
+    dtype = np.dtype([("head", "<u4"), ("vals", "<f4", 3)])
+    records = np.zeros(10, dtype=dtype)
+    records["head"] = np.arange(10)
+    records["vals"] = np.arange(30).reshape(10, 3) * 0.5
+    path = Path(tmpdir) / "blocks.bin"
+    path.write_bytes(b"PREAMBL" + records.tobytes())
+    return path, records
+
+
+def test_read_blocks(tmpdir):
+    path, records = make_blocks(tmpdir)
+    data = path.read_bytes()
+    ret = read_blocks(data, 11, 16, 10, "<f4", 3)
+    assert np.array_equal(ret, records["vals"])
+    assert read_blocks(data, 11, 16, 0, "<f4", 3).shape == (0, 3)
+
+
+def test_block_array(tmpdir):
+    path, records = make_blocks(tmpdir)
+    array = BlockArray(path, 11, 16, 10, "<f4", 3, func=lambda v, rows: v * 2)
+    assert array.shape == (10, 3)
+    var = xr.Variable(("uts", "mass"), lazy_array(array))
+    assert isinstance(var._data, xr.core.indexing.LazilyIndexedArray)
+    ref = records["vals"] * 2
+    assert np.array_equal(var[2:8:3, 1:].values, ref[2:8:3, 1:])
+    assert np.array_equal(var[::-2, 0].values, ref[::-2, 0])
+    assert np.array_equal(var[4].values, ref[4])
+    assert var[5:5].shape == (0, 3)
+    assert np.array_equal(var.values, ref)
+
+
+def test_map_file(tmpdir):
+    path, records = make_blocks(tmpdir)
+    with map_file(path) as contents:
+        ret = read_blocks(contents, 7, 16, 10, "<u4")
+    assert contents.closed
+    assert np.array_equal(ret[:, 0], records["head"])
+    empty = Path(tmpdir) / "empty.bin"
+    empty.touch()
+    with map_file(empty) as contents:
+        assert contents == b""
@@ -0,0 +1,94 @@
+import os
+import numpy as np
+import xarray as xr
+from pathlib import Path
+from dgbowl_schemas.yadg.dataschema import ExtractorFactory
+from yadg.dgutils.cacheutils import ExtractionCache
+from yadg.extractors import extract_from_path
+from .utils import compare_datatrees
+
+
+def make_extractor(**kwargs):
+    return ExtractorFactory(
+        extractor={
+            "filetype": "basic.csv",
+            "timezone": "UTC",
+            "locale": "en_GB",
+            "encoding": "UTF-8",
+            **kwargs,
+        }
+    ).extractor
+
+
+def make_datatree(npoints: int) -> xr.DataTree:
+    ds = xr.Dataset(
+        data_vars={"value": ("uts", np.random.random(npoints))},
+        coords={"uts": np.arange(npoints, dtype=float)},
+    )
+    return xr.DataTree(ds)
+
+
+def test_cache_key(tmpdir, monkeypatch):
+    os.chdir(tmpdir)
+    cache = ExtractionCache("cache")
+    with open("data.csv", "w") as out:
+        out.write("uts,value\n0,1.0\n1,2.0\n")
+    key = cache.key(Path("data.csv"), make_extractor())
+    assert key == cache.key(Path("data.csv"), make_extractor())
+    assert key != cache.key(Path("data.csv"), make_extractor(locale="de_DE"))
+    with open("data.csv", "a") as out:
+        out.write("2,3.0\n")
+    assert key != cache.key(Path("data.csv"), make_extractor())
+    key = cache.key(Path("data.csv"), make_extractor())
+    # Modifying the sources of yadg should invalidate the entries.
+    monkeypatch.setattr(
+        "yadg.dgutils.cacheutils.source_fingerprint", lambda filetype: "modified"
+    )
+    assert key != cache.key(Path("data.csv"), make_extractor())
+
+
+def test_cache_extract_from_path(tmpdir):
+    os.chdir(tmpdir)
+    cache = ExtractionCache("cache")
+    with open("data.csv", "w") as out:
+        out.write("uts,value\n0,1.0\n1,2.0\n")
+    ref = extract_from_path(Path("data.csv"), make_extractor())
+    miss = extract_from_path(Path("data.csv"), make_extractor(), cache=cache)
+    key = cache.key(Path("data.csv"), make_extractor())
+    assert cache.get(key) is not None
+    hit = extract_from_path(Path("data.csv"), make_extractor(), cache=cache)
+    for ret in (miss, hit):
+        compare_datatrees(ret, ref, thislevel=True, descend=True)
+    assert hit["uts"].encoding == {}
+
+
+def test_cache_refresh_metadata(tmpdir, monkeypatch):
+    os.chdir(tmpdir)
+    cache = ExtractionCache("cache")
+    with open("data.csv", "w") as out:
+        out.write("uts,value\n0,1.0\n1,2.0\n")
+    monkeypatch.setattr("sys.argv", ["yadg", "process", "first.json"])
+    extract_from_path(Path("data.csv"), make_extractor(), cache=cache)
+    monkeypatch.setattr("sys.argv", ["yadg", "process", "second.json"])
+    hit = extract_from_path(Path("data.csv"), make_extractor(), cache=cache)
+    assert hit.attrs["yadg_command"] == "yadg process second.json"
+
+
+def test_cache_eviction(tmpdir):
+    os.chdir(tmpdir)
+    cache = ExtractionCache("cache")
+    for key in ["a", "b", "c"]:
+        cache.put(key, make_datatree(10000))
+    size = sum(fn.stat().st_size for fn in Path("cache").glob("*.nc"))
+    assert cache.get("a") is not None
+
+    # Shrinking the cache should evict "b", i.e. the least recently used entry.
+    cache.max_size = size * 2 // 3 + 1
+    cache.evict()
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+    cache.clear()
+    assert cache.get("a") is None
+    assert len(list(Path("cache").glob("*.nc"))) == 0
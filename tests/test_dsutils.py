@@ -0,0 +1,117 @@
+import pytest
+import numpy as np
+import xarray as xr
+from yadg.dgutils import merge_dicttrees, concat_dicttrees
+from yadg.dgutils import append_dicts, dicts_to_dataset, DatasetBuilder
+
+
+def make_dicttree(i: int, npoints: int = 5, **attrs) -> dict:
+    uts = np.arange(npoints, dtype=float) + i * npoints
+    ds = xr.Dataset(
+        data_vars={
+            "value": ("uts", np.random.default_rng(i).random(npoints), {"units": "K"}),
+            "value_uncertainty": ((), 0.1),
+        },
+        coords={"uts": uts},
+        attrs=dict(original_metadata="{}", **attrs),
+    )
+    return {"/": xr.Dataset(attrs={"yadg_provenance": "yadg extract"}), "/a": ds}
+
+
+@pytest.mark.parametrize("strict_merge", [True, False])
+def test_concat_dicttrees_matches_merge_dicttrees(strict_merge):
+    ref = None
+    for i in range(10):
+        ref = merge_dicttrees(ref, make_dicttree(i), strict_merge)
+    ret = concat_dicttrees([make_dicttree(i) for i in range(10)], strict_merge)
+    assert ret.keys() == ref.keys()
+    for k in ref:
+        xr.testing.assert_identical(ret[k], ref[k])
+
+
+def test_concat_dicttrees_drop_conflicts():
+    dicttrees = [make_dicttree(i, technique=f"T{i % 2}") for i in range(4)]
+    ret = concat_dicttrees(dicttrees, strict_merge=False)
+    assert "technique" not in ret["/a"].attrs
+    assert ret["/a"].uts.size == 20
+
+
+@pytest.mark.parametrize(
+    "techniques, expected",
+    [
+        (["T0", "T1", "T0"], "T0"),
+        (["T0", "T1", "T1"], "T1"),
+        (["T0", "T0", "T1"], None),
+    ],
+)
+def test_concat_dicttrees_drop_conflicts_readded(techniques, expected):
+    dicttrees = [make_dicttree(i, technique=t) for i, t in enumerate(techniques)]
+    # The reference is the pairwise merge with "drop_conflicts" used by yadg-7.0.
+    ref = dicttrees[0]["/a"]
+    for fvals in dicttrees[1:]:
+        ref = xr.concat(
+            [ref, fvals["/a"]],
+            dim="uts",
+            data_vars="different",
+            compat="equals",
+            join="outer",
+            combine_attrs="drop_conflicts",
+        )
+    ret = concat_dicttrees(dicttrees, strict_merge=False)
+    xr.testing.assert_identical(ret["/a"], ref)
+    assert ret["/a"].attrs.get("technique") == expected
+
+
+def test_concat_dicttrees_strict_raises():
+    def generate():
+        yield make_dicttree(0, technique="T0")
+        yield make_dicttree(1, technique="T1")
+        raise AssertionError("Merge conflict should be detected before this point.")
+
+    with pytest.raises(RuntimeError, match="Merging metadata from multiple files"):
+        concat_dicttrees(generate(), strict_merge=True)
+
+
+def test_concat_dicttrees_empty():
+    assert concat_dicttrees([], strict_merge=True) is None
+
+
+def make_rows(nrows: int) -> list[tuple[dict, dict]]:
+    rng = np.random.default_rng(nrows)
+    columns = {
+        "float": lambda: float(rng.random()),
+        "int": lambda: int(rng.integers(5)),
+        "str": lambda: str(rng.choice(["a", "b"])),
+        "bool": lambda: bool(rng.random() < 0.5),
+        "float32": lambda: np.float32(rng.random()),
+        "mixed": lambda: [1, 2.5][rng.integers(2)],
+        "strint": lambda: [1, "s"][rng.integers(2)],
+    }
+    rows = []
+    for i in range(nrows):
+        vals = {"uts": float(i)}
+        devs = {}
+        for k, gen in columns.items():
+            # Values are missing at random, and some columns appear only later.
+            if rng.random() < 0.8 and (k != "int" or i > 3):
+                vals[k] = gen()
+        if "float" in vals:
+            devs["float"] = [0.1, 0.1, 0.2][rng.integers(3)]
+        if "int" in vals:
+            devs["int"] = 0.5
+        rows.append((vals, devs))
+    return rows
+
+
+@pytest.mark.parametrize("nrows", [1, 5, 50, 500])
+def test_dataset_builder(nrows):
+    data, meta = {}, {}
+    builder = DatasetBuilder()
+    for i, (vals, devs) in enumerate(make_rows(nrows)):
+        append_dicts(vals, devs, data, meta, i)
+        builder.append(vals, devs)
+    ref = dicts_to_dataset(data, meta, units={"float": "K"}, fulldate=False)
+    ret = builder.to_dataset(units={"float": "K"}, fulldate=False)
+    assert ret.identical(ref)
+    for k, v in ref.variables.items():
+        assert ret[k].dtype == v.dtype
@@ -1,6 +1,8 @@
 import pytest
 import os
+import json
 import pickle
+from yadg.dgutils.dateutils import timestamps_from_file, _load_timestamps
 from .utils import compare_datatrees, datagram_from_file
 
 
@@ -26,3 +28,28 @@ def test_externaldate_dataschema(infile, datadir):
     with open(outfile, "wb") as out:
         pickle.dump(ret, out, 5)
     compare_datatrees(ret, ref)
+
+
+def test_timestamps_from_file_cache(tmpdir):
+    os.chdir(tmpdir)
+    _load_timestamps.cache_clear()
+    with open("ts.json", "w") as out:
+        json.dump(
+            {"ts": ["2021-06-01T14:30:25Z", 1622557826.5, "2021-06-01 16:30:27"]}, out
+        )
+    ret = timestamps_from_file("ts.json", "json", "ts", "Europe/Berlin")
+    assert ret.tolist() == [1622557825.0, 1622557826.5, 1622557827.0]
+    # The cached array cannot be modified through the returned copy.
+    ret[0] = 0.0
+    again = timestamps_from_file("ts.json", "json", "ts", "Europe/Berlin")
+    assert again[0] == 1622557825.0
+    assert _load_timestamps.cache_info().hits == 1
+    # A different timezone or a modified file are parsed again.
+    timestamps_from_file("ts.json", "json", "ts", "UTC")
+    assert _load_timestamps.cache_info().misses == 2
+    with open("ts.json", "w") as out:
+        json.dump({"ts": ["2021-06-01T14:30:25Z"]}, out)
+    os.utime("ts.json", (0, 1e9))
+    ret = timestamps_from_file("ts.json", "json", "ts", "Europe/Berlin")
+    assert ret.tolist() == [1622557825.0]
+    assert _load_timestamps.cache_info().misses == 3
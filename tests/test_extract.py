@@ -1,7 +1,9 @@
 import pytest
+import numpy as np
 import os
+import io
 from dgbowl_schemas.yadg.dataschema import ExtractorFactory
-from yadg.extractors import extract, extract_from_bytes
+from yadg.extractors import extract, extract_from_bytes, extract_from_path
 import xarray as xr
 from pathlib import Path
 from .utils import compare_datatrees
@@ -54,3 +56,148 @@ def test_yadg_extractors_extract_from_bytes(datadir):
     ret = extract_from_bytes(source=source, extractor=extractor)
     ref = xr.open_datatree("cp.mpr.nc", engine="h5netcdf")
     compare_datatrees(ret, ref, thislevel=True, descend=True)
+
+
+@pytest.mark.parametrize(
+    "filetype, infile",
+    [
+        ("eclab.mpr", "cp.mpr"),
+        ("eclab.mpt", "cp.mpt"),
+        ("agilent.ch", "hplc.CH"),
+        ("phi.spe", "xps.spe"),
+        ("panalytical.xrdml", "xrd.xrdml"),
+        ("touchstone.snp", "picovna.s1p"),
+        ("ezchrom.asc", "230324.dat.asc"),
+        ("ezchrom.dat", "230324.dat"),
+        ("picolog.tc08", "20220723-porosity-study-15p-Cu-200mA-longrun-07.picolog"),
+    ],
+)
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview, io.BytesIO])
+def test_yadg_extractors_extract_from_buffer(filetype, infile, wrap, datadir):
+    """All extractors accept bytes, buffers, and binary file-like objects."""
+    os.chdir(datadir)
+    extractor = ExtractorFactory(
+        extractor={
+            "filetype": filetype,
+            "timezone": "Europe/Berlin",
+            "locale": "en_GB",
+        }
+    ).extractor
+    with open(infile, "rb") as f:
+        source = wrap(f.read())
+    ret = extract_from_bytes(source=source, extractor=extractor)
+    ref = xr.open_datatree(f"{infile}.nc", engine="h5netcdf")
+    compare_datatrees(ret, ref, thislevel=True, descend=True)
+
+
+@pytest.mark.parametrize(
+    "filetype, infile, kwargs",
+    [
+        (
+            "agilent.ch",
+            "test_x_agilent_ch/extracted-3487d194-9155-4f79-8f11-dbd18ce53187.CH",
+            {},
+        ),
+        ("agilent.csv", "test_x_agilent_csv/CHROMTAB.CSV", {}),
+        (
+            "basic.csv",
+            "test_x_basic_csv/case_timestamp.ssv",
+            {"parameters": {"sep": ";", "units": {"flow": "ml/min", "T": "K"}}},
+        ),
+        ("drycal.csv", "test_x_drycal_csv/20211011_DryCal_out.csv", {}),
+        ("drycal.rtf", "test_x_drycal_rtf/Cp_100mA_1mindelay.rtf", {}),
+        ("drycal.txt", "test_x_drycal_txt/20211011_DryCal_out.txt", {}),
+        ("eclab.mpr", "test_x_eclab/bcd.issue_241.mpr", {}),
+        (
+            "eclab.mpt",
+            "test_x_eclab/bcd.issue_241.mpt",
+            {"encoding": "windows-1252"},
+        ),
+        ("empalc.csv", "test_x_empalc_csv/Cu-20p_v2.csv", {}),
+        ("empalc.xlsx", "test_x_empalc_xlsx/Cu-25p_v2.xlsx", {}),
+        ("ezchrom.asc", "test_x_ezchrom_asc/2023-06-29-007.dat.asc", {}),
+        ("ezchrom.dat", "test_x_ezchrom_dat/2023-06-29-007.dat", {}),
+        ("fhimcpt.csv", "test_x_fhimcpt_csv/measurement.csv", {}),
+        ("fhimcpt.vna", "test_x_fhimcpt_vna/2019-12-03-09-01-24.csv", {}),
+        (
+            "fusion.csv",
+            "test_x_fusion_csv/20220608-porosity-study-15p-Cu-10mA-GC.csv",
+            {},
+        ),
+        (
+            "fusion.json",
+            "test_x_fusion_json/15p-Cu-10mA-01 - Jun 08 2022, 16;10.fusion-data",
+            {},
+        ),
+        ("panalytical.csv", "test_x_panalytical_csv/210520step1_30min.csv", {}),
+        ("panalytical.xrdml", "test_x_panalytical_xrdml/210520step1_30min.xrdml", {}),
+        ("panalytical.xy", "test_x_panalytical_xy/210520step1_30min.xy", {}),
+        ("phi.spe", "test_x_phi_spe/test0.spe", {}),
+        (
+            "picolog.tc08",
+            "test_x_picolog_tc08/20230917-16-S07-temperature.picolog",
+            {},
+        ),
+        ("quadstar.sac", "test_x_quadstar_sac/airdemo.sac", {}),
+        (
+            "tomato.json",
+            "test_x_tomato_json/MPG2_2022-04-20T213025.275348+0000_data.json",
+            {},
+        ),
+        ("touchstone.snp", "test_x_touchstone_snp/Device_r_40um.s1p", {}),
+        ("yadg.json", "test_x_yadg_json/ds.4.2.dg.json", {}),
+    ],
+)
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview, io.BytesIO])
+def test_yadg_extractors_extract_from_buffer_all(filetype, infile, kwargs, wrap):
+    """Every extractor gives the same results for all kinds of buffers as for paths."""
+    path = Path(__file__).parent / infile
+    extractor = ExtractorFactory(
+        extractor={
+            "filetype": filetype,
+            "timezone": "Europe/Berlin",
+            "locale": "en_GB",
+            "encoding": "utf-8",
+            **kwargs,
+        }
+    ).extractor
+    ref = extract_from_path(path, extractor)
+    ret = extract_from_bytes(source=wrap(path.read_bytes()), extractor=extractor)
+    for dt in (ret, ref):
+        for k in ["yadg_extract_date", "yadg_extract_filename"]:
+            dt.attrs.pop(k, None)
+    assert ret.identical(ref)
+
+
+@pytest.mark.parametrize(
+    "filetype, infile",
+    [
+        ("eclab.mpr", "cp.mpr"),
+        ("agilent.ch", "hplc.CH"),
+        ("phi.spe", "xps.spe"),
+    ],
+)
+def test_yadg_extractors_extract_lazy(filetype, infile, datadir):
+    os.chdir(datadir)
+    ref = extract(filetype=filetype, path=infile, timezone="Europe/Berlin")
+    ret = extract(filetype=filetype, path=infile, timezone="Europe/Berlin", lazy=True)
+    for node in ret.subtree:
+        lazy = [
+            k
+            for k, v in node.ds.data_vars.items()
+            if isinstance(v.variable._data, xr.core.indexing.LazilyIndexedArray)
+        ]
+        assert len(lazy) > 0 or len(node.ds.data_vars) == 0
+        dim = "uts" if "uts" in node.ds.dims else next(iter(node.ds.dims), None)
+        if dim is not None:
+            part = node.ds.isel({dim: slice(1, None, 3)})
+            assert part.identical(ref[node.path].ds.isel({dim: slice(1, None, 3)}))
+    assert ret.load().identical(ref)
+
+
+def test_yadg_extractors_extract_lazy_unsupported(datadir, caplog):
+    os.chdir(datadir)
+    ret = extract(filetype="eclab.mpt", path="cp.mpt", lazy=True)
+    assert "The lazy mode is not supported" in caplog.text
+    for v in ret.ds.data_vars.values():
+        assert isinstance(v.variable._data, np.ndarray)
@@ -1,5 +1,6 @@
 import pytest
 import os
+import zipfile
 import xarray as xr
 from pathlib import Path
 from yadg.extractors import extract
@@ -15,7 +16,8 @@ from .utils import compare_datatrees
         ("eclab.mpr", "eclab-mpr.zip", True, None),
     ],
 )
-def test_extract_from_zip(filetype, infile, ignore, suffix, datadir):
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_extract_from_zip(filetype, infile, ignore, suffix, jobs, datadir):
     os.chdir(datadir)
     ret = extract(
         filetype=filetype,
@@ -24,8 +26,37 @@ def test_extract_from_zip(filetype, infile, ignore, suffix, datadir):
         timezone="Europe/Berlin",
         ignore_merge_errors=ignore,
         suffix=suffix,
+        jobs=jobs,
     )
     outfile = f"{infile}.nc"
     ret.to_netcdf(f"{outfile}.tmp", engine="h5netcdf")
     ref = xr.open_datatree(outfile, engine="h5netcdf")
     compare_datatrees(ret, ref, thislevel=True, descend=True)
+
+
+def test_extract_from_zip_members(datadir, monkeypatch):
+    """Only the matching top-level members are read from the archive."""
+    os.chdir(datadir)
+    with (
+        zipfile.ZipFile("ezchrom-asc.zip") as src,
+        zipfile.ZipFile("mixed.zip", "w") as zf,
+    ):
+        names = sorted(src.namelist())
+        zf.writestr(names[0], src.read(names[0]))
+        zf.writestr(f"subdir/{names[1]}", src.read(names[1]))
+        zf.writestr("notes.txt", "not an ezchrom file")
+
+    opened = []
+    zipopen = zipfile.ZipFile.open
+
+    def spy(self, name, *args, **kwargs):
+        opened.append(name)
+        return zipopen(self, name, *args, **kwargs)
+
+    monkeypatch.setattr(zipfile.ZipFile, "open", spy)
+    ret = extract(filetype="ezchrom.asc", path=Path("mixed.zip"), timezone="UTC")
+    assert opened == [names[0]]
+    with zipfile.ZipFile("ezchrom-asc.zip") as src:
+        src.extract(names[0])
+    ref = extract(filetype="ezchrom.asc", path=Path(names[0]), timezone="UTC")
+    compare_datatrees(ret, ref, descend=True)
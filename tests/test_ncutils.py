@@ -0,0 +1,76 @@
+import pytest
+import os
+import numpy as np
+import xarray as xr
+from yadg.dgutils import concat_dicttrees
+from yadg.dgutils.ncutils import DataTreeWriter
+
+
+def make_dicttree(i: int, kind: str, npoints: int = 3) -> dict:
+    data_vars = {"value": ("uts", np.arange(npoints) + 0.5 * i, {"units": "V"})}
+    if kind == "constant":
+        data_vars["value_uncertainty"] = ((), 0.1)
+    elif kind == "changed":
+        data_vars["value_uncertainty"] = ((), 0.2)
+    elif kind == "int":
+        data_vars["cycle"] = ("uts", np.full(npoints, i))
+    elif kind == "str":
+        data_vars["mode"] = ("uts", np.array(["CC", "CV", "OCV"][:npoints]))
+    ds = xr.Dataset(
+        data_vars=data_vars,
+        coords={"uts": np.arange(npoints, dtype=float) + 10 * i},
+        attrs={"technique": kind, "original_metadata": "{}"},
+    )
+    return {"/": xr.Dataset(attrs={"yadg_provenance": "yadg extract"}), "/a": ds}
+
+
+@pytest.mark.parametrize(
+    "kinds",
+    [
+        ["constant", "constant", "constant"],
+        ["constant", "changed", "constant"],
+        ["int", "int", "constant", "int"],
+        ["constant", "int", "str", "changed"],
+        ["str", "str"],
+    ],
+)
+def test_datatree_writer(kinds, tmpdir):
+    os.chdir(tmpdir)
+    vals = concat_dicttrees(
+        [make_dicttree(i, k) for i, k in enumerate(kinds)], strict_merge=False
+    )
+    dt = xr.DataTree.from_dict({f"/step{k}".rstrip("/"): v for k, v in vals.items()})
+    dt.attrs = {"yadg_provenance": "yadg process"}
+    dt.to_netcdf("ref.nc", engine="h5netcdf")
+
+    with DataTreeWriter("ret.nc", dt.attrs, strict_merge=False) as writer:
+        for i, k in enumerate(kinds):
+            writer.append("step", make_dicttree(i, k))
+
+    ref = xr.open_datatree("ref.nc", engine="h5netcdf")
+    ret = xr.open_datatree("ret.nc", engine="h5netcdf")
+    xr.testing.assert_identical(ret, ref)
+    for k, v in ref["step/a"].variables.items():
+        assert ret["step/a"][k].dtype == v.dtype
+
+
+def test_datatree_writer_strict(tmpdir):
+    os.chdir(tmpdir)
+    with pytest.raises(RuntimeError, match="Merging metadata from multiple files"):
+        with DataTreeWriter("ret.nc", {}, strict_merge=True) as writer:
+            writer.append("step", make_dicttree(0, "constant"))
+            writer.append("step", make_dicttree(1, "int"))
+
+
+def test_datatree_writer_failure(tmpdir):
+    os.chdir(tmpdir)
+    with open("ret.nc", "w") as out:
+        out.write("previous")
+    with pytest.raises(RuntimeError, match="Merging metadata from multiple files"):
+        with DataTreeWriter("ret.nc", {}, strict_merge=True) as writer:
+            writer.append("step", make_dicttree(0, "constant"))
+            writer.append("step", make_dicttree(1, "int"))
+    # The previous file is left untouched, and no temporary files are left behind.
+    assert os.listdir() == ["ret.nc"]
+    with open("ret.nc") as inp:
+        assert inp.read() == "previous"
@@ -3,6 +3,7 @@ import os
 import json
 import yadg.dgutils
 import yadg.core
+from .utils import compare_datatrees
 
 
 def standard_datagram_test(datagram, testspec):
@@ -43,3 +44,44 @@ def test_preset(input, ts, datadir):
     ds = yadg.dgutils.schema_from_preset(schema, input)
     ret = yadg.core.process_schema(ds)
     standard_datagram_test(ret, ts)
+
+
+@pytest.mark.parametrize(
+    "input",
+    [
+        "data_1",
+        "data_2",
+    ],
+)
+def test_preset_jobs(input, datadir):
+    os.chdir(datadir)
+
+    with open(f"{input}.preset.json") as infile:
+        preset = json.load(infile)
+
+    schema = yadg.dgutils.update_schema(preset)
+    ds = yadg.dgutils.schema_from_preset(schema, input)
+    ref = yadg.core.process_schema(ds.model_copy(deep=True))
+    ret = yadg.core.process_schema(ds.model_copy(deep=True), jobs=2)
+    compare_datatrees(ret, ref, thislevel=True, descend=True)
+
+
+def test_preset_update(datadir):
+    os.chdir(datadir)
+
+    with open("data_1.preset.json") as infile:
+        preset = json.load(infile)
+
+    schema = yadg.dgutils.update_schema(preset)
+    ds = yadg.dgutils.schema_from_preset(schema, "data_1")
+    ref = yadg.core.process_schema(ds.model_copy(deep=True))
+
+    os.rename("data_1/f2/2019-12-03-09-06-27.csv", "new.csv")
+    prev = yadg.core.process_schema(ds.model_copy(deep=True))
+    assert prev["1"].sizes["uts"] == 1
+    os.rename("new.csv", "data_1/f2/2019-12-03-09-06-27.csv")
+
+    ret = yadg.core.process_schema(ds.model_copy(deep=True), previous=prev)
+    compare_datatrees(ret, ref, thislevel=True, descend=True)
+    manifest = json.loads(ret.attrs["yadg_process_manifest"])
+    assert [len(v["files"]) for v in manifest.values()] == [1, 2]
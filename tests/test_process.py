@@ -3,6 +3,7 @@ import os
 import json
 import yadg.dgutils
 import yadg.core
+from yadg.dgutils.profutils import Profiler
 import xarray as xr
 from .utils import compare_datatrees
 
@@ -24,3 +25,43 @@ def test_process_locale_passthrough(input, datadir):
     # ret.to_netcdf(f"{input}.nc", engine="h5netcdf")
     ref = xr.open_datatree(f"{input}.nc", engine="h5netcdf")
     compare_datatrees(ret, ref, thislevel=True, descend=True)
+
+
+@pytest.mark.parametrize(
+    "input",
+    [
+        "test_locale_passthrough.json",
+    ],
+)
+def test_process_stream(input, datadir):
+    os.chdir(datadir)
+
+    with open(f"{input}") as infile:
+        obj = json.load(infile)
+
+    schema = yadg.dgutils.update_schema(obj)
+    yadg.core.stream_schema(schema, "stream.nc")
+    ret = xr.open_datatree("stream.nc", engine="h5netcdf")
+    ref = xr.open_datatree(f"{input}.nc", engine="h5netcdf")
+    compare_datatrees(ret, ref, thislevel=True, descend=True)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_process_profile(jobs, datadir):
+    os.chdir(datadir)
+
+    with open("test_locale_passthrough.json") as infile:
+        obj = json.load(infile)
+
+    schema = yadg.dgutils.update_schema(obj)
+    profiler = Profiler(tracemalloc=True)
+    ret = yadg.core.process_schema(schema, jobs=jobs, profiler=profiler)
+    ref = xr.open_datatree("test_locale_passthrough.json.nc", engine="h5netcdf")
+    compare_datatrees(ret, ref, thislevel=True, descend=True)
+
+    summary = profiler.summary()
+    assert set(summary["stages"]) == {"extract", "complete_uts", "merge", "from_dict"}
+    for stage in summary["stages"].values():
+        assert stage["wall"] >= stage["self"] >= 0
+        assert stage["peak_traced"] > 0
+    assert summary["steps"]["stepdefaults"]["filetype"] == "example"
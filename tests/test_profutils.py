@@ -0,0 +1,67 @@
+import time
+import json
+import tracemalloc
+from yadg.dgutils.profutils import Profiler, profile_stage
+
+
+def test_profiler_nested_stages():
+    profiler = Profiler()
+    with profiler.stage("outer", step="a") as args:
+        time.sleep(0.02)
+        with profiler.stage("inner", step="a", filetype="example"):
+            time.sleep(0.05)
+        args["extra"] = 1
+    inner, outer = profiler.events
+    assert (inner["name"], outer["name"]) == ("inner", "outer")
+    assert outer["args"] == {"step": "a", "extra": 1}
+    assert outer["wall"] >= inner["wall"] >= 0.05
+    assert abs(outer["self"] - (outer["wall"] - inner["wall"])) < 1e-9
+    assert inner["self"] == inner["wall"]
+    assert outer["peak_rss"] >= inner["peak_rss"] > 0
+
+    summary = profiler.summary()
+    assert abs(summary["wall"] - outer["wall"]) < 1e-3
+    assert summary["stages"]["inner"]["count"] == 1
+    assert summary["steps"]["a"]["filetype"] == "example"
+    assert set(summary["steps"]["a"]["stages"]) == {"inner", "outer"}
+
+
+def test_profiler_tracemalloc():
+    profiler = Profiler(tracemalloc=True)
+    with profiler.stage("outer"):
+        with profiler.stage("inner"):
+            data = bytearray(2**22)
+        del data
+        with profiler.stage("small"):
+            pass
+    inner, small, outer = profiler.events
+    assert inner["peak_traced"] >= 2**22
+    assert outer["peak_traced"] >= inner["peak_traced"]
+    assert small["peak_traced"] < 2**22
+    assert not tracemalloc.is_tracing()
+
+
+def test_profiler_chrome_trace(tmpdir):
+    profiler = Profiler()
+    with profiler.stage("first"):
+        pass
+    other = Profiler()
+    with other.stage("second", path="file.csv"):
+        pass
+    profiler.add_events(other.events)
+    with profile_stage(None, "skipped") as args:
+        assert args == {}
+    with profile_stage(profiler, "third"):
+        pass
+
+    profiler.dump(tmpdir / "profile.json")
+    with open(tmpdir / "profile.json") as inp:
+        trace = json.load(inp)
+    events = trace["traceEvents"]
+    assert [e["name"] for e in events] == ["first", "second", "third"]
+    assert min(e["ts"] for e in events) == 0
+    for e in events:
+        assert e["ph"] == "X"
+        assert {"cpu", "self"} <= set(e["args"])
+    assert events[1]["args"]["path"] == "file.csv"
+    assert trace["summary"]["stages"]["second"]["count"] == 1
@@ -0,0 +1,153 @@
+import os
+import io
+import json
+import socket
+import threading
+import http.client
+import pytest
+import xarray as xr
+from concurrent.futures import ThreadPoolExecutor
+from yadg.server import make_server
+from .utils import compare_datatrees
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str):
+        super().__init__("localhost")
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.unix_path)
+
+
+@pytest.fixture
+def server(datadir):
+    os.chdir(datadir)
+    server = make_server(port=0, jobs=2, preload=["eclab.mpr"], root=datadir)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.pool.shutdown()
+
+
+def request(server, method: str, url: str, body: bytes = None, headers: dict = {}):
+    conn = http.client.HTTPConnection("localhost", server.server_port)
+    conn.request(method, url, body=body, headers=headers)
+    resp = conn.getresponse()
+    ret = resp.status, resp.getheader("Content-Type"), resp.read()
+    conn.close()
+    return ret
+
+
+def test_server_health(server):
+    status, ctype, body = request(server, "GET", "/health")
+    assert status == 200 and ctype == "application/json"
+    assert json.loads(body)["status"] == "ok"
+
+
+def test_server_extract_path(server):
+    url = "/extract?filetype=eclab.mpr&path=cp.mpr&timezone=Europe/Berlin&locale=en_GB"
+    status, ctype, body = request(server, "POST", url)
+    assert status == 200 and ctype == "application/x-netcdf"
+    ret = xr.open_datatree(io.BytesIO(body), engine="h5netcdf")
+    ref = xr.open_datatree("cp.mpr.nc", engine="h5netcdf")
+    compare_datatrees(ret, ref, thislevel=True, descend=True)
+
+
+def test_server_extract_bytes_concurrent(server):
+    with open("cp.mpr", "rb") as inf:
+        data = inf.read()
+    url = "/extract?filetype=eclab.mpr&timezone=Europe/Berlin"
+    with ThreadPoolExecutor(4) as pool:
+        rets = list(pool.map(lambda _: request(server, "POST", url, data), range(8)))
+    ref = xr.open_datatree("cp.mpr.nc", engine="h5netcdf")
+    for status, ctype, body in rets:
+        assert status == 200 and ctype == "application/x-netcdf"
+        ret = xr.open_datatree(io.BytesIO(body), engine="h5netcdf")
+        xr.testing.assert_equal(ret.to_dataset(), ref.to_dataset())
+
+
+def test_server_extract_meta_only(server):
+    url = "/extract?filetype=eclab.mpr&path=cp.mpr&meta_only=true"
+    status, ctype, body = request(server, "POST", url)
+    assert status == 200 and ctype == "application/json"
+    for node in json.loads(body).values():
+        for key in {"attrs", "coords", "dims", "data_vars"}:
+            assert key in node.keys()
+
+
+@pytest.mark.parametrize(
+    "url, body, code",
+    [
+        ("/extract?path=cp.mpr", None, 400),
+        ("/extract?filetype=eclab.mpr", None, 400),
+        ("/extract?filetype=eclab.mpr&path=cp.mpr", b"data", 400),
+        ("/extract?filetype=eclab.mpr&path=cp.mpr&unknown=1", None, 400),
+        ("/extract?filetype=eclab.mpr", b"not an mpr file", 422),
+        ("/extract?filetype=eclab.mpr&path=missing.mpr", None, 422),
+        ("/extract?filetype=eclab.mpr&path=../cp.mpr", None, 403),
+        ("/extract?filetype=basic.csv&path=/etc/passwd", None, 403),
+        ("/unknown", None, 404),
+    ],
+)
+def test_server_extract_errors(url, body, code, server):
+    status, ctype, body = request(server, "POST", url, body)
+    assert status == code and ctype == "application/json"
+    assert "error" in json.loads(body)
+
+
+def test_server_invalid_content_length(server):
+    headers = {"Content-Length": "many"}
+    status, ctype, body = request(server, "POST", "/extract", headers=headers)
+    assert status == 400 and ctype == "application/json"
+    assert "error" in json.loads(body)
+
+
+def test_server_without_root(datadir):
+    os.chdir(datadir)
+    server = make_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = "/extract?filetype=eclab.mpr&path=cp.mpr&meta_only=1"
+        status, ctype, body = request(server, "POST", url)
+        assert status == 403 and "error" in json.loads(body)
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.pool.shutdown()
+
+
+def test_server_broken_pool(server):
+    url = "/extract?filetype=eclab.mpr&path=cp.mpr&meta_only=1"
+    # Killing a worker process breaks the whole pool.
+    broken = server.pool
+    with pytest.raises(Exception):
+        broken.submit(os._exit, 1).result()
+    status, ctype, body = request(server, "POST", url)
+    assert status == 503 and "error" in json.loads(body)
+    assert server.pool is not broken
+    status, ctype, body = request(server, "POST", url)
+    assert status == 200
+
+
+def test_server_unix_socket(datadir):
+    os.chdir(datadir)
+    path = os.path.join(datadir, "yadg.sock")
+    server = make_server(socket=path, root=datadir)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        conn = UnixHTTPConnection(path)
+        conn.request("POST", "/extract?filetype=eclab.mpr&path=cp.mpr&meta_only=1")
+        resp = conn.getresponse()
+        assert resp.status == 200
+        assert "/" in json.loads(resp.read())
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.pool.shutdown()
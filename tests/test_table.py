@@ -0,0 +1,84 @@
+import pytest
+import numpy as np
+from babel import Locale
+from babel.numbers import get_decimal_symbol, get_group_symbol
+from yadg.dgutils.table import (
+    process_table,
+    process_table_chunked,
+    _babel_column,
+    _numpy_column,
+)
+
+
+@pytest.mark.parametrize(
+    "items, locale",
+    [
+        (["1", "2", "-3", "+4", "0012"], "en_GB"),
+        (["1.0", "2.25", "-0.0", "", ".5", "7."], "en_GB"),
+        (["1e3", "2.50E-3", "0.0e0", "-0", "0.00150e2"], "en_GB"),
+        (["1,000.5", "2,000", "3.14159"], "en_US"),
+        (["1.000,5", "2.000", "3,14159", ""], "de_DE"),
+        (["1 000,5", "-2,0", "3e5"], "fr_FR"),
+    ],
+)
+def test_numpy_column(items, locale):
+    loc = Locale.parse(locale)
+    group, decimal = get_group_symbol(loc), get_decimal_symbol(loc)
+    ret = _numpy_column(items, group, decimal)
+    assert ret is not None
+    vals, kind, prec = _babel_column(items, locale)
+    ref = np.asarray(vals)
+    assert ret[0].dtype == ref.dtype
+    assert np.array_equal(ret[0], ref, equal_nan=True)
+    assert np.array_equal(np.signbit(ret[0]), np.signbit(ref))
+    assert ret[1:] == (kind, prec)
+
+
+@pytest.mark.parametrize(
+    "items, locale",
+    [
+        ([], "en_GB"),
+        (["1", "abc"], "en_GB"),
+        (["1", "nan", "inf"], "en_GB"),
+        (["1", "1 000"], "fr_FR"),
+        (["1", "."], "de_DE"),
+        (["1", "1_000"], "en_GB"),
+        (["12345678901234567890"], "en_GB"),
+    ],
+)
+def test_numpy_column_fallback(items, locale):
+    loc = Locale.parse(locale)
+    group, decimal = get_group_symbol(loc), get_decimal_symbol(loc)
+    assert _numpy_column(items, group, decimal) is None
+
+
+def test_process_table_mixed():
+    lines = ["1;0.5;OK;1e3", "2;0.25;;2e3", "3;0.125;FAIL;3.5e3"]
+    ret = process_table(lines, headers=["n", "x", "flag", "y"], sep=";")
+    assert ret["n"][1].tolist() == [1, 2, 3]
+    assert ret["n_uncertainty"][1] == 1
+    assert ret["x"][1].tolist() == [0.5, 0.25, 0.125]
+    assert ret["x_uncertainty"][1] == 0.001
+    assert ret["flag"][1][::2] == ["OK", "FAIL"]
+    assert "flag_uncertainty" not in ret
+    assert ret["y_uncertainty"][1] == 2
+    assert ret["y_uncertainty"][2]["yadg_uncertainty_type"] == "sig"
+
+
+def test_process_table_duplicate_headers():
+    lines = ["1,000.5 2 3", "4 5.5 6"]
+    ret = process_table(lines, headers=["a", "b", "a"])
+    assert ret["a"][1].tolist() == [1000.5, 3, 4, 6]
+    assert ret["a_uncertainty"][1] == 0.1
+    assert ret["b"][1].tolist() == [2, 5.5]
+
+
+def test_process_table_chunked():
+    lines = ["1 0.5 2", "2 0.25 3e2", "3 0.125 4", "4 foo 5", "5 0.5 6"]
+    headers = ["n", "x", "y"]
+    ref = process_table(lines, headers=headers)
+    ret = process_table_chunked(iter(lines), headers=headers, chunksize=2)
+    assert ret.keys() == ref.keys()
+    for k, v in ref.items():
+        assert np.array_equal(ret[k][1], v[1])
+        assert ret[k][2] == v[2]
@@ -1,4 +1,15 @@
 import os
+import pytest
+import numpy as np
+from yadg.dgutils.dateutils import (
+    str_to_uts,
+    strs_to_uts,
+    learn_format,
+    column_to_uts,
+    time_to_seconds,
+    column_to_seconds,
+    fix_day_rollover,
+)
 from .utils import datagram_from_file
 
 
@@ -51,3 +62,124 @@ def test_isotimestamp_parsing_cet(datadir):
     assert dg["0"].uts[2] == 1622557825.0 - 7200 + 2, (
         "no suffix with timezone = CEST parsed to 'uts' correctly"
     )
+
+
+@pytest.mark.parametrize(
+    "values, format, timezone",
+    [
+        (
+            [
+                "2021-03-28 01:59:59",
+                "2021-03-28 02:30:00",
+                "2021-03-28 03:00:00",
+                "2021-10-31 02:30:00",
+                "2021-10-31 03:00:00.250",
+            ],
+            None,
+            "Europe/Berlin",
+        ),
+        (
+            ["2021-06-01T14:30:25Z", "2021-06-01T16:30:26+02:00", "12/03/2021 10:00"],
+            None,
+            "Europe/Berlin",
+        ),
+        (
+            ["2021-03", "2021-03-04", "20210304", "2021-03-04T10:00:00.5+01"],
+            None,
+            "Europe/Berlin",
+        ),
+        (["28.03.2021 02:30", "31.10.2021 02:30"], "%d.%m.%Y %H:%M", "Europe/Berlin"),
+        (
+            ["03/14/21 02:15:00 AM", "11/07/21 01:15:00 AM"],
+            "%m/%d/%y %I:%M:%S %p",
+            "US/Eastern",
+        ),
+    ],
+)
+def test_column_to_uts(values, format, timezone):
+    ret = column_to_uts(values, format=format, timezone=timezone)
+    ref = [str_to_uts(timestamp=v, format=format, timezone=timezone) for v in values]
+    assert ret.tolist() == ref
+
+
+def test_column_to_uts_strict():
+    values = ["2021-06-01 10:00:00", "not a timestamp"]
+    with pytest.raises(ValueError):
+        column_to_uts(values, timezone="UTC")
+    ret = column_to_uts(values, timezone="UTC", strict=False)
+    assert ret[0] == 1622541600.0
+    assert np.isnan(ret[1])
+
+
+@pytest.mark.parametrize(
+    "values, format",
+    [
+        (["00:00:00", "12:34:56", "01:02:03.5", "23:59:59.999999", "0102"], None),
+        (["12.34.56 PM", "01.02.03 AM"], "%I.%M.%S %p"),
+    ],
+)
+def test_column_to_seconds(values, format):
+    ret = column_to_seconds(values, format)
+    assert ret.tolist() == [time_to_seconds(v, format) for v in values]
+
+
+def test_column_to_seconds_not_iso():
+    with pytest.raises(ValueError):
+        time_to_seconds("1:02:03")
+    with pytest.raises(ValueError):
+        column_to_seconds(["01:02:03", "1:02:03"])
+
+
+@pytest.mark.parametrize(
+    "timestamp, format",
+    [
+        ("2021-06-01T14:30:25Z", "%Y-%m-%dT%H:%M:%S%z"),
+        ("2021-06-01 16:30:26.5+02:00", "%Y-%m-%d %H:%M:%S.%f%z"),
+        ("06/01/2021 04:30:25 PM", "%m/%d/%Y %I:%M:%S %p"),
+        ("2021-06-01", "%Y-%m-%d"),
+        ("1 June 2021, 16:30", None),
+    ],
+)
+def test_learn_format(timestamp, format):
+    assert learn_format(timestamp) == format
+
+
+@pytest.mark.parametrize(
+    "timestamps",
+    [
+        ["2021-06-01T14:30:25Z", "2021-06-01T16:30:26+02:00", "2021-06-01T16:30:27"],
+        ["06/01/2021 16:30:25", "13/01/2021 16:30:25", "2021-10-31 02:30:00"],
+        ["1 June 2021, 16:30", "2 June 2021, 16:30"],
+    ],
+)
+def test_strs_to_uts(timestamps):
+    ret = strs_to_uts(timestamps, timezone="Europe/Berlin")
+    ref = [str_to_uts(timestamp=t, timezone="Europe/Berlin") for t in timestamps]
+    assert ret.tolist() == ref
+
+
+def test_fix_day_rollover():
+    rng = np.random.default_rng(0)
+    # Time-of-day timestamps of a week-long log, with a few readings per hour.
+    uts = np.cumsum(rng.uniform(0, 3600, 1000)) % 86400
+    ref = uts.copy()
+    ndays = 0
+    for i in range(1, ref.size):
+        if ref[i] < ref[i - 1]:
+            while ref[i] + ndays * 86400 < ref[i - 1]:
+                ndays += 1
+            ref[i] += ndays * 86400
+    ret = fix_day_rollover(uts)
+    assert ret.tolist() == ref.tolist()
+    assert np.all(np.diff(ret) >= 0)
+    assert fix_day_rollover([10.0, 5.0, 5.0, 1.0], period=100.0).tolist() == [
+        10.0,
+        105.0,
+        105.0,
+        201.0,
+    ]
+    ret = fix_day_rollover([80000.0, np.nan, 100.0, 200.0, 50.0])
+    np.testing.assert_array_equal(ret, [80000.0, np.nan, 100.0, 200.0, 86450.0])
+    # The offset reached before a NaN is kept for the following timestamps.
+    ret = fix_day_rollover([80000.0, 100.0, np.nan, 200.0, 50.0])
+    np.testing.assert_array_equal(ret, [80000.0, 86500.0, np.nan, 86600.0, 172850.0])
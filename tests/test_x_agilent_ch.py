@@ -22,3 +22,10 @@ def test_agilent_ch(infile, datadir):
     with open(outfile, "wb") as out:
         pickle.dump(ret, out, 5)
     compare_datatrees(ret, ref, thislevel=True)
+
+
+def test_agilent_ch_empty(datadir):
+    os.chdir(datadir)
+    Path("empty.CH").touch()
+    with pytest.raises(ValueError, match="Insufficient number of bytes"):
+        extract(Path("empty.CH"), timezone="Europe/Berlin")
@@ -1,10 +1,12 @@
 import pytest
 import os
+import mmap
 import xarray as xr
 import numpy as np
 import pickle
-from yadg.extractors.eclab.mpr import extract as extract_mpr
+from yadg.extractors.eclab.mpr import extract as extract_mpr, compile_layout
 from yadg.extractors.eclab.mpt import extract as extract_mpt
+from yadg.extractors.eclab.techniques import param_from_key, params_from_keys
 from .utils import compare_datatrees
 from pathlib import Path
 
@@ -249,3 +251,93 @@ def test_eclab_mpt_old(afile, bfile, datadir):
             else:
                 e.args = (e.args[0] + f"\nError happened on key: {key!r}\n",)
                 raise e
+
+
+@pytest.mark.parametrize(
+    "infile",
+    [
+        "cp.mpt",
+        "mb.issue_95.mpt",
+        "gcpl.issue_211.mpt",
+    ],
+)
+def test_eclab_mpt_chunked(infile, datadir, monkeypatch):
+    os.chdir(datadir)
+    kwargs = dict(timezone="Europe/Berlin", encoding="windows-1252", locale="en_US")
+    ref = extract_mpt(Path(infile), **kwargs)
+    monkeypatch.setattr("yadg.extractors.eclab.mpt.CHUNK_LINES", 7)
+    ret = extract_mpt(Path(infile), **kwargs)
+    assert ret.identical(ref)
+
+
+@pytest.mark.parametrize(
+    "infile",
+    [
+        "cp.mpr",
+        "mb.issue_95.mpr",
+        "gcpl.issue_211.mpr",
+    ],
+)
+def test_eclab_mpr_mmap(infile, datadir):
+    os.chdir(datadir)
+    kwargs = dict(timezone="Europe/Berlin")
+    ret = extract_mpr(Path(infile), **kwargs)
+    ref = extract_mpr(Path(infile).read_bytes(), **kwargs)
+    assert ret.identical(ref)
+    # No data should be left referencing the memory-mapped file.
+    for var in ret.ds.variables.values():
+        base = var.values
+        while base is not None:
+            assert not isinstance(base, (mmap.mmap, memoryview))
+            base = getattr(base, "base", None)
+
+
+def test_eclab_mpr_trailing_bytes(datadir):
+    os.chdir(datadir)
+    kwargs = dict(timezone="Europe/Berlin")
+    ref = extract_mpr(Path("cp.mpr"), **kwargs)
+    for trailing in [b"\x00" * 3, b"\x00" * 100, b"MODULE"]:
+        with open("trailing.mpr", "wb") as out:
+            out.write(Path("cp.mpr").read_bytes() + trailing)
+        ret = extract_mpr(Path("trailing.mpr"), **kwargs)
+        assert ret.identical(ref)
+
+
+def test_eclab_mpr_empty(datadir):
+    os.chdir(datadir)
+    Path("empty.mpr").touch()
+    with pytest.raises(AssertionError, match="invalid file magic"):
+        extract_mpr(Path("empty.mpr"), timezone="Europe/Berlin")
+
+
+@pytest.mark.parametrize(
+    "param, keys",
+    [
+        ("I Range", [1, 2, 2, 41, 1, 190]),
+        ("Set I/C", [0, 1, 1, 2]),
+        ("unit dQ", [0, 0, 1]),
+        ("unknown", [3, 1, 2]),
+    ],
+)
+def test_eclab_params_from_keys(param, keys):
+    keys = np.array(keys, dtype=np.int64)
+    ret = params_from_keys(param, keys)
+    ref = np.asarray([param_from_key(param, int(k)) for k in keys])
+    assert ret.dtype == ref.dtype
+    np.testing.assert_array_equal(ret, ref)
+
+
+def test_eclab_params_from_keys_unknown():
+    with pytest.raises(ValueError, match="element '250' for parameter 'I Range'"):
+        params_from_keys("I Range", np.array([1, 250, 240]))
+
+
+def test_eclab_mpr_layout_cache(datadir):
+    os.chdir(datadir)
+    kwargs = dict(timezone="Europe/Berlin")
+    compile_layout.cache_clear()
+    ref = extract_mpr(Path("cp.mpr"), **kwargs)
+    assert compile_layout.cache_info().misses == 1
+    ret = extract_mpr(Path("cp.mpr"), **kwargs)
+    assert compile_layout.cache_info().hits == 1
+    assert ret.identical(ref)
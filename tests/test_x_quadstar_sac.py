@@ -23,3 +23,38 @@ def test_quadstar_sac(infile, datadir):
     with open(outfile, "wb") as out:
         pickle.dump(ret, out, 5)
     compare_datatrees(ret, ref, thislevel=True)
+
+
+@pytest.mark.parametrize(
+    "infile, fsr",
+    [
+        ("test.sac", "float64"),  # negative exponents of the FSR
+        ("airdemo.sac", "int64"),
+    ],
+)
+def test_quadstar_sac_dtypes(infile, fsr, datadir):
+    os.chdir(datadir)
+    ret = extract(Path(infile))
+    for k in ret.children:
+        ds = ret[k].ds
+        assert ds["fsr"].dtype == fsr
+        assert ds["y"].dtype == "float32"
+        assert ds["y_uncertainty"].dtype == "float64"
+
+
+def test_quadstar_sac_lazy(datadir):
+    os.chdir(datadir)
+    ref = extract(Path("airdemo.sac"))
+    ret = extract(Path("airdemo.sac"), lazy=True)
+    for k in ret.children:
+        part = ret[k].ds.isel(uts=slice(2, 7), mass_to_charge=slice(None, None, 5))
+        refp = ref[k].ds.isel(uts=slice(2, 7), mass_to_charge=slice(None, None, 5))
+        assert part.identical(refp)
+    assert ret.load().identical(ref)
+
+
+def test_quadstar_sac_empty(datadir):
+    os.chdir(datadir)
+    Path("empty.sac").touch()
+    with pytest.raises(ValueError, match="buffer is smaller than requested size"):
+        extract(Path("empty.sac"))
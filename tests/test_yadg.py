@@ -1,7 +1,9 @@
 import pytest
 import subprocess
 import os
+import sys
 import json
+from pathlib import Path
 from xarray import open_datatree
 import numpy as np
 from .utils import compare_datatrees
@@ -13,6 +15,16 @@ def test_yadg_version():
     subprocess.run(command, check=True)
 
 
+def test_yadg_lazy_imports():
+    """Importing the CLI must not import the heavy dependencies of the subcommands."""
+    code = "import sys, yadg, yadg.main; print(' '.join(sys.modules))"
+    command = [sys.executable, "-c", code]
+    ret = subprocess.run(command, check=True, capture_output=True, text=True)
+    imported = set(ret.stdout.split())
+    for heavy in {"xarray", "numpy", "pandas", "dgbowl_schemas", "yaml", "h5netcdf"}:
+        assert heavy not in imported, f"'{heavy}' imported on startup"
+
+
 def test_yadg_process_without_schema(datadir):
     command = ["yadg", "process"]
     with pytest.raises(AssertionError, match="error: the following arguments"):
@@ -133,6 +145,130 @@ def test_yadg_preset_with_metadata(datadir):
     compare_datatrees(ret, ref, thislevel=True, descend=True)
 
 
+def test_yadg_preset_with_jobs(datadir):
+    os.chdir(datadir)
+    command = ["yadg", "preset", "-p", "data_2.preset.yaml", "data_2", "data_2.nc"]
+    subprocess.run(command + ["--jobs", "2"], check=True)
+    assert os.path.exists("data_2.nc")
+    ret = open_datatree("data_2.nc", engine="h5netcdf")
+    ref = open_datatree("data_2.nc.ref", engine="h5netcdf")
+    compare_datatrees(ret, ref, thislevel=True, descend=True)
+
+
+def test_yadg_process_with_stream(datadir):
+    os.chdir(datadir)
+    command = ["yadg", "process", "test_schema.yml", "--stream"]
+    subprocess.run(command, check=True)
+    assert os.path.exists("datagram.nc")
+    ret = open_datatree("datagram.nc", engine="h5netcdf")
+    ref = open_datatree("datagram.nc.ref", engine="h5netcdf")
+    compare_datatrees(ret, ref, thislevel=True, descend=True)
+
+
+def test_yadg_preset_with_stream(datadir):
+    os.chdir(datadir)
+    command = ["yadg", "preset", "-pa", "data_2.preset.yaml", "data_2", "data_2.nc"]
+    subprocess.run(command + ["--stream"], check=True)
+    assert os.path.exists("data_2.zip")
+    ret = open_datatree("data_2.nc", engine="h5netcdf")
+    ref = open_datatree("data_2.nc.ref", engine="h5netcdf")
+    assert ret.attrs["data_archive_path"] == "data_2.zip"
+    compare_datatrees(ret, ref, descend=True)
+
+
+def test_yadg_process_with_cache(datadir):
+    os.chdir(datadir)
+    command = ["yadg", "process", "test_schema.yml", "--cache-dir", "cache"]
+    for i in range(2):
+        subprocess.run(command + [f"datagram.{i}.nc"], check=True)
+        ret = open_datatree(f"datagram.{i}.nc", engine="h5netcdf")
+        ref = open_datatree("datagram.nc.ref", engine="h5netcdf")
+        compare_datatrees(ret, ref, thislevel=True, descend=True)
+    assert len(list(Path("cache").glob("*.nc"))) > 0
+
+
+def test_yadg_process_without_cache(datadir):
+    os.chdir(datadir)
+    env = dict(os.environ, YADG_CACHE_DIR=str(Path("cache").absolute()))
+    subprocess.run(["yadg", "process", "test_schema.yml"], check=True, env=env)
+    assert not Path("cache").exists()
+
+
+@pytest.mark.parametrize(
+    "extra, stages",
+    [
+        ([], {"extract", "complete_uts", "merge", "from_dict", "to_netcdf"}),
+        (["--jobs", "2"], {"extract", "complete_uts", "merge", "to_netcdf"}),
+        (["--stream"], {"extract", "complete_uts", "append"}),
+    ],
+)
+def test_yadg_preset_with_profile(extra, stages, datadir):
+    os.chdir(datadir)
+    command = ["yadg", "preset", "-p", "data_2.preset.yaml", "data_2", "data_2.nc"]
+    command += ["--profile", "profile.json", "--profile-attrs"] + extra
+    subprocess.run(command, check=True)
+    with open("profile.json") as inp:
+        profile = json.load(inp)
+    events = profile["traceEvents"]
+    assert stages <= {e["name"] for e in events}
+    assert {e["ph"] for e in events} == {"X"}
+    filetypes = {"0": "fhimcpt.vna", "1": "ezchrom.asc"}
+    for e in events:
+        if e["name"] in {"extract", "complete_uts"}:
+            assert e["args"]["filetype"] == filetypes[e["args"]["step"]]
+    summary = profile["summary"]
+    assert summary["stages"]["extract"]["count"] == 3
+    for tag, filetype in filetypes.items():
+        assert summary["steps"][tag]["filetype"] == filetype
+
+    ret = open_datatree("data_2.nc", engine="h5netcdf")
+    summary = json.loads(ret.attrs.pop("yadg_profile"))
+    assert summary["stages"]["extract"]["count"] == 3
+    ref = open_datatree("data_2.nc.ref", engine="h5netcdf")
+    compare_datatrees(ret, ref, thislevel=True, descend=True)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_yadg_preset_with_update(stream, datadir):
+    os.chdir(datadir)
+    command = ["yadg", "preset", "-p", "data_2.preset.yaml", "data_2", "data_2.nc"]
+    command += ["--update"] + (["--stream"] if stream else [])
+    os.rename("data_2/f2/2019-12-03-09-11-31.csv", "new.csv")
+    subprocess.run(command, check=True)
+    ret = open_datatree("data_2.nc", engine="h5netcdf")
+    assert ret["0"].sizes["uts"] == 1
+    ret.close()
+
+    os.rename("new.csv", "data_2/f2/2019-12-03-09-11-31.csv")
+    subprocess.run(command + ["--jobs", "1"], check=True)
+    ret = open_datatree("data_2.nc", engine="h5netcdf")
+    ref = open_datatree("data_2.nc.ref", engine="h5netcdf")
+    manifest = json.loads(ret.attrs["yadg_process_manifest"])
+    assert len(manifest["0"]["files"]) == 2
+    compare_datatrees(ret, ref, thislevel=True, descend=True)
+
+
+def test_yadg_preset_with_update_stream_twice(datadir):
+    os.chdir(datadir)
+    command = ["yadg", "preset", "-p", "data_2.preset.yaml", "data_2", "data_2.nc"]
+    command += ["--update", "--stream"]
+    subprocess.run(command, check=True)
+    for i in range(2):
+        subprocess.run(command, check=True)
+        ret = open_datatree("data_2.nc", engine="h5netcdf")
+        ref = open_datatree("data_2.nc.ref", engine="h5netcdf")
+        compare_datatrees(ret, ref, thislevel=True, descend=True)
+        ret.close()
+
+    # A failed update leaves the previous datagram untouched.
+    with open("data_2/f2/2019-12-03-09-20-00.csv", "w") as out:
+        out.write("not a vna file")
+    assert subprocess.run(command).returncode != 0
+    ret = open_datatree("data_2.nc", engine="h5netcdf")
+    compare_datatrees(ret, ref, thislevel=True, descend=True)
+    assert not any(fn.endswith(".tmp") for fn in os.listdir())
+
+
 @pytest.mark.parametrize(
     "packwith, suffix",
     [
@@ -274,14 +410,15 @@ def test_yadg_extract_locale_metadata(filetype, infile, locale, datadir):
 
 
 @pytest.mark.parametrize(
-    "filetype, infile, suffix",
+    "filetype, infile, suffix, jobs",
     [
-        ("ezchrom.asc", "ezchrom-asc.zip", None),
-        ("ezchrom.asc", "ezchrom-txt.zip", ".txt"),
-        ("fusion.zip", "fusion-json.zip", None),
+        ("ezchrom.asc", "ezchrom-asc.zip", None, "1"),
+        ("ezchrom.asc", "ezchrom-txt.zip", ".txt", "1"),
+        ("fusion.zip", "fusion-json.zip", None, "1"),
+        ("fusion.zip", "fusion-json.zip", None, "2"),
     ],
 )
-def test_yadg_extract_from_zip(filetype, infile, suffix, datadir):
+def test_yadg_extract_from_zip(filetype, infile, suffix, jobs, datadir):
     os.chdir(datadir)
     command = [
         "yadg",
@@ -293,6 +430,8 @@ def test_yadg_extract_from_zip(filetype, infile, suffix, datadir):
         "en_GB",
         "--timezone",
         "Europe/Berlin",
+        "--jobs",
+        jobs,
     ]
     if suffix is not None:
         command.append("--suffix")
@@ -301,3 +440,63 @@ def test_yadg_extract_from_zip(filetype, infile, suffix, datadir):
     ret = open_datatree("test.nc", engine="h5netcdf")
     ref = open_datatree(f"{infile}.nc", engine="h5netcdf")
     compare_datatrees(ret, ref, thislevel=True, descend=True)
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_yadg_extract_batch(jobs, datadir):
+    os.chdir(datadir)
+    os.mkdir("inputs")
+    for fn in ["cp.1.mpr", "cp.2.mpr", "cp.3.mpr"]:
+        Path("inputs", fn).write_bytes(Path("cp.mpr").read_bytes())
+    Path("inputs", "broken.mpr").write_bytes(b"not an mpr file")
+    infiles = ["inputs/cp.1.mpr", "inputs/broken.mpr", "inputs/cp.2.mpr", "cp.mpr"]
+    with open("batch.txt", "w") as out:
+        out.write("# files to extract\n\n" + "\n".join(infiles) + "\n")
+    command = [
+        "yadg",
+        "extract",
+        "eclab.mpr",
+        "--batch",
+        "batch.txt",
+        "--out-dir",
+        "out",
+        "--jobs",
+        jobs,
+        "--locale",
+        "en_GB",
+        "--timezone",
+        "Europe/Berlin",
+    ]
+    # The broken file is reported using the exit code.
+    ret = subprocess.run(command, capture_output=True, text=True)
+    assert ret.returncode == 1
+    assert "Failed to extract 1 out of 4 files" in ret.stderr
+    with open("out/yadg_extract_summary.json", "r") as inp:
+        summary = json.load(inp)
+    assert summary["n_files"] == 4 and summary["n_failed"] == 1
+    assert [f["infile"] for f in summary["files"]] == infiles
+    assert [f["status"] for f in summary["files"]] == ["ok", "failed", "ok", "ok"]
+    assert "error" in summary["files"][1]
+    assert not os.path.exists("out/broken.nc")
+    ref = open_datatree("cp.mpr.nc", engine="h5netcdf")
+    for fn in ["cp.1.nc", "cp.2.nc", "cp.nc"]:
+        ret = open_datatree(Path("out", fn), engine="h5netcdf")
+        # the filename is expected to differ
+        ret.attrs["yadg_extract_filename"] = ref.attrs["yadg_extract_filename"]
+        compare_datatrees(ret, ref, thislevel=True, descend=True)
+
+    with open("batch.txt", "w") as out:
+        out.write("\n".join(infiles[2:]) + "\n")
+    command[command.index("out")] = "out.ok"
+    subprocess.run(command, check=True)
+
+
+def test_yadg_dgutils_lazy_members():
+    code = (
+        "import sys, yadg.dgutils as d\n"
+        "assert 'yadg.dgutils.dsutils' not in sys.modules\n"
+        "assert d.merge_meta is sys.modules['yadg.dgutils.dsutils'].merge_meta\n"
+        "assert set(d.__all__) <= set(dir(d))\n"
+        "assert not hasattr(d, 'nonexistent')\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
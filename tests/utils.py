@@ -62,6 +62,7 @@ def check_attrs(ret: dict, ref: dict):
         if k in {
             "yadg_process_date",
             "yadg_process_DataSchema",
+            "yadg_process_manifest",
             "yadg_extract_date",
             "yadg_version",
             "yadg_command",